@@ -0,0 +1,100 @@
+"""base schema
+
+Revision ID: 9d2f4a6c8e10
+Revises:
+Create Date: 2026-10-18 08:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9d2f4a6c8e10'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    #  The tables the API was first deployed with. Databases created before the
+    #  schema was managed by Alembic already have them: `alembic stamp 9d2f4a6c8e10`
+    op.create_table(
+        'users',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('username', sa.String(), nullable=True),
+        sa.Column('hashed_password', sa.String(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_users_id'), 'users', ['id'], unique=False)
+    op.create_index(op.f('ix_users_username'), 'users', ['username'], unique=True)
+    op.create_table(
+        'mutual_funds',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(), nullable=True),
+        sa.Column('isin', sa.String(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('isin')
+    )
+    op.create_index(op.f('ix_mutual_funds_id'), 'mutual_funds', ['id'], unique=False)
+    op.create_index(op.f('ix_mutual_funds_name'), 'mutual_funds', ['name'], unique=True)
+    op.create_index('idx_fund_isin', 'mutual_funds', ['isin'], unique=False)
+    op.create_table(
+        'investments',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=True),
+        sa.Column('fund_id', sa.Integer(), nullable=True),
+        sa.Column('date', sa.Date(), nullable=True),
+        sa.Column('amount_invested', sa.Float(), nullable=True),
+        sa.Column('nav_at_investment', sa.Float(), nullable=True),
+        sa.Column('returns_since_investment', sa.Float(), nullable=True),
+        sa.ForeignKeyConstraint(['fund_id'], ['mutual_funds.id'], ),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_investments_id'), 'investments', ['id'], unique=False)
+    op.create_table(
+        'fund_allocations',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('fund_id', sa.Integer(), nullable=True),
+        sa.Column('sector', sa.String(), nullable=True),
+        sa.Column('percentage', sa.Float(), nullable=True),
+        sa.ForeignKeyConstraint(['fund_id'], ['mutual_funds.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_fund_allocations_id'), 'fund_allocations', ['id'], unique=False)
+    op.create_table(
+        'fund_overlaps',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('fund_id', sa.Integer(), nullable=True),
+        sa.Column('overlapping_fund_id', sa.Integer(), nullable=True),
+        sa.Column('overlap_percentage', sa.Float(), nullable=True),
+        sa.ForeignKeyConstraint(['fund_id'], ['mutual_funds.id'], ),
+        sa.ForeignKeyConstraint(['overlapping_fund_id'], ['mutual_funds.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_fund_overlaps_id'), 'fund_overlaps', ['id'], unique=False)
+    #  Made unique by f6b8d0e2a456
+    op.create_index('idx_fund_overlap', 'fund_overlaps',
+                    ['fund_id', 'overlapping_fund_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_fund_overlap', table_name='fund_overlaps')
+    op.drop_index(op.f('ix_fund_overlaps_id'), table_name='fund_overlaps')
+    op.drop_table('fund_overlaps')
+    op.drop_index(op.f('ix_fund_allocations_id'), table_name='fund_allocations')
+    op.drop_table('fund_allocations')
+    op.drop_index(op.f('ix_investments_id'), table_name='investments')
+    op.drop_table('investments')
+    op.drop_index('idx_fund_isin', table_name='mutual_funds')
+    op.drop_index(op.f('ix_mutual_funds_name'), table_name='mutual_funds')
+    op.drop_index(op.f('ix_mutual_funds_id'), table_name='mutual_funds')
+    op.drop_table('mutual_funds')
+    op.drop_index(op.f('ix_users_username'), table_name='users')
+    op.drop_index(op.f('ix_users_id'), table_name='users')
+    op.drop_table('users')
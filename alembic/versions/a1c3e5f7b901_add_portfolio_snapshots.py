@@ -0,0 +1,68 @@
+"""add portfolio snapshots
+
+Revision ID: a1c3e5f7b901
+Revises: 9d2f4a6c8e10
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a1c3e5f7b901'
+down_revision: Union[str, None] = '9d2f4a6c8e10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'portfolio_snapshots',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('total_invested', sa.Float(), nullable=True),
+        sa.Column('current_value', sa.Float(), nullable=True),
+        sa.Column('best_scheme', sa.String(), nullable=True),
+        sa.Column('best_scheme_return', sa.Float(), nullable=True),
+        sa.Column('worst_scheme', sa.String(), nullable=True),
+        sa.Column('worst_scheme_return', sa.Float(), nullable=True),
+        sa.Column('last_investment_date', sa.Date(), nullable=True),
+        sa.Column('last_investment_date_value', sa.Float(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('user_id')
+    )
+
+    #  Backfill from existing investments (same figures as app.snapshots.refresh_snapshots)
+    op.execute("""
+        WITH ranked AS (
+            SELECT i.user_id, i.date, i.amount_invested, i.returns_since_investment, f.name,
+                   i.amount_invested * (1 + i.returns_since_investment / 100.0) AS value,
+                   ROW_NUMBER() OVER (PARTITION BY i.user_id
+                                      ORDER BY i.returns_since_investment DESC, i.id) AS best_rank,
+                   ROW_NUMBER() OVER (PARTITION BY i.user_id
+                                      ORDER BY i.returns_since_investment ASC, i.id) AS worst_rank,
+                   MAX(i.date) OVER (PARTITION BY i.user_id) AS last_date
+            FROM investments i
+            JOIN mutual_funds f ON f.id = i.fund_id
+        )
+        INSERT INTO portfolio_snapshots (
+            user_id, total_invested, current_value, best_scheme, best_scheme_return,
+            worst_scheme, worst_scheme_return, last_investment_date, last_investment_date_value)
+        SELECT user_id, SUM(amount_invested), SUM(value),
+               MAX(CASE WHEN best_rank = 1 THEN name END),
+               MAX(CASE WHEN best_rank = 1 THEN returns_since_investment END),
+               MAX(CASE WHEN worst_rank = 1 THEN name END),
+               MAX(CASE WHEN worst_rank = 1 THEN returns_since_investment END),
+               MAX(last_date),
+               SUM(CASE WHEN date = last_date THEN value ELSE 0 END)
+        FROM ranked
+        GROUP BY user_id
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('portfolio_snapshots')
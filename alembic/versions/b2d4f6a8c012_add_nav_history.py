@@ -0,0 +1,35 @@
+"""add nav history
+
+Revision ID: b2d4f6a8c012
+Revises: a1c3e5f7b901
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b2d4f6a8c012'
+down_revision: Union[str, None] = 'a1c3e5f7b901'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'nav_history',
+        sa.Column('fund_id', sa.Integer(), nullable=False),
+        sa.Column('date', sa.Date(), nullable=False),
+        sa.Column('nav', sa.Float(), nullable=True),
+        sa.ForeignKeyConstraint(['fund_id'], ['mutual_funds.id'], ),
+        sa.PrimaryKeyConstraint('fund_id', 'date')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('nav_history')
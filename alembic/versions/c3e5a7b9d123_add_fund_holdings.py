@@ -0,0 +1,49 @@
+"""add fund holdings
+
+Revision ID: c3e5a7b9d123
+Revises: b2d4f6a8c012
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3e5a7b9d123'
+down_revision: Union[str, None] = 'b2d4f6a8c012'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'fund_holdings',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('fund_id', sa.Integer(), nullable=True),
+        sa.Column('security_isin', sa.String(), nullable=True),
+        sa.Column('symbol', sa.String(), nullable=True),
+        sa.Column('sector', sa.String(), nullable=True),
+        sa.Column('weight', sa.Float(), nullable=True),
+        sa.ForeignKeyConstraint(['fund_id'], ['mutual_funds.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('fund_id', 'security_isin',
+                            name='uq_fund_holding_security')
+    )
+    op.create_index(op.f('ix_fund_holdings_id'),
+                    'fund_holdings', ['id'], unique=False)
+    op.create_index('idx_fund_holding_security', 'fund_holdings', [
+                    'security_isin', 'fund_id'], unique=False, postgresql_include=['weight'])
+    op.create_index('idx_fund_holding_symbol', 'fund_holdings', [
+                    'symbol', 'fund_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_fund_holding_symbol', table_name='fund_holdings')
+    op.drop_index('idx_fund_holding_security', table_name='fund_holdings')
+    op.drop_index(op.f('ix_fund_holdings_id'), table_name='fund_holdings')
+    op.drop_table('fund_holdings')
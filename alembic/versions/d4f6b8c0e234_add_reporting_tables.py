@@ -0,0 +1,53 @@
+"""add reporting tables
+
+Revision ID: d4f6b8c0e234
+Revises: c3e5a7b9d123
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4f6b8c0e234'
+down_revision: Union[str, None] = 'c3e5a7b9d123'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'report_portfolio_overviews',
+        sa.Column('report_date', sa.Date(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('initial_investment', sa.Float(), nullable=True),
+        sa.Column('current_value', sa.Float(), nullable=True),
+        sa.Column('growth_percentage', sa.Float(), nullable=True),
+        sa.Column('one_day_return', sa.Float(), nullable=True),
+        sa.Column('best_performing_scheme', sa.String(), nullable=True),
+        sa.Column('best_performing_scheme_return', sa.Float(), nullable=True),
+        sa.Column('worst_performing_scheme', sa.String(), nullable=True),
+        sa.Column('worst_performing_scheme_return', sa.Float(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('report_date', 'user_id')
+    )
+    op.create_table(
+        'report_sector_allocations',
+        sa.Column('report_date', sa.Date(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('sector', sa.String(), nullable=False),
+        sa.Column('invested_amount', sa.Float(), nullable=True),
+        sa.Column('percentage', sa.Float(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('report_date', 'user_id', 'sector')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('report_sector_allocations')
+    op.drop_table('report_portfolio_overviews')
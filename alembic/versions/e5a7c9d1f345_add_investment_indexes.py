@@ -0,0 +1,42 @@
+"""add investment indexes
+
+Revision ID: e5a7c9d1f345
+Revises: d4f6b8c0e234
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a7c9d1f345'
+down_revision: Union[str, None] = 'd4f6b8c0e234'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    #  CONCURRENTLY builds without blocking writes, and cannot run inside a transaction.
+    #  A failed build leaves an INVALID index behind: drop it before retrying
+    with op.get_context().autocommit_block():
+        op.create_index('idx_investment_user_date', 'investments', ['user_id', 'date', 'id'], unique=False,
+                        postgresql_include=['fund_id', 'amount_invested', 'nav_at_investment',
+                                            'returns_since_investment'],
+                        postgresql_concurrently=True)
+        op.create_index('idx_investment_fund', 'investments',
+                        ['fund_id'], unique=False, postgresql_concurrently=True)
+        op.create_index('idx_fund_allocation_fund', 'fund_allocations', [
+                        'fund_id'], unique=False, postgresql_include=['sector', 'percentage'],
+                        postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('idx_fund_allocation_fund', table_name='fund_allocations', postgresql_concurrently=True)
+        op.drop_index('idx_investment_fund', table_name='investments', postgresql_concurrently=True)
+        op.drop_index('idx_investment_user_date', table_name='investments', postgresql_concurrently=True)
@@ -0,0 +1,39 @@
+"""unique fund overlap pairs
+
+Revision ID: f6b8d0e2a456
+Revises: e5a7c9d1f345
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f6b8d0e2a456'
+down_revision: Union[str, None] = 'e5a7c9d1f345'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    #  Keep the first row of any duplicated pair before enforcing uniqueness
+    op.execute("""
+        DELETE FROM fund_overlaps
+        WHERE id NOT IN (
+            SELECT MIN(id) FROM fund_overlaps GROUP BY fund_id, overlapping_fund_id
+        )
+    """)
+    op.drop_index('idx_fund_overlap', table_name='fund_overlaps')
+    op.create_index('idx_fund_overlap', 'fund_overlaps',
+                    ['fund_id', 'overlapping_fund_id'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_fund_overlap', table_name='fund_overlaps')
+    op.create_index('idx_fund_overlap', 'fund_overlaps',
+                    ['fund_id', 'overlapping_fund_id'], unique=False)
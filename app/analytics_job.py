@@ -0,0 +1,126 @@
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from itertools import groupby
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from app import database
+from app.models import (FundAllocation, Investment, MutualFund, ReportPortfolioOverview,
+                        ReportSectorAllocation, User)
+from app.reports import compute_user_reports
+
+#  Per-worker fund maps, loaded once by `_init_worker`
+_fund_names = {}
+_fund_allocations = {}
+
+#  Worker setup
+
+
+def load_fund_maps(db: Session):
+    fund_names = dict(db.query(MutualFund.id, MutualFund.name))
+    fund_allocations = {}
+    for fund_id, sector, percentage in db.query(FundAllocation.fund_id, FundAllocation.sector, FundAllocation.percentage):
+        fund_allocations.setdefault(fund_id, []).append((sector, percentage))
+    return fund_names, fund_allocations
+
+
+def _init_worker():
+    global _fund_names, _fund_allocations
+    #  Connections inherited from the parent must not be reused after fork
+    database.init_engines().dispose(close=False)
+    db = database.SessionLocal()
+    try:
+        _fund_names, _fund_allocations = load_fund_maps(db)
+    finally:
+        db.close()
+
+#  Process one user_id range: stream, compute, write in bulk
+
+
+def process_user_range(first_user_id: int, last_user_id: int, report_date: date, batch_size: int = 5000):
+    db = database.SessionLocal()
+    try:
+        user_filter = (Investment.user_id >= first_user_id) & (
+            Investment.user_id <= last_user_id)
+        rows = db.query(
+            Investment.user_id, Investment.fund_id, Investment.date,
+            Investment.amount_invested, Investment.returns_since_investment
+        ).filter(user_filter).order_by(Investment.user_id).yield_per(batch_size)
+
+        overviews, sectors, users = [], [], 0
+        #  Writes go through a second session while the first one streams
+        writer = database.SessionLocal()
+        try:
+            for model in (ReportPortfolioOverview, ReportSectorAllocation):
+                writer.query(model).filter(
+                    model.report_date == report_date,
+                    model.user_id.between(first_user_id, last_user_id)
+                ).delete(synchronize_session=False)
+
+            for user_id, user_rows in groupby(rows, key=lambda row: row[0]):
+                overview, user_sectors = compute_user_reports(
+                    user_id, [row[1:] for row in user_rows], report_date, _fund_names, _fund_allocations)
+                overviews.append(overview)
+                sectors.extend(user_sectors)
+                users += 1
+                if len(overviews) >= batch_size:
+                    _flush(writer, overviews, sectors)
+
+            _flush(writer, overviews, sectors)
+            writer.commit()
+        except Exception:
+            writer.rollback()
+            raise
+        finally:
+            writer.close()
+        return users
+    finally:
+        db.close()
+
+
+def _flush(db: Session, overviews: list, sectors: list):
+    if overviews:
+        db.bulk_insert_mappings(ReportPortfolioOverview, overviews)
+    if sectors:
+        db.bulk_insert_mappings(ReportSectorAllocation, sectors)
+    overviews.clear()
+    sectors.clear()
+
+#  Run every range on a process pool
+
+
+def run_analytics(report_date: date = None, workers: int = None, range_size: int = 50000):
+    report_date = report_date or date.today()
+    workers = workers or os.cpu_count() or 1
+    started = time.perf_counter()
+
+    db = database.SessionLocal()
+    try:
+        first_id, last_id = db.query(func.min(User.id), func.max(User.id)).one()
+    finally:
+        db.close()
+    if first_id is None:
+        print("✅ No users to report on")
+        return
+
+    ranges = [(lo, min(lo + range_size - 1, last_id))
+              for lo in range(first_id, last_id + 1, range_size)]
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        users = sum(pool.map(process_user_range, *zip(*ranges), [report_date] * len(ranges)))
+
+    print(f"✅ Reported {users} portfolios for {report_date} across {len(ranges)} ranges "
+          f"with {workers} workers in {time.perf_counter() - started:.1f}s")
+
+
+#  Run the job
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Compute every user's portfolio overview and sector split")
+    parser.add_argument("--date", type=date.fromisoformat, default=None)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--range-size", type=int, default=50000)
+    args = parser.parse_args()
+    run_analytics(args.date, args.workers, args.range_size)
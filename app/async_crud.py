@@ -0,0 +1,141 @@
+from functools import wraps
+from pydantic import TypeAdapter
+from app import crud, schemas
+from app.database import run_db
+from app.utils.cache import cache
+
+#  Async versions of the crud functions.
+#  With an AsyncSession the sync implementation runs through `run_sync` on the
+#  event loop (asyncpg, no threads); with a sync Session it runs on the threadpool.
+
+CACHE_PREFIX = "portfolio-cache:"
+#  Every stock allocation period is cut from the one cached value series
+CACHED_VIEWS = ["portfolio", "sector-allocation", "overlap", "value-series"]
+#  Cached views are stored as their response schema renders them (the value
+#  series is plain JSON already), so a cache hit sent as-is in fast JSON mode
+#  matches the validated response byte for byte
+VIEW_SCHEMAS = {
+    "portfolio": TypeAdapter(schemas.PortfolioOverview),
+    "sector-allocation": TypeAdapter(schemas.SectorAllocationResponse),
+    "overlap": TypeAdapter(schemas.FundOverlapResponse),
+}
+
+
+def _async_version(fn):
+    @wraps(fn)
+    async def wrapper(db, *args, **kwargs):
+        return await run_db(db, fn, *args, **kwargs)
+    return wrapper
+
+#  Cache a per-user read view
+
+
+def _cache_key(user_id: int, view: str) -> str:
+    return f"{CACHE_PREFIX}{user_id}:{view}"
+
+
+def _validated(view: str, result):
+    adapter = VIEW_SCHEMAS.get(view)
+    return adapter.dump_python(adapter.validate_python(result), mode="json") if adapter else result
+
+
+def _cached_view(view: str, fn):
+    @wraps(fn)
+    async def wrapper(db, user_id: int, *args):
+        key = _cache_key(user_id, view)
+        result = await cache.get(key)
+        if result is None:
+            result = _validated(view, await run_db(db, fn, user_id, *args))
+            await cache.set(key, result)
+        return result
+    return wrapper
+
+
+#  Invalidation
+
+
+async def invalidate_user(user_id: int):
+    await cache.delete(*(_cache_key(user_id, view) for view in CACHED_VIEWS))
+
+
+async def invalidate_users(user_ids, batch_size: int = 1000):
+    user_ids = list(user_ids)
+    for i in range(0, len(user_ids), batch_size):
+        await cache.delete(*(_cache_key(user_id, view)
+                             for user_id in user_ids[i:i + batch_size] for view in CACHED_VIEWS))
+
+
+async def invalidate_all():
+    await cache.clear(CACHE_PREFIX)
+
+
+def _invalidates_user(fn):
+    @wraps(fn)
+    async def wrapper(db, user_id: int, *args, **kwargs):
+        result = await run_db(db, fn, user_id, *args, **kwargs)
+        await invalidate_user(user_id)
+        return result
+    return wrapper
+
+
+def _invalidates_all(fn):
+    @wraps(fn)
+    async def wrapper(db, *args, **kwargs):
+        result = await run_db(db, fn, *args, **kwargs)
+        await invalidate_all()
+        return result
+    return wrapper
+
+
+create_user = _async_version(crud.create_user)
+get_user_by_username = _async_version(crud.get_user_by_username)
+update_password_hash = _async_version(crud.update_password_hash)
+get_portfolio = _cached_view("portfolio", crud.get_portfolio)
+get_all_mutual_funds = _async_version(crud.get_all_mutual_funds)
+get_mutual_fund = _async_version(crud.get_mutual_fund)
+create_mutual_fund = _invalidates_all(crud.create_mutual_fund)
+update_mutual_fund = _invalidates_all(crud.update_mutual_fund)
+delete_mutual_fund = _invalidates_all(crud.delete_mutual_fund)
+create_investment = _invalidates_user(crud.create_investment)
+bulk_create_investments = _invalidates_user(crud.bulk_create_investments)
+get_user_investments = _async_version(crud.get_user_investments)
+get_value_series = _cached_view("value-series", crud.get_value_series)
+get_fund_overlap = _cached_view("overlap", crud.get_fund_overlap)
+get_sector_allocation = _cached_view(
+    "sector-allocation", crud.get_sector_allocation)
+get_stock_exposure = _async_version(crud.get_stock_exposure)
+get_holdings_allocation = _async_version(crud.get_holdings_allocation)
+
+#  Stock allocation: slice and downsample the cached series
+
+
+async def get_stock_allocation(db, user_id: int, period: str = "1M", points: int = crud.MAX_SERIES_POINTS):
+    series = await get_value_series(db, user_id)
+    return crud.stock_allocation_from_series(series, period, points)
+
+#  Dashboard: cached sections are reused, the rest come from one crud pass
+
+
+async def get_dashboard(db, user_id: int, sections=crud.DASHBOARD_SECTIONS, period: str = "1M",
+                        points: int = crud.MAX_SERIES_POINTS):
+    views = {section: "value-series" if section == "stock-allocation" else section
+             for section in sections}
+    cached, missing = {}, []
+    for view in views.values():
+        cached[view] = await cache.get(_cache_key(user_id, view))
+        if cached[view] is None:
+            missing.append(view)
+
+    if missing:
+        computed = await run_db(db, crud.get_dashboard, user_id, missing, period, points)
+        for view in missing:
+            cached[view] = _validated(view, computed[view.replace("-", "_")])
+            await cache.set(_cache_key(user_id, view), cached[view])
+
+    #  Response schema order, whatever order the sections were requested in
+    result = {section.replace("-", "_"): cached[views[section]]
+              for section in crud.DASHBOARD_SECTIONS if section in views}
+    if "stock_allocation" in result:
+        result["stock_allocation"] = crud.stock_allocation_from_series(
+            result["stock_allocation"], period, points)
+    return result
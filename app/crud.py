@@ -1,27 +1,18 @@
+from sqlalchemy import func, insert, or_, tuple_
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
-from app import models, schemas
-from passlib.context import CryptContext
-from datetime import datetime, timedelta
-
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
-# Hash password
-
-
-def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
-
-# Verify password
-
-
-def verify_password(plain_password, hashed_password) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+from app import models, schemas, snapshots, valuation
+from app.utils.auth import get_password_hash
+from app.utils.catalogue import catalogue
+from datetime import date, datetime, timedelta
+import time
 
 # Create User
 
 
-def create_user(db: Session, user: schemas.UserCreate):
-    hashed_password = get_password_hash(user.password)
+def create_user(db: Session, user: schemas.UserCreate, hashed_password: str = None):
+    if hashed_password is None:
+        hashed_password = get_password_hash(user.password)
     db_user = models.User(username=user.username,
                           hashed_password=hashed_password)
     db.add(db_user)
@@ -29,59 +20,58 @@ def create_user(db: Session, user: schemas.UserCreate):
     db.refresh(db_user)
     return db_user
 
-# Get Portfolio Overview
+# Get User
 
 
-def get_portfolio(db: Session, username: str):
-    user = db.query(models.User).filter(
-        models.User.username == username).first()
-    if not user:
-        return {"error": "User not found"}
+def get_user_by_username(db: Session, username: str):
+    return db.query(models.User).filter(models.User.username == username).first()
 
-    investments = db.query(models.Investment).filter(
-        models.Investment.user_id == user.id).all()
+# Replace a stored password hash (rehash on login)
 
-    if not investments:
+
+def update_password_hash(db: Session, user_id: int, hashed_password: str):
+    db.query(models.User).filter(models.User.id == user_id).update(
+        {"hashed_password": hashed_password}, synchronize_session=False)
+    db.commit()
+
+# Get Portfolio Overview
+
+
+def get_portfolio(db: Session, user_id: int):
+    #  Read the materialized snapshot (built lazily if missing)
+    snapshot = db.get(models.PortfolioSnapshot, user_id)
+    if not snapshot:
+        snapshots.create_snapshot(db, user_id)
+        db.commit()
+        snapshot = db.get(models.PortfolioSnapshot, user_id)
+
+    if not snapshot or not snapshot.total_invested:
         return {
-            "initial_investment": 0,
-            "current_value": 0,
-            "growth_percentage": 0,
-            "one_day_return": 0,
+            "initial_investment": 0.0,
+            "current_value": 0.0,
+            "growth_percentage": 0.0,
+            "one_day_return": 0.0,
             "best_performing_scheme": None,
             "best_performing_scheme_return": None,
             "worst_performing_scheme": None,
             "worst_performing_scheme_return": None
         }
 
-    #  Total investment and current value
-    total_investment = sum(inv.amount_invested for inv in investments)
-    total_current_value = sum(
-        inv.amount_invested * (1 + inv.returns_since_investment / 100) for inv in investments)
+    total_investment = snapshot.total_invested
+    total_current_value = snapshot.current_value
     growth_percentage = ((total_current_value - total_investment) /
-                         total_investment) * 100 if total_investment else 0
+                         total_investment) * 100 if total_investment else 0.0
 
-    #  Find best and worst performing schemes
-    best_fund = max(
-        investments, key=lambda inv: inv.returns_since_investment, default=None)
-    worst_fund = min(
-        investments, key=lambda inv: inv.returns_since_investment, default=None)
+    best_scheme_return = snapshot.best_scheme_return
+    worst_scheme_return = snapshot.worst_scheme_return
 
-    best_scheme_name = best_fund.fund.name if best_fund else None
-    best_scheme_return = best_fund.returns_since_investment if best_fund else None
-
-    worst_scheme_name = worst_fund.fund.name if worst_fund else None
-    worst_scheme_return = worst_fund.returns_since_investment if worst_fund else None
-
-    #  Calculate 1-Day Return
+    #  Calculate 1-Day Return (investments dated after yesterday are excluded)
     yesterday = datetime.now() - timedelta(days=1)
-    yesterday_investments = db.query(models.Investment).filter(
-        models.Investment.user_id == user.id, models.Investment.date <= yesterday.date()
-    ).all()
-
-    yesterday_value = sum(inv.amount_invested * (1 + inv.returns_since_investment / 100)
-                          for inv in yesterday_investments)
+    yesterday_value = total_current_value
+    if snapshot.last_investment_date and snapshot.last_investment_date > yesterday.date():
+        yesterday_value -= snapshot.last_investment_date_value
     one_day_return = ((total_current_value - yesterday_value) /
-                      yesterday_value) * 100 if yesterday_value else 0
+                      yesterday_value) * 100 if yesterday_value else 0.0
 
     return {
         "initial_investment": total_investment,
@@ -89,20 +79,33 @@ def get_portfolio(db: Session, username: str):
         "growth_percentage": growth_percentage,
         #  Round to 2 decimal places
         "one_day_return": round(one_day_return, 2),
-        "best_performing_scheme": best_scheme_name,
+        "best_performing_scheme": snapshot.best_scheme,
         "best_performing_scheme_return": round(best_scheme_return, 2) if best_scheme_return is not None else None,
-        "worst_performing_scheme": worst_scheme_name,
+        "worst_performing_scheme": snapshot.worst_scheme,
         "worst_performing_scheme_return": round(worst_scheme_return, 2) if worst_scheme_return is not None else None
     }
 
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
 #  Get all mutual funds
 
 
-def get_all_mutual_funds(db: Session):
-    return db.query(models.MutualFund).all()
+def get_all_mutual_funds(db: Session, limit: int = None, after_id: int = None, fields: list = None):
+    """
+    All funds ordered by id. With `limit`, returns one keyset page after `after_id`;
+    with `fields`, returns lightweight rows holding only those columns.
+    """
+    if fields:
+        query = db.query(*[getattr(models.MutualFund, field)
+                         for field in fields])
+    else:
+        query = db.query(models.MutualFund)
+
+    if after_id is not None:
+        query = query.filter(models.MutualFund.id > after_id)
+    query = query.order_by(models.MutualFund.id)
+    if limit is not None:
+        query = query.limit(limit)
+    return query.all()
 
 #  Get details of a mutual fund
 
@@ -117,6 +120,7 @@ def create_mutual_fund(db: Session, fund: schemas.MutualFundBase):
     new_fund = models.MutualFund(name=fund.name, isin=fund.isin)
     db.add(new_fund)
     db.commit()
+    catalogue.invalidate()
     db.refresh(new_fund)
     return new_fund
 
@@ -128,9 +132,15 @@ def update_mutual_fund(db: Session, fund_id: int, fund: schemas.MutualFundBase):
         models.MutualFund.id == fund_id).first()
     if not db_fund:
         return None
+    if fund.name != db_fund.name:
+        #  Snapshots store the best / worst fund by name (names are unique)
+        for column in (models.PortfolioSnapshot.best_scheme, models.PortfolioSnapshot.worst_scheme):
+            db.query(models.PortfolioSnapshot).filter(column == db_fund.name).update(
+                {column: fund.name}, synchronize_session=False)
     db_fund.name = fund.name
     db_fund.isin = fund.isin
     db.commit()
+    catalogue.invalidate()
     db.refresh(db_fund)
     return db_fund
 
@@ -144,19 +154,23 @@ def delete_mutual_fund(db: Session, fund_id: int):
         return None
     db.delete(db_fund)
     db.commit()
+    catalogue.invalidate()
     return {"message": "Mutual fund deleted"}
 
 #  Create a new investment
 
 
-def create_investment(db: Session, username: str, investment: schemas.InvestmentBase):
-    user = db.query(models.User).filter(
-        models.User.username == username).first()
-    if not user:
-        return {"error": "User not found"}
+def create_investment(db: Session, user_id: int, investment: schemas.InvestmentBase):
+    """
+    Raises ValueError for an unknown fund.
+    """
+    fund_name = db.query(models.MutualFund.name).filter(
+        models.MutualFund.id == investment.fund_id).scalar()
+    if fund_name is None:
+        raise ValueError(f"Unknown fund_id {investment.fund_id}")
 
     new_investment = models.Investment(
-        user_id=user.id,
+        user_id=user_id,
         fund_id=investment.fund_id,
         date=investment.date,
         amount_invested=investment.amount_invested,
@@ -165,65 +179,210 @@ def create_investment(db: Session, username: str, investment: schemas.Investment
     )
 
     db.add(new_investment)
+
+    #  Keep the portfolio snapshot in step with the new row
+    snapshots.apply_investment(db, new_investment, fund_name)
+
     db.commit()
     db.refresh(new_investment)
     return new_investment
 
+#  Bulk import investments
+
+
+def bulk_create_investments(db: Session, user_id: int, rows: list, batch_size: int = 1000):
+    """
+    Insert `(row_number, InvestmentBase)` pairs in batches, one transaction per batch.
+    Rows with unknown fund ids are reported instead of inserted.
+    """
+    started = time.perf_counter()
+    fund_ids = {fund_id for (fund_id,) in db.query(models.MutualFund.id).filter(
+        models.MutualFund.id.in_({investment.fund_id for _, investment in rows}))}
+
+    errors = []
+    valid_rows = []
+    for row_number, investment in rows:
+        if investment.fund_id not in fund_ids:
+            errors.append(
+                {"row": row_number, "error": f"Unknown fund_id {investment.fund_id}"})
+        else:
+            valid_rows.append(
+                (row_number, {"user_id": user_id, **investment.model_dump()}))
+
+    inserted = 0
+    for i in range(0, len(valid_rows), batch_size):
+        batch = valid_rows[i:i + batch_size]
+        try:
+            db.execute(insert(models.Investment), [
+                       values for _, values in batch])
+            db.commit()
+            inserted += len(batch)
+        except SQLAlchemyError as e:
+            db.rollback()
+            errors.extend({"row": row_number, "error": f"Batch failed: {e.__class__.__name__}"}
+                          for row_number, _ in batch)
+
+    #  One snapshot rebuild for the user instead of one update per row
+    if inserted:
+        snapshots.refresh_snapshots(db, [user_id])
+        db.commit()
+
+    elapsed = time.perf_counter() - started
+    return {
+        "inserted": inserted,
+        "failed": len(errors),
+        "errors": sorted(errors, key=lambda error: error["row"]),
+        "elapsed_seconds": round(elapsed, 3),
+        "rows_per_second": round(inserted / elapsed, 1) if elapsed else 0
+    }
+
 #  Get user investments
 
 
-def get_user_investments(db: Session, username: str):
-    user = db.query(models.User).filter(
-        models.User.username == username).first()
-    if not user:
-        return []
-    return db.query(models.Investment).filter(models.Investment.user_id == user.id).all()
+def get_user_investments(db: Session, user_id: int, limit: int = None, after: tuple = None, fields: list = None):
+    """
+    A user's investments. With `limit`, returns one keyset page ordered by
+    (date, id) after the `after` pair; with `fields`, returns lightweight rows.
+    """
+    if fields:
+        query = db.query(*[getattr(models.Investment, field)
+                         for field in fields])
+    else:
+        query = db.query(models.Investment)
+    query = query.filter(models.Investment.user_id == user_id)
+
+    if after is not None:
+        query = query.filter(
+            tuple_(models.Investment.date, models.Investment.id) > tuple(after))
+    if limit is not None:
+        query = query.order_by(models.Investment.date,
+                               models.Investment.id).limit(limit)
+    return query.all()
+
+#  Stream a user's investments through a server-side cursor
+
+
+def iter_user_investments(db: Session, user_id: int, fields: list, batch_size: int = 1000):
+    """
+    Yield the user's investments as rows of `fields`, ordered by (date, id),
+    fetching `batch_size` rows at a time.
+    """
+    query = db.query(*[getattr(models.Investment, field) for field in fields]).filter(
+        models.Investment.user_id == user_id
+    ).order_by(models.Investment.date, models.Investment.id)
+
+    yield from query.yield_per(batch_size)
+
+
+#  NAVs in the period, plus each fund's latest NAV before it
+
+
+def _load_nav_points(db: Session, fund_ids, start_date, end_date):
+    latest_before = db.query(
+        models.NavHistory.fund_id, func.max(
+            models.NavHistory.date).label("date")
+    ).filter(
+        models.NavHistory.fund_id.in_(fund_ids),
+        models.NavHistory.date < start_date
+    ).group_by(models.NavHistory.fund_id).subquery()
+
+    seed = db.query(models.NavHistory.fund_id, models.NavHistory.date, models.NavHistory.nav).join(
+        latest_before, (models.NavHistory.fund_id == latest_before.c.fund_id) & (
+            models.NavHistory.date == latest_before.c.date))
+    in_period = db.query(models.NavHistory.fund_id, models.NavHistory.date, models.NavHistory.nav).filter(
+        models.NavHistory.fund_id.in_(fund_ids),
+        models.NavHistory.date.between(start_date, end_date))
+
+    return seed.union_all(in_period).all()
+
+
+#  Period ranges for the stock allocation graph
+PERIOD_MAP = {
+    "1M": timedelta(days=30),
+    "3M": timedelta(days=90),
+    "6M": timedelta(days=180),
+    "1Y": timedelta(days=365),
+    "3Y": timedelta(days=1095),
+    "MAX": timedelta(days=3650)  # Approx 10 years
+}
+
+
+#  Points returned per stock allocation graph, whatever the period
+MAX_SERIES_POINTS = 250
 
 
 #  Get stock allocation
-def get_stock_allocation(db: Session, username: str, period: str = "1M"):
-    """
-    Fetch investment value history and filter based on the selected time range.
-    """
-    user = db.query(models.User).filter(
-        models.User.username == username).first()
-    if not user:
-        return {"error": "User not found"}
-
-    #  Define period ranges
-    period_map = {
-        "1M": timedelta(days=30),
-        "3M": timedelta(days=90),
-        "6M": timedelta(days=180),
-        "1Y": timedelta(days=365),
-        "3Y": timedelta(days=1095),
-        "MAX": timedelta(days=3650)  # Approx 10 years
+def get_stock_allocation(db: Session, user_id: int, period: str = "1M", points: int = MAX_SERIES_POINTS):
+    """
+    Daily portfolio value (units held x NAV) over the selected time range.
+    """
+    return stock_allocation_from_series(get_value_series(db, user_id), period, points)
+
+
+def get_value_series(db: Session, user_id: int):
+    """
+    Daily portfolio value over the longest period (MAX), as {"start": iso date, "values": [...]}.
+    Every period is a slice of it, so one series (cached per user) serves them all.
+    """
+    end_date = datetime.now().date()
+
+    #  Every purchase up to today determines the units held in the period
+    investments = db.query(
+        models.Investment.fund_id, models.Investment.date, models.Investment.amount_invested,
+        models.Investment.nav_at_investment, models.Investment.returns_since_investment
+    ).filter(
+        models.Investment.user_id == user_id,
+        models.Investment.date <= end_date
+    ).all()
+
+    return _value_series_from(db, investments, end_date)
+
+
+def _value_series_from(db: Session, investments, end_date):
+    """
+    Value series from (fund_id, date, amount_invested, nav_at_investment, returns_since_investment) rows.
+    """
+    start_date = end_date - PERIOD_MAP["MAX"]
+    fund_ids = {inv[0] for inv in investments}
+    nav_points = _load_nav_points(
+        db, fund_ids, start_date, end_date) if fund_ids else []
+
+    dates, values = valuation.daily_portfolio_values(
+        investments, nav_points, start_date, end_date)
+
+    #  Plain JSON types so the series can be cached in Redis as-is
+    return {
+        "start": (dates[0] if dates else end_date).isoformat(),
+        "values": values.tolist()
     }
 
+
+def stock_allocation_from_series(series: dict, period: str = "1M", points: int = MAX_SERIES_POINTS):
+    """
+    Slice the selected period out of a value series and downsample it to `points`.
+    """
+    series_start = date.fromisoformat(series["start"])
+    end_date = series_start + timedelta(days=len(series["values"]) - 1)
     #  Get start date based on selected period
-    end_date = datetime.now().date()
-    start_date = end_date - \
-        period_map.get(period, timedelta(days=30))  # Default to 1M
+    start_date = datetime.now().date() - \
+        PERIOD_MAP.get(period, timedelta(days=30))  # Default to 1M
 
-    #  Fetch historical investments
-    history = db.query(models.Investment).filter(
-        models.Investment.user_id == user.id,
-        models.Investment.date >= start_date
-    ).order_by(models.Investment.date).all()
+    offset = max((start_date - series_start).days, 0)
+    values = series["values"][offset:]
+    first_date = series_start + timedelta(days=offset)
 
     #  Format data points for the graph
     history_points = [
-        {"date": inv.date, "value": inv.amount_invested *
-            (1 + inv.returns_since_investment / 100)}
-        for inv in history
-    ]
+        {"date": first_date + timedelta(days=int(day)), "value": values[day]}
+        for day in valuation.lttb(values, points)
+    ] if first_date <= end_date else []
 
     #  Calculate latest value and change percentage
-    latest_value = history_points[-1]["value"] if history_points else 0
-    initial_value = history_points[0]["value"] if history_points else 0
+    latest_value = history_points[-1]["value"] if history_points else 0.0
+    initial_value = history_points[0]["value"] if history_points else 0.0
     change_amount = latest_value - initial_value
     change_percentage = (change_amount / initial_value *
-                         100) if initial_value else 0
+                         100) if initial_value else 0.0
 
     return {
         "history": history_points,
@@ -235,48 +394,70 @@ def get_stock_allocation(db: Session, username: str, period: str = "1M"):
 #  Get fund overlap analysis
 
 
-def get_fund_overlap(db: Session, username: str):
+def _build_holdings_index(db: Session, fund_ids):
+    """
+    Load stock holdings for the given funds in one query, keyed by fund id.
+    Each fund maps holding identity (ISIN, else symbol) to the name shown (symbol, else ISIN).
+    """
+    holdings_index = {fund_id: {} for fund_id in fund_ids}
+    holdings = db.query(models.FundHolding.fund_id, models.FundHolding.symbol, models.FundHolding.security_isin).filter(
+        models.FundHolding.fund_id.in_(fund_ids)).all()
+    for fund_id, symbol, security_isin in holdings:
+        holdings_index[fund_id][security_isin or symbol] = symbol or security_isin
+    return holdings_index
+
+
+def get_fund_overlap(db: Session, user_id: int):
     """
     Fetch mutual fund overlap data for a user.
     """
-    user = db.query(models.User).filter(
-        models.User.username == username).first()
-    if not user:
-        return {"error": "User not found"}
+    #  Funds held by the user
+    held_fund_ids = {fund_id for (fund_id,) in db.query(models.Investment.fund_id).filter(
+        models.Investment.user_id == user_id).distinct()}
 
-    #  Fetch all investments for the user
-    investments = db.query(models.Investment).filter(
-        models.Investment.user_id == user.id).all()
+    return _fund_overlap_from(db, held_fund_ids)
 
-    if not investments:
+
+def _fund_overlap_from(db: Session, held_fund_ids, fund_names: dict = None):
+    """
+    Overlaps between the given funds; `fund_names` is looked up when not already loaded.
+    """
+    if not held_fund_ids:
+        return {"overlaps": []}
+
+    #  Only pairs where the user holds both funds
+    overlap_data = db.query(models.FundOverlap).filter(
+        models.FundOverlap.fund_id.in_(held_fund_ids),
+        models.FundOverlap.overlapping_fund_id.in_(held_fund_ids)
+    ).all()
+
+    if not overlap_data:
         return {"overlaps": []}
 
-    #  Fetch fund overlap data
-    overlap_data = db.query(models.FundOverlap).all()
+    fund_ids = {overlap.fund_id for overlap in overlap_data} | {
+        overlap.overlapping_fund_id for overlap in overlap_data}
+    if fund_names is None:
+        fund_names = dict(db.query(models.MutualFund.id, models.MutualFund.name).filter(
+            models.MutualFund.id.in_(fund_ids)).all())
+    holdings_index = _build_holdings_index(db, fund_ids)
 
     response_data = []
 
     for overlap in overlap_data:
-        fund_1 = db.query(models.MutualFund).filter(
-            models.MutualFund.id == overlap.fund_id).first()
-        fund_2 = db.query(models.MutualFund).filter(
-            models.MutualFund.id == overlap.overlapping_fund_id).first()
+        fund_1_name = fund_names.get(overlap.fund_id)
+        fund_2_name = fund_names.get(overlap.overlapping_fund_id)
 
-        if not fund_1 or not fund_2:
+        if not fund_1_name or not fund_2_name:
             continue
 
-        #  Fetch stocks common to both funds
-        fund_1_stocks = db.query(models.FundAllocation).filter(
-            models.FundAllocation.fund_id == fund_1.id).all()
-        fund_2_stocks = db.query(models.FundAllocation).filter(
-            models.FundAllocation.fund_id == fund_2.id).all()
-
-        common_stocks = list(set([s.sector for s in fund_1_stocks]) & set(
-            [s.sector for s in fund_2_stocks]))
+        #  Stocks common to both funds
+        fund_holdings = holdings_index[overlap.fund_id]
+        common_stocks = [fund_holdings[key] for key in
+                         fund_holdings.keys() & holdings_index[overlap.overlapping_fund_id].keys()]
 
         response_data.append({
-            "fund_name": fund_1.name,
-            "overlapping_fund_name": fund_2.name,
+            "fund_name": fund_1_name,
+            "overlapping_fund_name": fund_2_name,
             "overlap_percentage": overlap.overlap_percentage,
             "common_stocks": common_stocks
         })
@@ -285,25 +466,23 @@ def get_fund_overlap(db: Session, username: str):
 
 
 #  Get sector allocation
-def get_sector_allocation(db: Session, username: str):
+def get_sector_allocation(db: Session, user_id: int, aggregate_in_db: bool = True):
     """
     Fetch sector-wise investment allocation for a user.
     """
-    user = db.query(models.User).filter(
-        models.User.username == username).first()
-    if not user:
-        return {"error": "User not found"}
+    if aggregate_in_db:
+        return _get_sector_allocation_sql(db, user_id)
 
     #  Fetch all investments for the user
     investments = db.query(models.Investment).filter(
-        models.Investment.user_id == user.id).all()
+        models.Investment.user_id == user_id).all()
 
     if not investments:
-        return {"allocations": [], "total_investment": 0}
+        return {"allocations": [], "total_investment": 0.0}
 
     #  Map investments to sectors
     sector_investments = {}
-    total_investment = 0
+    total_investment = 0.0
 
     for inv in investments:
         fund = db.query(models.MutualFund).filter(
@@ -321,17 +500,164 @@ def get_sector_allocation(db: Session, username: str):
             total_investment += inv.amount_invested * \
                 (allocation.percentage / 100)
 
-    #  Convert data to structured format
+    return _sector_allocation_response(sector_investments.items(), total_investment)
+
+
+def _get_sector_allocation_sql(db: Session, user_id: int):
+    """
+    Sector-wise allocation computed as a single GROUP BY in the database.
+    """
+    weighted_amount = func.sum(
+        models.Investment.amount_invested * models.FundAllocation.percentage / 100)
+    rows = db.query(models.FundAllocation.sector, weighted_amount).join(
+        models.Investment, models.Investment.fund_id == models.FundAllocation.fund_id
+    ).filter(
+        models.Investment.user_id == user_id
+    ).group_by(models.FundAllocation.sector).all()
+
+    total_investment = sum((amount for _, amount in rows), 0.0)
+
+    return _sector_allocation_response(rows, total_investment)
+
+
+def _sector_allocation_response(sector_amounts, total_investment: float):
+    """
+    Response for (sector, unrounded amount) pairs. Largest sector first, ties by
+    name, so both aggregation paths return the same order.
+    """
     sector_data = [
         {
             "sector": sector,
             "invested_amount": round(amount, 2),
-            "percentage": round((amount / total_investment) * 100, 2) if total_investment else 0
+            "percentage": round((amount / total_investment) * 100, 2) if total_investment else 0.0
         }
-        for sector, amount in sector_investments.items()
+        for sector, amount in sector_amounts
     ]
+    sector_data.sort(key=lambda item: (-item["invested_amount"], item["sector"]))
 
     return {
         "allocations": sector_data,
         "total_investment": round(total_investment, 2)
     }
+
+
+#  Which of the user's funds hold a security, and the look-through exposure to it
+
+
+def get_stock_exposure(db: Session, user_id: int, security: str):
+    """
+    Exposure to one security (ISIN or symbol) across the user's funds.
+    """
+    invested = func.sum(models.Investment.amount_invested)
+    rows = db.query(
+        models.MutualFund.name, models.FundHolding.weight, invested
+    ).join(
+        models.Investment, models.Investment.fund_id == models.FundHolding.fund_id
+    ).join(
+        models.MutualFund, models.MutualFund.id == models.FundHolding.fund_id
+    ).filter(
+        or_(models.FundHolding.security_isin == security,
+            models.FundHolding.symbol == security),
+        models.Investment.user_id == user_id
+    ).group_by(models.MutualFund.name, models.FundHolding.weight).all()
+
+    funds = [
+        {
+            "fund_name": fund_name,
+            "weight": weight,
+            "exposure": round(amount * weight / 100, 2)
+        }
+        for fund_name, weight, amount in rows
+    ]
+
+    return {
+        "security": security,
+        "funds": funds,
+        "total_exposure": round(sum((fund["exposure"] for fund in funds), 0.0), 2)
+    }
+
+#  Stock-level look-through allocation
+
+
+def get_holdings_allocation(db: Session, user_id: int, limit: int = 50):
+    """
+    Look-through exposure to each underlying stock, largest first, as one grouped query.
+    """
+    #  Amount per fund first, so the holdings join sees one row per fund
+    fund_amounts = db.query(
+        models.Investment.fund_id, func.sum(
+            models.Investment.amount_invested).label("amount")
+    ).filter(models.Investment.user_id == user_id).group_by(models.Investment.fund_id).subquery()
+
+    exposure = func.sum(fund_amounts.c.amount *
+                        models.FundHolding.weight / 100)
+    rows = db.query(
+        func.max(models.FundHolding.security_isin), func.max(models.FundHolding.symbol),
+        func.max(models.FundHolding.sector), exposure
+    ).join(
+        fund_amounts, fund_amounts.c.fund_id == models.FundHolding.fund_id
+    ).group_by(models.HOLDING_KEY).order_by(exposure.desc()).limit(limit).all()
+
+    total_investment = db.query(func.coalesce(func.sum(fund_amounts.c.amount), 0.0)).scalar()
+
+    holdings = [
+        {
+            "security_isin": security_isin,
+            "symbol": symbol,
+            "sector": sector,
+            "exposure": round(amount, 2),
+            "percentage": round(amount / total_investment * 100, 2) if total_investment else 0.0
+        }
+        for security_isin, symbol, sector, amount in rows
+    ]
+
+    return {
+        "holdings": holdings,
+        "total_investment": round(float(total_investment), 2)
+    }
+
+
+#  Every dashboard view in one call
+
+
+DASHBOARD_SECTIONS = ("portfolio", "sector-allocation",
+                      "stock-allocation", "overlap")
+
+
+def get_dashboard(db: Session, user_id: int, sections=DASHBOARD_SECTIONS, period: str = "1M",
+                  points: int = MAX_SERIES_POINTS):
+    """
+    Compute the requested dashboard views. Portfolio and sector allocation use the same
+    queries as their own endpoints (the cache holds one entry for both); stock allocation
+    and overlap share one load of the user's investments.
+    Returns a dict keyed by section name, with dashes as underscores.
+    """
+    result = {}
+    if "portfolio" in sections:
+        result["portfolio"] = get_portfolio(db, user_id)
+    if "sector-allocation" in sections:
+        result["sector_allocation"] = _get_sector_allocation_sql(db, user_id)
+
+    needs_series = "stock-allocation" in sections or "value-series" in sections
+    if not needs_series and "overlap" not in sections:
+        return result
+
+    investments = db.query(
+        models.Investment.fund_id, models.Investment.date, models.Investment.amount_invested,
+        models.Investment.nav_at_investment, models.Investment.returns_since_investment
+    ).filter(models.Investment.user_id == user_id).all()
+
+    if needs_series:
+        today = datetime.now().date()
+        series = _value_series_from(db, [inv for inv in investments if inv.date <= today], today)
+        if "stock-allocation" in sections:
+            result["stock_allocation"] = stock_allocation_from_series(
+                series, period, points)
+        #  Raw series for callers that cache it (see `async_crud.get_dashboard`)
+        if "value-series" in sections:
+            result["value_series"] = series
+
+    if "overlap" in sections:
+        result["overlap"] = _fund_overlap_from(db, {inv.fund_id for inv in investments})
+
+    return result
@@ -1,19 +1,175 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, QueuePool
+from starlette.concurrency import run_in_threadpool
+import asyncio
 import os
+import threading
 from dotenv import load_dotenv
+from app.utils.logging import instrument_queries
+from app.utils.pool import PoolStats, instrument_engine, instrumented_pool_class
 
 load_dotenv()
 
 LIVE_DATABASE_URL = os.getenv(
     "LIVE_DATABASE_URL")
 
-engine = create_engine(LIVE_DATABASE_URL, connect_args={"sslmode": "require"}
-                       )
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+#  Serve requests through asyncpg instead of the psycopg2 threadpool path
+USE_ASYNC_DB = os.getenv("USE_ASYNC_DB", "false").lower() in ("1", "true", "yes")
+
+#  asyncpg URL derived from LIVE_DATABASE_URL unless ASYNC_DATABASE_URL is set
+
+
+def _async_url(url: str):
+    """
+    asyncpg form of a PostgreSQL URL, whatever sync driver it names. asyncpg takes
+    no `sslmode` query argument; SSL is passed as a connect arg instead.
+    """
+    return make_url(url).set(drivername="postgresql+asyncpg").difference_update_query(["sslmode"])
+
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or (
+    _async_url(LIVE_DATABASE_URL) if LIVE_DATABASE_URL else None)
+
+#  Connection pool settings
+#  DB_POOL_MODE=null opens a connection per checkout (for PgBouncer in front)
+DB_POOL_MODE = os.getenv("DB_POOL_MODE", "queue").lower()
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+#  With USE_ASYNC_DB requests use the async pool above and the sync pool only streams
+#  exports, so it gets its own, smaller size; otherwise it is the request pool
+DB_SYNC_POOL_SIZE = int(os.getenv(
+    "DB_SYNC_POOL_SIZE", "1" if USE_ASYNC_DB else str(DB_POOL_SIZE)))
+DB_SYNC_MAX_OVERFLOW = int(os.getenv(
+    "DB_SYNC_MAX_OVERFLOW", "2" if USE_ASYNC_DB else str(DB_MAX_OVERFLOW)))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv(
+    "DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+#  PgBouncer in transaction mode cannot keep asyncpg prepared statements
+DB_DISABLE_STATEMENT_CACHE = os.getenv(
+    "DB_DISABLE_STATEMENT_CACHE", "false").lower() in ("1", "true", "yes")
+
+pool_stats = PoolStats()
+async_pool_stats = PoolStats()
+
+
+def _pool_options(queue_pool_class, stats: PoolStats, pool_size: int, max_overflow: int) -> dict:
+    if DB_POOL_MODE == "null":
+        return {"poolclass": instrumented_pool_class(NullPool, stats)}
+    return {
+        "poolclass": instrumented_pool_class(queue_pool_class, stats),
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+    }
+
+
+#  SSL only applies to PostgreSQL; a SQLite stand-in (benchmarks) takes no connect args
+DB_SSLMODE = os.getenv("DB_SSLMODE", "require")
+sync_connect_args = {"sslmode": DB_SSLMODE} if not LIVE_DATABASE_URL or LIVE_DATABASE_URL.startswith(
+    "postgresql") else {}
+
+#  Connections opened by `warm_up_pool` at startup (0 disables)
+DB_WARMUP_CONNECTIONS = int(os.getenv("DB_WARMUP_CONNECTIONS", "0"))
+
+#  Sessions bind to the engine the first time one is opened
+
+
+class _LazySessionmaker(sessionmaker):
+    def __call__(self, **local_kw):
+        if engine is None:
+            init_engines()
+        return super().__call__(**local_kw)
+
+
+engine = None
+SessionLocal = _LazySessionmaker(autocommit=False, autoflush=False)
 Base = declarative_base()
 
+async_engine = None
+AsyncSessionLocal = None
+_init_lock = threading.Lock()
+
+#  Engines are built on first use (or by the app's lifespan hook), not at import,
+#  so importing the app, alembic or a CLI never waits on the database
+
+
+def init_engines():
+    """
+    Build the sync (and, with USE_ASYNC_DB, async) engine once. Returns the sync engine.
+    """
+    global engine, async_engine, AsyncSessionLocal
+    with _init_lock:
+        if engine is not None:
+            return engine
+
+        sync_engine = create_engine(LIVE_DATABASE_URL, connect_args=sync_connect_args,
+                                    **_pool_options(QueuePool, pool_stats, DB_SYNC_POOL_SIZE, DB_SYNC_MAX_OVERFLOW))
+        instrument_engine(sync_engine, pool_stats)
+        instrument_queries(sync_engine)
+        SessionLocal.configure(bind=sync_engine)
+
+        if USE_ASYNC_DB:
+            async_connect_args = {"ssl": "require"}
+            async_url = make_url(ASYNC_DATABASE_URL)
+            if DB_DISABLE_STATEMENT_CACHE:
+                async_connect_args["statement_cache_size"] = 0
+                async_url = async_url.update_query_dict(
+                    {"prepared_statement_cache_size": "0"})
+            async_engine = create_async_engine(
+                async_url, connect_args=async_connect_args,
+                **_pool_options(AsyncAdaptedQueuePool, async_pool_stats, DB_POOL_SIZE, DB_MAX_OVERFLOW))
+            instrument_engine(async_engine.sync_engine, async_pool_stats)
+            instrument_queries(async_engine.sync_engine)
+            #  Objects are serialized after the session closes, so keep them loaded
+            AsyncSessionLocal = async_sessionmaker(
+                async_engine, autoflush=False, expire_on_commit=False)
+
+        engine = sync_engine
+        return engine
+
+
+async def dispose_engines():
+    global engine, async_engine, AsyncSessionLocal
+    if async_engine is not None:
+        await async_engine.dispose()
+    if engine is not None:
+        engine.dispose()
+    engine = async_engine = AsyncSessionLocal = None
+
+#  Open pool connections ahead of the first requests
+
+
+async def warm_up_pool(connections: int = DB_WARMUP_CONNECTIONS):
+    """
+    Open `connections` connections at once and return them to the pool, so the
+    first requests skip connect and TLS handshakes.
+    """
+    #  Only pooled connections outlive the warm-up
+    connections = min(connections, DB_POOL_SIZE if USE_ASYNC_DB else DB_SYNC_POOL_SIZE)
+    if connections <= 0 or DB_POOL_MODE == "null":
+        return
+    init_engines()
+
+    if async_engine is not None:
+        opened = await asyncio.gather(*(async_engine.connect().start() for _ in range(connections)))
+        for connection in opened:
+            await connection.close()
+        return
+
+    def _open_and_release():
+        opened = [engine.connect() for _ in range(connections)]
+        for connection in opened:
+            connection.close()
+
+    await run_in_threadpool(_open_and_release)
+
 # Dependency to get DB session
 
 
@@ -23,3 +179,28 @@ def get_db():
         yield db
     finally:
         db.close()
+
+# Dependency for async routes (AsyncSession, or a sync Session when async mode is off)
+
+
+async def get_async_db():
+    if not USE_ASYNC_DB:
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            await run_in_threadpool(db.close)
+        return
+
+    if AsyncSessionLocal is None:
+        init_engines()
+    async with AsyncSessionLocal() as db:
+        yield db
+
+# Run a sync crud function against whichever session `get_async_db` produced
+
+
+async def run_db(db, fn, *args, **kwargs):
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(fn, *args, **kwargs)
+    return await run_in_threadpool(fn, db, *args, **kwargs)
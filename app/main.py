@@ -1,14 +1,37 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from app.routes import auth, fund, portfolio, investment, portfolio
+from app.routes import auth, fund, portfolio, investment, internal
 import uvicorn
 from fastapi.middleware.cors import CORSMiddleware
-from app.database import engine, Base
+from loguru import logger
+from app import database
+from app.utils.logging import instrument_request
+from app.utils.responses import DefaultJSONResponse
 import os
+import time
 
-# Initialize DB
-Base.metadata.create_all(bind=engine)
+#  Prime the mutual fund catalogue before the first request
+WARMUP_CATALOGUE = os.getenv(
+    "WARMUP_CATALOGUE", "false").lower() in ("1", "true", "yes")
 
-app = FastAPI(title="Portfolio Dashboard API")
+#  Startup and shutdown: engines are built here, the schema is managed by Alembic
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    started = time.perf_counter()
+    database.init_engines()
+    await database.warm_up_pool()
+    if WARMUP_CATALOGUE:
+        async for db in database.get_async_db():
+            await fund.load_catalogue(db)
+    logger.info("Startup finished in {:.1f}ms", (time.perf_counter() - started) * 1000)
+    yield
+    await database.dispose_engines()
+
+
+app = FastAPI(title="Portfolio Dashboard API",
+              default_response_class=DefaultJSONResponse, lifespan=lifespan)
 
 #  Enable CORS (Fixes frontend communication issues)
 app.add_middleware(
@@ -20,12 +43,17 @@ app.add_middleware(
     allow_headers=["*"],  # Allow all headers
 )
 
+#  Per-request timing, query counts and slow-request log
+app.middleware("http")(instrument_request)
+
 #  Register API Routes
 app.include_router(auth.router, prefix="/auth", tags=["Authentication"])
 app.include_router(portfolio.router, prefix="/api", tags=["Portfolio"])
 app.include_router(fund.router, prefix="/api", tags=["Mutual Funds"])
 app.include_router(investment.router, prefix="/api", tags=["Investments"])
+app.include_router(internal.router, prefix="/internal", tags=["Internal"])
+app.include_router(internal.metrics_router, tags=["Internal"])
 
 if __name__ == "__main__":
     port = int(os.getenv("PORT", 8000))  # Fallback to 8000 if no port is set
-    uvicorn.run("main:app", host="0.0.0.0", port=port)
+    uvicorn.run("app.main:app", host="0.0.0.0", port=port)
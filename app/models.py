@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, Date, Index
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, Date, Index, UniqueConstraint, func
 from sqlalchemy.orm import relationship
 from app.database import Base
 
@@ -20,6 +20,7 @@ class MutualFund(Base):
 
     investments = relationship("Investment", back_populates="fund")
     allocations = relationship("FundAllocation", back_populates="fund")
+    holdings = relationship("FundHolding", back_populates="fund")
 
     #  Explicitly define `foreign_keys` in the relationship
     overlaps = relationship(
@@ -56,6 +57,27 @@ class FundAllocation(Base):
     fund = relationship("MutualFund", back_populates="allocations")
 
 
+class FundHolding(Base):
+    __tablename__ = "fund_holdings"
+
+    id = Column(Integer, primary_key=True, index=True)
+    fund_id = Column(Integer, ForeignKey("mutual_funds.id"))
+    security_isin = Column(String)
+    symbol = Column(String)
+    sector = Column(String)
+    weight = Column(Float)
+
+    fund = relationship("MutualFund", back_populates="holdings")
+
+    #  Also serves fund -> holdings lookups
+    __table_args__ = (UniqueConstraint(
+        "fund_id", "security_isin", name="uq_fund_holding_security"),)
+
+
+#  A holding's identity: its ISIN, or its symbol when the ISIN is missing
+HOLDING_KEY = func.coalesce(FundHolding.security_isin, FundHolding.symbol)
+
+
 class FundOverlap(Base):
     __tablename__ = "fund_overlaps"
 
@@ -71,6 +93,75 @@ class FundOverlap(Base):
         "MutualFund", foreign_keys=[overlapping_fund_id])
 
 
+class NavHistory(Base):
+    __tablename__ = "nav_history"
+
+    #  Primary key doubles as the (fund, date) range index
+    fund_id = Column(Integer, ForeignKey("mutual_funds.id"), primary_key=True)
+    date = Column(Date, primary_key=True)
+    nav = Column(Float)
+
+    fund = relationship("MutualFund")
+
+
+class PortfolioSnapshot(Base):
+    __tablename__ = "portfolio_snapshots"
+
+    #  One row per user, maintained by `app.snapshots`
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    total_invested = Column(Float, default=0)
+    current_value = Column(Float, default=0)
+    best_scheme = Column(String, nullable=True)
+    best_scheme_return = Column(Float, nullable=True)
+    worst_scheme = Column(String, nullable=True)
+    worst_scheme_return = Column(Float, nullable=True)
+    #  Latest investment date and the value invested on it (for 1-day return)
+    last_investment_date = Column(Date, nullable=True)
+    last_investment_date_value = Column(Float, default=0)
+
+    user = relationship("User")
+
+
+#  Nightly reporting tables, written by `app.analytics_job`
+
+
+class ReportPortfolioOverview(Base):
+    __tablename__ = "report_portfolio_overviews"
+
+    report_date = Column(Date, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    initial_investment = Column(Float)
+    current_value = Column(Float)
+    growth_percentage = Column(Float)
+    one_day_return = Column(Float)
+    best_performing_scheme = Column(String, nullable=True)
+    best_performing_scheme_return = Column(Float, nullable=True)
+    worst_performing_scheme = Column(String, nullable=True)
+    worst_performing_scheme_return = Column(Float, nullable=True)
+
+
+class ReportSectorAllocation(Base):
+    __tablename__ = "report_sector_allocations"
+
+    report_date = Column(Date, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    sector = Column(String, primary_key=True)
+    invested_amount = Column(Float)
+    percentage = Column(Float)
+
+
 # Indexing for optimization
 Index("idx_fund_isin", MutualFund.isin)
-Index("idx_fund_overlap", FundOverlap.fund_id, FundOverlap.overlapping_fund_id)
+#  One row per pair; the overlap job upserts on it
+Index("idx_fund_overlap", FundOverlap.fund_id, FundOverlap.overlapping_fund_id, unique=True)
+#  Inverted security -> funds index
+Index("idx_fund_holding_security", FundHolding.security_isin,
+      FundHolding.fund_id, postgresql_include=["weight"])
+Index("idx_fund_holding_symbol", FundHolding.symbol, FundHolding.fund_id)
+#  Every portfolio query filters investments by user, ranges or orders on (date, id)
+#  and reads only these columns, so it is answered from the index alone
+Index("idx_investment_user_date", Investment.user_id, Investment.date, Investment.id,
+      postgresql_include=["fund_id", "amount_invested", "nav_at_investment", "returns_since_investment"])
+Index("idx_investment_fund", Investment.fund_id)
+Index("idx_fund_allocation_fund", FundAllocation.fund_id,
+      postgresql_include=["sector", "percentage"])
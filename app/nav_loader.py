@@ -0,0 +1,154 @@
+import argparse
+import asyncio
+import csv
+import io
+import time
+from datetime import datetime
+from sqlalchemy.orm import Session
+from app import async_crud
+from app.database import SessionLocal
+from app.models import Investment, MutualFund, NavHistory
+
+#  Parse an AMFI NAVAll-style file:
+#  Scheme Code;ISIN Div Payout/ ISIN Growth;ISIN Div Reinvestment;Scheme Name;Net Asset Value;Date
+#  Section headers, AMC names and blank lines are skipped.
+
+
+def parse_nav_lines(lines):
+    """
+    Yield (isin, date, nav) for every priced ISIN in the file, one line at a time.
+    """
+    for line in lines:
+        parts = line.strip().split(";")
+        if len(parts) != 6 or not parts[0].isdigit():
+            continue
+        _, growth_isin, reinvest_isin, _, nav, nav_date = parts
+        try:
+            nav = float(nav)
+            nav_date = datetime.strptime(nav_date.strip(), "%d-%b-%Y").date()
+        except ValueError:
+            #  "N.A." NAVs and malformed dates
+            continue
+        for isin in (growth_isin.strip(), reinvest_isin.strip()):
+            if isin and isin != "-":
+                yield isin, nav_date, nav
+
+#  Resolve ISINs to fund ids and upsert into nav_history
+
+
+def load_nav_lines(db: Session, lines, batch_size: int = 5000, use_copy: bool = None):
+    """
+    Load parsed NAVs into nav_history. Re-loading the same day's file overwrites
+    its NAVs instead of duplicating them. Uses COPY on PostgreSQL, batched upserts elsewhere.
+    """
+    started = time.perf_counter()
+    isin_to_id = dict(db.query(MutualFund.isin, MutualFund.id).filter(
+        MutualFund.isin.isnot(None)))
+
+    navs = {}
+    parsed = unmatched = 0
+    for isin, nav_date, nav in parse_nav_lines(lines):
+        parsed += 1
+        fund_id = isin_to_id.get(isin)
+        if fund_id is None:
+            unmatched += 1
+            continue
+        navs[(fund_id, nav_date)] = nav
+
+    dialect = db.get_bind().dialect.name
+    if use_copy is None:
+        use_copy = dialect == "postgresql"
+
+    if use_copy:
+        _copy_upsert(db, navs)
+    else:
+        _batched_upsert(db, navs, dialect, batch_size)
+
+    #  Snapshots are valued from recorded returns, not NAVs, so only the holders'
+    #  cached value series go stale
+    user_ids = _holders(db, {fund_id for fund_id, _ in navs})
+    db.commit()
+
+    elapsed = time.perf_counter() - started
+    return {
+        "parsed": parsed,
+        "unmatched": unmatched,
+        "loaded": len(navs),
+        "user_ids": user_ids,
+        "elapsed_seconds": round(elapsed, 3),
+    }
+
+
+def _holders(db: Session, fund_ids) -> list:
+    if not fund_ids:
+        return []
+    return [user_id for (user_id,) in db.query(Investment.user_id).filter(
+        Investment.fund_id.in_(fund_ids)).distinct().order_by(Investment.user_id)]
+
+
+def _copy_upsert(db: Session, navs: dict):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for (fund_id, nav_date), nav in navs.items():
+        writer.writerow((fund_id, nav_date.isoformat(), nav))
+    buffer.seek(0)
+
+    cursor = db.connection().connection.cursor()
+    try:
+        cursor.execute(
+            "CREATE TEMP TABLE nav_staging (fund_id integer, date date, nav double precision) ON COMMIT DROP")
+        cursor.copy_expert(
+            "COPY nav_staging (fund_id, date, nav) FROM STDIN WITH (FORMAT csv)", buffer)
+        cursor.execute(
+            "INSERT INTO nav_history (fund_id, date, nav) SELECT fund_id, date, nav FROM nav_staging "
+            "ON CONFLICT (fund_id, date) DO UPDATE SET nav = EXCLUDED.nav")
+    finally:
+        cursor.close()
+
+
+def _batched_upsert(db: Session, navs: dict, dialect: str, batch_size: int):
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+
+    rows = [{"fund_id": fund_id, "date": nav_date, "nav": nav}
+            for (fund_id, nav_date), nav in navs.items()]
+    for i in range(0, len(rows), batch_size):
+        statement = insert(NavHistory).values(rows[i:i + batch_size])
+        db.execute(statement.on_conflict_do_update(
+            index_elements=[NavHistory.fund_id, NavHistory.date],
+            set_={"nav": statement.excluded.nav}))
+
+#  Load a NAV file from disk
+
+
+def load_nav_file(path: str, batch_size: int = 5000):
+    db: Session = SessionLocal()
+
+    try:
+        with open(path, encoding="utf-8-sig") as f:
+            result = load_nav_lines(db, f, batch_size=batch_size)
+        #  Cached value series of the affected users are stale now
+        asyncio.run(async_crud.invalidate_users(result["user_ids"]))
+        print(f"✅ Loaded {result['loaded']} NAVs ({result['unmatched']} unmatched ISINs), "
+              f"invalidated {len(result['user_ids'])} users' cached views in {result['elapsed_seconds']}s")
+        return result
+
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Error loading NAV file: {e}")
+        raise SystemExit(1) from e
+
+    finally:
+        db.close()
+
+
+#  Run the loader
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Load a daily AMFI NAVAll file into nav_history")
+    parser.add_argument("path")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    args = parser.parse_args()
+    load_nav_file(args.path, args.batch_size)
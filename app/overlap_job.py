@@ -0,0 +1,159 @@
+import argparse
+import time
+import numpy as np
+from sqlalchemy import Column, Float, Integer, MetaData, Table, delete, exists, select, true
+from sqlalchemy.orm import Session
+from app.database import SessionLocal
+from app.models import HOLDING_KEY, FundHolding, FundOverlap
+
+#  Pairwise overlap between all funds: sum over holdings of min(weight_a, weight_b)
+
+
+def _holding_groups(holdings):
+    """
+    Group (fund_id, holding, weight) rows by holding. Returns (fund_ids, groups), where
+    each group is (fund positions ascending, weights) for a holding held by 2+ funds.
+    """
+    fund_index, holding_index = {}, {}
+    fund_col, holding_col, weights = [], [], []
+    for fund_id, holding, weight in holdings:
+        fund_col.append(fund_index.setdefault(fund_id, len(fund_index)))
+        holding_col.append(holding_index.setdefault(
+            holding, len(holding_index)))
+        weights.append(weight or 0)
+
+    n_funds = len(fund_index)
+    if not n_funds:
+        return [], []
+
+    #  (fund, holding) weights summed over duplicate rows, then grouped by holding
+    fund_col = np.array(fund_col, dtype=np.int64)
+    holding_col = np.array(holding_col, dtype=np.int64)
+    keys, inverse = np.unique(holding_col * n_funds + fund_col, return_inverse=True)
+    summed = np.bincount(inverse, weights=np.array(weights, dtype=np.float64))
+    holding_of, fund_of = np.divmod(keys, n_funds)
+
+    boundaries = np.flatnonzero(np.diff(holding_of)) + 1
+    groups = [(funds, fund_weights) for funds, fund_weights in zip(
+        np.split(fund_of, boundaries), np.split(summed, boundaries)) if len(funds) > 1]
+    return sorted(fund_index, key=fund_index.get), groups
+
+
+def compute_overlaps(holdings, min_overlap: float = 0.0, block_size: int = 500):
+    """
+    Yield (fund_ids, overlapping_fund_ids, overlap_percentages) arrays for every fund
+    pair above `min_overlap`, each pair once with the smaller fund id first.
+
+    Works through an inverted holding -> funds index, one block of `block_size` funds
+    at a time, so memory stays at block_size x funds instead of funds x funds.
+    """
+    fund_ids, groups = _holding_groups(holdings)
+    ids = np.array(fund_ids, dtype=np.int64)
+    n_funds = len(ids)
+    for start in range(0, n_funds, block_size):
+        stop = min(start + block_size, n_funds)
+        block = np.zeros((stop - start, n_funds), dtype=np.float32)
+        for funds, fund_weights in groups:
+            lo, hi = np.searchsorted(funds, (start, stop))
+            if lo == hi:
+                continue
+            #  Only columns at or after the block's first fund: the upper triangle
+            block[np.ix_(funds[lo:hi] - start, funds[lo:])] += np.minimum.outer(
+                fund_weights[lo:hi], fund_weights[lo:])
+
+        rows, cols = np.nonzero(block > min_overlap)
+        upper = cols > rows + start
+        rows, cols = rows[upper], cols[upper]
+        if not len(rows):
+            continue
+        fund_a, fund_b = ids[rows + start], ids[cols]
+        yield (np.minimum(fund_a, fund_b), np.maximum(fund_a, fund_b),
+               np.round(block[rows, cols].astype(np.float64), 2))
+
+#  Upsert computed overlaps into fund_overlaps
+
+
+def store_overlaps(db: Session, blocks, batch_size: int = 10000):
+    """
+    Replace fund_overlaps with the pairs from `compute_overlaps`: pairs are staged in a
+    temporary table, upserted on (fund_id, overlapping_fund_id), and rows for pairs
+    no longer above the threshold are removed. The caller commits.
+    """
+    connection = db.connection()
+    staging = Table("fund_overlap_staging", MetaData(),
+                    Column("fund_id", Integer, primary_key=True),
+                    Column("overlapping_fund_id", Integer, primary_key=True),
+                    Column("overlap_percentage", Float),
+                    prefixes=["TEMPORARY"])
+    staging.create(connection)
+
+    staged = 0
+    rows = []
+    for fund_a, fund_b, values in blocks:
+        rows.extend({"fund_id": int(a), "overlapping_fund_id": int(b), "overlap_percentage": float(value)}
+                    for a, b, value in zip(fund_a, fund_b, values))
+        while len(rows) >= batch_size:
+            connection.execute(staging.insert(), rows[:batch_size])
+            staged += batch_size
+            rows = rows[batch_size:]
+    if rows:
+        connection.execute(staging.insert(), rows)
+        staged += len(rows)
+
+    if connection.dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+
+    columns = [staging.c.fund_id, staging.c.overlapping_fund_id, staging.c.overlap_percentage]
+    #  WHERE true keeps SQLite from reading ON CONFLICT as part of the SELECT
+    statement = insert(FundOverlap).from_select(
+        ["fund_id", "overlapping_fund_id", "overlap_percentage"], select(*columns).where(true()))
+    connection.execute(statement.on_conflict_do_update(
+        index_elements=[FundOverlap.fund_id, FundOverlap.overlapping_fund_id],
+        set_={"overlap_percentage": statement.excluded.overlap_percentage}))
+
+    deleted = connection.execute(delete(FundOverlap).where(~exists().where(
+        staging.c.fund_id == FundOverlap.fund_id,
+        staging.c.overlapping_fund_id == FundOverlap.overlapping_fund_id))).rowcount
+    staging.drop(connection)
+
+    return {"upserted": staged, "deleted": deleted}
+
+#  Holding weights per fund
+
+
+def load_holdings(db: Session):
+    return db.query(FundHolding.fund_id, HOLDING_KEY, FundHolding.weight).all()
+
+#  Recompute every pair
+
+
+def run_overlap_job(min_overlap: float = 0.0, block_size: int = 500):
+    db: Session = SessionLocal()
+
+    try:
+        started = time.perf_counter()
+        blocks = compute_overlaps(load_holdings(db), min_overlap, block_size)
+        result = store_overlaps(db, blocks)
+        db.commit()
+        print(f"✅ Fund overlaps: {result['upserted']} pairs upserted, {result['deleted']} deleted "
+              f"in {time.perf_counter() - started:.1f}s")
+
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Error computing fund overlaps: {e}")
+
+    finally:
+        db.close()
+
+
+#  Run the job
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Recompute fund_overlaps from fund holdings")
+    parser.add_argument("--min-overlap", type=float, default=0.0)
+    parser.add_argument("--block-size", type=int, default=500,
+                        help="funds per block (memory is block size x funds)")
+    args = parser.parse_args()
+    run_overlap_job(args.min_overlap, args.block_size)
@@ -0,0 +1,67 @@
+from datetime import date, timedelta
+
+#  Portfolio formulas shared by the API (crud, snapshots) and the nightly analytics job
+
+#  Current value of a single investment
+
+
+def investment_value(amount_invested: float, returns_since_investment: float) -> float:
+    return amount_invested * (1 + returns_since_investment / 100)
+
+#  Overview and sector split for one user's investments
+
+
+def compute_user_reports(user_id: int, investments, report_date: date, fund_names: dict, fund_allocations: dict):
+    """
+    Same figures as `crud.get_portfolio` and `crud.get_sector_allocation`, from
+    already-loaded (fund_id, date, amount_invested, returns_since_investment) rows.
+    """
+    yesterday = report_date - timedelta(days=1)
+    total_investment = total_current_value = yesterday_value = 0
+    best = worst = None
+    sector_investments = {}
+
+    for fund_id, inv_date, amount, returns in investments:
+        value = investment_value(amount, returns)
+        total_investment += amount
+        total_current_value += value
+        if inv_date <= yesterday:
+            yesterday_value += value
+        if best is None or returns > best[1]:
+            best = (fund_id, returns)
+        if worst is None or returns < worst[1]:
+            worst = (fund_id, returns)
+        for sector, percentage in fund_allocations.get(fund_id, ()):
+            sector_investments[sector] = sector_investments.get(
+                sector, 0) + amount * (percentage / 100)
+
+    growth_percentage = ((total_current_value - total_investment) /
+                         total_investment) * 100 if total_investment else 0
+    one_day_return = ((total_current_value - yesterday_value) /
+                      yesterday_value) * 100 if yesterday_value else 0
+
+    overview = {
+        "report_date": report_date,
+        "user_id": user_id,
+        "initial_investment": total_investment,
+        "current_value": total_current_value,
+        "growth_percentage": growth_percentage,
+        "one_day_return": round(one_day_return, 2),
+        "best_performing_scheme": fund_names.get(best[0]) if best else None,
+        "best_performing_scheme_return": round(best[1], 2) if best else None,
+        "worst_performing_scheme": fund_names.get(worst[0]) if worst else None,
+        "worst_performing_scheme_return": round(worst[1], 2) if worst else None,
+    }
+
+    sector_total = sum(sector_investments.values())
+    sectors = [
+        {
+            "report_date": report_date,
+            "user_id": user_id,
+            "sector": sector,
+            "invested_amount": round(amount, 2),
+            "percentage": round((amount / sector_total) * 100, 2) if sector_total else 0
+        }
+        for sector, amount in sector_investments.items()
+    ]
+    return overview, sectors
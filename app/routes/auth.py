@@ -1,23 +1,31 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from app import schemas, crud, database
-from app.utils.auth import create_access_token, verify_password
-from app.models import User
+from sqlalchemy.ext.asyncio import AsyncSession
+from app import schemas, async_crud, database
+from app.utils.auth import create_access_token, get_password_hash, run_hashing, verify_and_update_password
 
 router = APIRouter()
 
 
 @router.post("/signup", response_model=schemas.UserResponse)
-def signup(user: schemas.UserCreate, db: Session = Depends(database.get_db)):
-    return crud.create_user(db, user)
+async def signup(user: schemas.UserCreate, db: AsyncSession = Depends(database.get_async_db)):
+    hashed_password = await run_hashing(get_password_hash, user.password)
+    return await async_crud.create_user(db, user, hashed_password)
 
 
 @router.post("/login")
-def login(user: schemas.UserCreate, db: Session = Depends(database.get_db)):
-    db_user = db.query(User).filter(
-        User.username == user.username).first()
-    if not db_user or not verify_password(user.password, db_user.hashed_password):
+async def login(user: schemas.UserCreate, db: AsyncSession = Depends(database.get_async_db)):
+    db_user = await async_crud.get_user_by_username(db, user.username)
+    if not db_user:
         raise HTTPException(status_code=400, detail="Invalid credentials")
 
-    access_token = create_access_token({"sub": db_user.username})
+    valid, new_hash = await run_hashing(verify_and_update_password, user.password, db_user.hashed_password)
+    if not valid:
+        raise HTTPException(status_code=400, detail="Invalid credentials")
+
+    #  Stored hash uses an outdated cost factor
+    if new_hash:
+        await async_crud.update_password_hash(db, db_user.id, new_hash)
+
+    access_token = create_access_token(
+        {"sub": db_user.username, "uid": db_user.id})
     return {"access_token": access_token}
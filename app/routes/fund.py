@@ -1,23 +1,72 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from app import schemas, crud, database
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from app import schemas, async_crud, database
 from app.utils.auth import get_current_user
+from app.utils.catalogue import catalogue, etag_matches
+from app.utils.pagination import decode_cursor, encode_cursor, parse_fields
+from app.utils.responses import json_response
 
 router = APIRouter()
 
+MAX_PAGE_SIZE = 1000
+FUND_FIELDS = tuple(schemas.MutualFundResponse.model_fields)
+
 #  Get all mutual funds
 
 
 @router.get("/mutual-funds", response_model=list[schemas.MutualFundResponse])
-def get_mutual_funds(db: Session = Depends(database.get_db)):
-    return crud.get_all_mutual_funds(db)
+async def get_mutual_funds(
+    request: Request,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    db: AsyncSession = Depends(database.get_async_db)
+):
+    if limit is not None or cursor or fields:
+        return await _get_mutual_funds_page(db, limit, cursor, fields)
+
+    entry = catalogue.get() or await load_catalogue(db)
+
+    headers = {"ETag": entry.etag, "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), entry.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(entry.body, media_type="application/json", headers=headers)
+
+#  Load and serialize the full catalogue (also used to prime it at startup)
+
+
+async def load_catalogue(db):
+    version = catalogue.version
+    return catalogue.store(await async_crud.get_all_mutual_funds(db), version)
+
+#  Keyset page (and optional projection) of the catalogue
+
+
+async def _get_mutual_funds_page(db: AsyncSession, limit: Optional[int], cursor: Optional[str], fields: Optional[str]):
+    try:
+        after_id = int(decode_cursor(cursor)[0]) if cursor else None
+        columns = parse_fields(fields, FUND_FIELDS,
+                               required=("id",)) if fields else None
+    except (ValueError, IndexError, TypeError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    funds = await async_crud.get_all_mutual_funds(db, limit=limit, after_id=after_id, fields=columns)
+
+    headers = {}
+    if limit is not None and len(funds) == limit:
+        headers["X-Next-Cursor"] = encode_cursor(funds[-1].id)
+    if columns:
+        return json_response([fund._asdict() for fund in funds], headers=headers)
+    return json_response([schemas.MutualFundResponse.model_validate(fund, from_attributes=True).model_dump()
+                          for fund in funds], headers=headers)
 
 #  Get details of a specific mutual fund
 
 
 @router.get("/mutual-funds/{fund_id}", response_model=schemas.MutualFundResponse)
-def get_fund_details(fund_id: int, db: Session = Depends(database.get_db)):
-    fund = crud.get_mutual_fund(db, fund_id)
+async def get_fund_details(fund_id: int, db: AsyncSession = Depends(database.get_async_db)):
+    fund = await async_crud.get_mutual_fund(db, fund_id)
     if not fund:
         raise HTTPException(status_code=404, detail="Fund not found")
     return fund
@@ -26,19 +75,19 @@ def get_fund_details(fund_id: int, db: Session = Depends(database.get_db)):
 
 
 @router.post("/mutual-funds", response_model=schemas.MutualFundResponse)
-def create_mutual_fund(fund: schemas.MutualFundBase, db: Session = Depends(database.get_db)):
-    return crud.create_mutual_fund(db, fund)
+async def create_mutual_fund(fund: schemas.MutualFundBase, db: AsyncSession = Depends(database.get_async_db)):
+    return await async_crud.create_mutual_fund(db, fund)
 
 #  Update mutual fund details (Admin)
 
 
 @router.put("/mutual-funds/{fund_id}", response_model=schemas.MutualFundResponse)
-def update_mutual_fund(fund_id: int, fund: schemas.MutualFundBase, db: Session = Depends(database.get_db)):
-    return crud.update_mutual_fund(db, fund_id, fund)
+async def update_mutual_fund(fund_id: int, fund: schemas.MutualFundBase, db: AsyncSession = Depends(database.get_async_db)):
+    return await async_crud.update_mutual_fund(db, fund_id, fund)
 
 #  Delete mutual fund (Admin)
 
 
 @router.delete("/mutual-funds/{fund_id}")
-def delete_mutual_fund(fund_id: int, db: Session = Depends(database.get_db)):
-    return crud.delete_mutual_fund(db, fund_id)
+async def delete_mutual_fund(fund_id: int, db: AsyncSession = Depends(database.get_async_db)):
+    return await async_crud.delete_mutual_fund(db, fund_id)
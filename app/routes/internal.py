@@ -0,0 +1,54 @@
+import hmac
+import os
+from fastapi import APIRouter, Depends, HTTPException, Security
+from fastapi.responses import PlainTextResponse
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from app import database
+from app.utils.logging import metrics
+from app.utils.pool import pool_status
+
+#  Operational endpoints are off unless INTERNAL_TOKEN is set; callers then send
+#  it as a bearer token
+INTERNAL_TOKEN = os.getenv("INTERNAL_TOKEN")
+internal_bearer = HTTPBearer(auto_error=False)
+
+
+def require_internal_token(credentials: HTTPAuthorizationCredentials = Security(internal_bearer)):
+    if not INTERNAL_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if credentials is None or not hmac.compare_digest(credentials.credentials.encode(), INTERNAL_TOKEN.encode()):
+        raise HTTPException(status_code=401, detail="Invalid internal token",
+                            headers={"WWW-Authenticate": "Bearer"})
+
+
+router = APIRouter(dependencies=[Depends(require_internal_token)])
+metrics_router = APIRouter(dependencies=[Depends(require_internal_token)])
+
+#  Connection pool metrics (checkouts, wait time, overflow)
+
+
+@router.get("/pool")
+def get_pool_metrics():
+    metrics = {"sync": pool_status(database.engine, database.pool_stats)}
+    if database.async_engine is not None:
+        metrics["async"] = pool_status(
+            database.async_engine.sync_engine, database.async_pool_stats)
+    return metrics
+
+#  Prometheus metrics: request latency, DB time, statements, rows and pool state
+
+
+@metrics_router.get("/metrics", response_class=PlainTextResponse)
+def get_metrics():
+    lines = [metrics.render()]
+    pools = get_pool_metrics()
+    lines.append("# TYPE db_pool_checked_out gauge\n# TYPE db_pool_overflow gauge\n"
+                 "# TYPE db_pool_checkouts_total counter\n# TYPE db_pool_wait_seconds_total counter\n"
+                 "# TYPE db_pool_timeouts_total counter\n")
+    for name, status in pools.items():
+        for metric, key in (("db_pool_checked_out", "checked_out"), ("db_pool_overflow", "overflow"),
+                            ("db_pool_checkouts_total", "checkouts"), ("db_pool_wait_seconds_total", "wait_time_total"),
+                            ("db_pool_timeouts_total", "timeouts")):
+            if key in status:
+                lines.append(f'{metric}{{engine="{name}"}} {status[key]}\n')
+    return "".join(lines)
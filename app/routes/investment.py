@@ -1,20 +1,168 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from app import schemas, crud, database
+import csv
+import io
+import json
+from datetime import date
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from app import schemas, async_crud, crud, database
 from app.utils.auth import get_current_user
+from app.utils.pagination import decode_cursor, encode_cursor, parse_fields
+from app.utils.responses import FAST_JSON, json_response
 
 router = APIRouter()
 
+MAX_PAGE_SIZE = 1000
+INVESTMENT_FIELDS = tuple(schemas.InvestmentResponse.model_fields)
+EXPORT_BATCH_SIZE = 1000
+
 #  Create new investment
 
 
 @router.post("/investments", response_model=schemas.InvestmentResponse)
-def create_investment(investment: schemas.InvestmentBase, db: Session = Depends(database.get_db), user: dict = Depends(get_current_user)):
-    return crud.create_investment(db, user["username"], investment)
+async def create_investment(investment: schemas.InvestmentBase, db: AsyncSession = Depends(database.get_async_db), user: dict = Depends(get_current_user)):
+    try:
+        return await async_crud.create_investment(db, user["user_id"], investment)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except IntegrityError:
+        #  The fund exists, so the user was deleted after the token's existence check
+        raise HTTPException(status_code=401, detail="Invalid credentials")
+
+#  Bulk import investments from a JSON list or a CSV body
+
+
+def _parse_import_rows(records):
+    rows, errors = [], []
+    for row_number, record in enumerate(records, start=1):
+        try:
+            rows.append(
+                (row_number, schemas.InvestmentBase.model_validate(record)))
+        except ValidationError as e:
+            errors.append({"row": row_number, "error": "; ".join(
+                f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors())})
+    return rows, errors
+
+
+@router.post("/investments/import", response_model=schemas.InvestmentImportResponse)
+async def import_investments(
+    request: Request,
+    batch_size: int = Query(1000, ge=1, le=10000),
+    db: AsyncSession = Depends(database.get_async_db),
+    user: dict = Depends(get_current_user)
+):
+    body = await request.body()
+    try:
+        if request.headers.get("content-type", "").startswith("text/csv"):
+            records = list(csv.DictReader(io.StringIO(body.decode("utf-8-sig"))))
+        else:
+            records = json.loads(body)
+    except (UnicodeDecodeError, ValueError, csv.Error):
+        raise HTTPException(status_code=400, detail="Malformed import body")
+    if not isinstance(records, list):
+        raise HTTPException(
+            status_code=400, detail="Expected a list of investments")
+
+    rows, parse_errors = _parse_import_rows(records)
+    result = await async_crud.bulk_create_investments(db, user["user_id"], rows, batch_size=batch_size)
+
+    result["errors"] = sorted(parse_errors + result["errors"],
+                              key=lambda error: error["row"])
+    result["failed"] = len(result["errors"])
+    return result
 
 #  Get all investments of a user
 
 
 @router.get("/investments", response_model=list[schemas.InvestmentResponse])
-def get_investments(db: Session = Depends(database.get_db), user: dict = Depends(get_current_user)):
-    return crud.get_user_investments(db, user["username"])
+async def get_investments(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    db: AsyncSession = Depends(database.get_async_db),
+    user: dict = Depends(get_current_user)
+):
+    try:
+        after = None
+        if cursor:
+            after_date, after_id = decode_cursor(cursor)
+            after = (date.fromisoformat(after_date), int(after_id))
+        columns = parse_fields(fields, INVESTMENT_FIELDS,
+                               required=("id", "date")) if fields else None
+    except (ValueError, TypeError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    #  Fast mode reads plain rows instead of ORM objects; they need no validation
+    investments = await async_crud.get_user_investments(
+        db, user["user_id"], limit=limit, after=after,
+        fields=columns or (list(INVESTMENT_FIELDS) if FAST_JSON else None))
+
+    #  A full page means there may be more rows after the last one
+    headers = {}
+    if limit is not None and len(investments) == limit:
+        last = investments[-1]
+        headers["X-Next-Cursor"] = encode_cursor(last.date, last.id)
+
+    if columns or FAST_JSON:
+        return json_response([inv._asdict() for inv in investments], headers=headers)
+    response.headers.update(headers)
+    return investments
+
+#  Export full investment history (streamed)
+
+
+def _export_rows(user_id: int):
+    #  The session must outlive the route, so the stream owns it
+    db = database.SessionLocal()
+    try:
+        yield from crud.iter_user_investments(db, user_id, INVESTMENT_FIELDS, batch_size=EXPORT_BATCH_SIZE)
+    finally:
+        db.close()
+
+
+def _ndjson_lines(rows):
+    lines = []
+    for row in rows:
+        lines.append(json.dumps(jsonable_encoder(row._asdict())) + "\n")
+        if len(lines) == EXPORT_BATCH_SIZE:
+            yield "".join(lines)
+            lines = []
+    yield "".join(lines)
+
+
+def _csv_lines(rows):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(INVESTMENT_FIELDS)
+    #  Send the header right away, before the first batch arrives
+    yield _drain(buffer)
+
+    for i, row in enumerate(rows, start=1):
+        writer.writerow(row)
+        if i % EXPORT_BATCH_SIZE == 0:
+            yield _drain(buffer)
+    yield _drain(buffer)
+
+
+def _drain(buffer: io.StringIO) -> str:
+    chunk = buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate()
+    return chunk
+
+
+@router.get("/investments/export")
+def export_investments(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    user: dict = Depends(get_current_user)
+):
+    rows = _export_rows(user["user_id"])
+    if format == "csv":
+        return StreamingResponse(_csv_lines(rows), media_type="text/csv",
+                                 headers={"Content-Disposition": 'attachment; filename="investments.csv"'})
+    return StreamingResponse(_ndjson_lines(rows), media_type="application/x-ndjson")
@@ -1,7 +1,10 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from app import schemas, crud, database
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from app import crud, schemas, async_crud, database
 from app.utils.auth import get_current_user
+from app.utils.pagination import parse_fields
+from app.utils.responses import trusted
 
 router = APIRouter()
 
@@ -9,36 +12,78 @@ router = APIRouter()
 
 
 @router.get("/portfolio", response_model=schemas.PortfolioOverview)
-def get_portfolio(db: Session = Depends(database.get_db), user: dict = Depends(get_current_user)):
-    return crud.get_portfolio(db, user["username"])
+async def get_portfolio(db: AsyncSession = Depends(database.get_async_db), user: dict = Depends(get_current_user)):
+    return trusted(await async_crud.get_portfolio(db, user["user_id"]))
 
 #  Get sector allocation
 
 
 @router.get("/portfolio/sector-allocation", response_model=schemas.SectorAllocationResponse)
-def get_sector_allocation(
-    db: Session = Depends(database.get_db),
+async def get_sector_allocation(
+    db: AsyncSession = Depends(database.get_async_db),
     user: dict = Depends(get_current_user)
 ):
-    return crud.get_sector_allocation(db, user["username"])
+    return trusted(await async_crud.get_sector_allocation(db, user["user_id"]))
 
 #  Get stock allocation
 
 
 @router.get("/portfolio/stock-allocation", response_model=schemas.StockAllocationResponse)
-def get_stock_allocation(
+async def get_stock_allocation(
     period: str = "1M",  # Accepts "1M", "3M", "6M", "1Y", "3Y", "MAX"
-    db: Session = Depends(database.get_db),
+    points: int = Query(crud.MAX_SERIES_POINTS, ge=3, le=5000),  # Graph points after downsampling
+    db: AsyncSession = Depends(database.get_async_db),
     user: dict = Depends(get_current_user)
 ):
-    return crud.get_stock_allocation(db, user["username"], period)
+    return trusted(await async_crud.get_stock_allocation(db, user["user_id"], period, points))
 
 #  Get overlap analysis
 
 
 @router.get("/portfolio/overlap", response_model=schemas.FundOverlapResponse)
-def get_fund_overlap(
-    db: Session = Depends(database.get_db),
+async def get_fund_overlap(
+    db: AsyncSession = Depends(database.get_async_db),
     user: dict = Depends(get_current_user)
 ):
-    return crud.get_fund_overlap(db, user["username"])
+    return trusted(await async_crud.get_fund_overlap(db, user["user_id"]))
+
+#  Get exposure to a single stock across the user's funds
+
+
+@router.get("/portfolio/stock-exposure", response_model=schemas.StockExposureResponse)
+async def get_stock_exposure(
+    security: str,  # ISIN or symbol
+    db: AsyncSession = Depends(database.get_async_db),
+    user: dict = Depends(get_current_user)
+):
+    return trusted(await async_crud.get_stock_exposure(db, user["user_id"], security))
+
+#  Get stock-level look-through allocation
+
+
+@router.get("/portfolio/holdings-allocation", response_model=schemas.HoldingsAllocationResponse)
+async def get_holdings_allocation(
+    limit: int = Query(50, ge=1, le=1000),
+    db: AsyncSession = Depends(database.get_async_db),
+    user: dict = Depends(get_current_user)
+):
+    return trusted(await async_crud.get_holdings_allocation(db, user["user_id"], limit))
+
+#  Get every dashboard view in one request
+
+
+@router.get("/portfolio/dashboard", response_model=schemas.DashboardResponse, response_model_exclude_unset=True)
+async def get_dashboard(
+    sections: Optional[str] = None,  # e.g. "portfolio,overlap"; all sections by default
+    period: str = "1M",
+    points: int = Query(crud.MAX_SERIES_POINTS, ge=3, le=5000),
+    db: AsyncSession = Depends(database.get_async_db),
+    user: dict = Depends(get_current_user)
+):
+    try:
+        requested = parse_fields(
+            sections, crud.DASHBOARD_SECTIONS) if sections else crud.DASHBOARD_SECTIONS
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return trusted(await async_crud.get_dashboard(db, user["user_id"], list(dict.fromkeys(requested)), period, points))
@@ -57,6 +57,21 @@ class InvestmentResponse(InvestmentBase):
     id: int
     user_id: int
 
+#  Bulk import result
+
+
+class ImportRowError(BaseModel):
+    row: int
+    error: str
+
+
+class InvestmentImportResponse(BaseModel):
+    inserted: int
+    failed: int
+    errors: List[ImportRowError]
+    elapsed_seconds: float
+    rows_per_second: float
+
 # Fund Allocation schema
 
 
@@ -117,3 +132,45 @@ class FundOverlapItem(BaseModel):
 
 class FundOverlapResponse(BaseModel):
     overlaps: List[FundOverlapItem]
+
+#  Schema for one fund's holding of a security
+
+
+class StockExposureFund(BaseModel):
+    fund_name: str
+    weight: float
+    exposure: float
+
+#  Response schema for `/api/portfolio/stock-exposure`
+
+
+class StockExposureResponse(BaseModel):
+    security: str
+    funds: List[StockExposureFund]
+    total_exposure: float
+
+#  Schema for each underlying stock in the look-through allocation
+
+
+class HoldingAllocationItem(BaseModel):
+    security_isin: Optional[str]
+    symbol: Optional[str]
+    sector: Optional[str]
+    exposure: float
+    percentage: float
+
+#  Response schema for `/api/portfolio/holdings-allocation`
+
+
+class HoldingsAllocationResponse(BaseModel):
+    holdings: List[HoldingAllocationItem]
+    total_investment: float
+
+#  Response schema for `/api/portfolio/dashboard` (sections not requested are omitted)
+
+
+class DashboardResponse(BaseModel):
+    portfolio: Optional[PortfolioOverview] = None
+    sector_allocation: Optional[SectorAllocationResponse] = None
+    stock_allocation: Optional[StockAllocationResponse] = None
+    overlap: Optional[FundOverlapResponse] = None
@@ -1,6 +1,9 @@
+import random
+from datetime import date, timedelta
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 from app.database import SessionLocal
-from app.models import User, MutualFund, Investment, FundAllocation, FundOverlap
+from app.models import User, MutualFund, Investment, FundAllocation, FundHolding, FundOverlap, NavHistory
 from app.utils.auth import get_password_hash
 
 #  Function to seed initial data
@@ -68,6 +71,27 @@ def seed_database():
         db.add_all(allocations)
         db.commit()
 
+        #  Seed Fund Holdings (Stocks)
+        holdings = [
+            FundHolding(fund_id=fund_mapping["ICICI Prudential Bluechip Fund"],
+                        security_isin="INE009A01021", symbol="INFY", sector="IT", weight=20),
+            FundHolding(fund_id=fund_mapping["ICICI Prudential Bluechip Fund"],
+                        security_isin="INE467B01029", symbol="TCS", sector="IT", weight=18),
+            FundHolding(fund_id=fund_mapping["ICICI Prudential Bluechip Fund"],
+                        security_isin="INE040A01034", symbol="HDFCBANK", sector="Financials", weight=37),
+            FundHolding(fund_id=fund_mapping["ICICI Prudential Bluechip Fund"],
+                        security_isin="INE002A01018", symbol="RELIANCE", sector="Energy", weight=25),
+
+            FundHolding(fund_id=fund_mapping["HDFC Top 100 Fund"],
+                        security_isin="INE040A01034", symbol="HDFCBANK", sector="Financials", weight=45),
+            FundHolding(fund_id=fund_mapping["HDFC Top 100 Fund"],
+                        security_isin="INE090A01021", symbol="ICICIBANK", sector="Financials", weight=35),
+            FundHolding(fund_id=fund_mapping["HDFC Top 100 Fund"],
+                        security_isin="INE002A01018", symbol="RELIANCE", sector="Energy", weight=20),
+        ]
+        db.add_all(holdings)
+        db.commit()
+
         #  Seed Fund Overlap Data
         overlaps = [
             FundOverlap(fund_id=fund_mapping["ICICI Prudential Bluechip Fund"],
@@ -91,6 +115,76 @@ def seed_database():
     finally:
         db.close()
 
+#  Seed a synthetic dataset of configurable size on top of the fixtures above
+
+
+def seed_synthetic(db: Session, users: int = 100, funds: int = 50, investments_per_user: int = 20,
+                   holdings_per_fund: int = 30, overlaps_per_fund: int = 5, nav_days: int = 365, seed: int = 0):
+    """
+    Bulk-insert generated users, funds, allocations, holdings, NAVs, investments and
+    overlaps. Returns the generated usernames; every user's password is "password123".
+    """
+    rng = random.Random(seed)
+    today = date.today()
+    sectors = ["IT", "Financials", "Energy", "Healthcare",
+               "Consumer", "Industrials", "Materials", "Utilities"]
+    securities = [(f"INE{i:06d}01", f"STOCK{i}", sectors[i % len(sectors)])
+                  for i in range(holdings_per_fund * 4)]
+    hashed_password = get_password_hash("password123")
+
+    #  Ids come from the database (explicit ids would leave PostgreSQL sequences behind);
+    #  names are numbered past the highest existing id so repeated runs don't collide
+    first_fund = (db.query(MutualFund.id).order_by(MutualFund.id.desc()).limit(1).scalar() or 0) + 1
+    fund_ids = db.scalars(insert(MutualFund).returning(MutualFund.id, sort_by_parameter_order=True), [
+        {"name": f"Synthetic Fund {number}", "isin": f"INFSYN{number:06d}"}
+        for number in range(first_fund, first_fund + funds)]).all()
+
+    allocations, holdings, navs = [], [], []
+    for fund_id in fund_ids:
+        weights = [rng.random() for _ in sectors[:4]]
+        for sector, weight in zip(rng.sample(sectors, 4), weights):
+            allocations.append({"fund_id": fund_id, "sector": sector,
+                                "percentage": round(weight / sum(weights) * 100, 2)})
+        weights = [rng.random() for _ in range(holdings_per_fund)]
+        for (isin, symbol, sector), weight in zip(rng.sample(securities, holdings_per_fund), weights):
+            holdings.append({"fund_id": fund_id, "security_isin": isin, "symbol": symbol, "sector": sector,
+                             "weight": round(weight / sum(weights) * 100, 4)})
+        nav = 100.0
+        for day in range(nav_days, 0, -1):
+            nav *= 1 + rng.gauss(0.0004, 0.01)
+            navs.append({"fund_id": fund_id, "date": today - timedelta(days=day), "nav": round(nav, 4)})
+    db.bulk_insert_mappings(FundAllocation, allocations)
+    db.bulk_insert_mappings(FundHolding, holdings)
+    db.bulk_insert_mappings(NavHistory, navs)
+
+    overlaps = []
+    for fund_id in fund_ids:
+        for other in rng.sample(fund_ids, min(overlaps_per_fund, funds)):
+            if other != fund_id:
+                overlaps.append({"fund_id": fund_id, "overlapping_fund_id": other,
+                                 "overlap_percentage": round(rng.uniform(5, 95), 2)})
+    db.bulk_insert_mappings(FundOverlap, overlaps)
+
+    first_user = (db.query(User.id).order_by(User.id.desc()).limit(1).scalar() or 0) + 1
+    usernames = [f"synthetic_user_{number}" for number in range(first_user, first_user + users)]
+    user_ids = db.scalars(insert(User).returning(User.id, sort_by_parameter_order=True), [
+        {"username": username, "hashed_password": hashed_password} for username in usernames]).all()
+
+    investments = []
+    for user_id in user_ids:
+        for _ in range(investments_per_user):
+            investments.append({
+                "user_id": user_id,
+                "fund_id": rng.choice(fund_ids),
+                "date": today - timedelta(days=rng.randint(1, nav_days)),
+                "amount_invested": round(rng.uniform(1000, 100000), 2),
+                "nav_at_investment": round(rng.uniform(50, 150), 4),
+                "returns_since_investment": round(rng.uniform(-10, 30), 2),
+            })
+    db.bulk_insert_mappings(Investment, investments)
+    db.commit()
+    return usernames
+
 
 #  Run the seeder
 if __name__ == "__main__":
@@ -0,0 +1,125 @@
+import argparse
+import importlib.util
+import os
+import uvicorn
+from app.database import USE_ASYNC_DB
+from app.utils.cache import CACHE_BACKEND
+
+#  Production launcher: one uvicorn process per core, sharing a DB connection budget
+
+#  Total connections all workers together may hold (0 keeps DB_POOL_SIZE / DB_MAX_OVERFLOW)
+DB_CONNECTION_BUDGET = int(os.getenv("DB_CONNECTION_BUDGET", "0"))
+GRACEFUL_TIMEOUT = int(os.getenv("GRACEFUL_TIMEOUT", "30"))
+
+
+def available_cpus() -> int:
+    """
+    Cores this process may run on, capped by a cgroup v2 CPU quota (containers).
+    """
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()
+        if quota != "max":
+            cpus = min(cpus, max(1, int(quota) // int(period)))
+    except (OSError, ValueError):
+        pass
+    return cpus
+
+#  Per-worker pool sizing from the global budget
+
+
+def _split(connections: int, size_key: str, overflow_key: str) -> dict:
+    #  Two thirds held in the pool, the rest as overflow for bursts
+    pool_size = max(1, connections - connections // 3)
+    return {size_key: str(pool_size), overflow_key: str(connections - pool_size)}
+
+
+def pool_settings(budget: int, workers: int, async_db: bool = USE_ASYNC_DB) -> dict:
+    """
+    Split `budget` connections evenly across workers. With `async_db` each worker
+    holds two pools: a quarter of its share (at least one) goes to the sync pool,
+    which only streams exports, and the rest to the async pool serving requests.
+    """
+    per_worker = max(1, budget // workers)
+    if not async_db:
+        return _split(per_worker, "DB_POOL_SIZE", "DB_MAX_OVERFLOW")
+    sync_share = max(1, per_worker // 4)
+    settings = _split(per_worker - sync_share, "DB_POOL_SIZE", "DB_MAX_OVERFLOW")
+    settings.update(_split(sync_share, "DB_SYNC_POOL_SIZE", "DB_SYNC_MAX_OVERFLOW"))
+    return settings
+
+
+def check_cache_backend(workers: int, backend: str = CACHE_BACKEND):
+    """
+    The memory cache is per process: with several workers, a write only invalidates
+    the worker that handled it and the others keep serving stale views.
+    """
+    if workers > 1 and backend == "memory":
+        raise ValueError(f"CACHE_BACKEND=memory is per process and cannot serve {workers} workers; "
+                         f"set CACHE_BACKEND=redis (or none), or run with --workers 1")
+
+
+def worker_environment(workers: int, cpus: int, budget: int = DB_CONNECTION_BUDGET,
+                       async_db: bool = USE_ASYNC_DB) -> dict:
+    """
+    Settings every worker reads at import. Explicitly set variables win.
+    """
+    settings = {}
+    if budget > 0:
+        #  One connection per pool and worker at least
+        pools = 2 if async_db else 1
+        if budget < workers * pools:
+            raise ValueError(
+                f"DB_CONNECTION_BUDGET={budget} is below one connection per pool and worker "
+                f"({workers} workers, {pools} pools each)")
+        settings.update(pool_settings(budget, workers, async_db))
+    #  Each worker has its own bcrypt pool; together they should not oversubscribe the cores
+    settings["HASH_WORKERS"] = str(max(1, cpus // workers))
+    return {key: value for key, value in settings.items() if key not in os.environ}
+
+
+def _available(module: str) -> bool:
+    return importlib.util.find_spec(module) is not None
+
+
+#  Serve the API
+if __name__ == "__main__":
+    cpus = available_cpus()
+    parser = argparse.ArgumentParser(
+        description="Run the API with one worker process per core")
+    parser.add_argument("--host", default=os.getenv("HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int,
+                        default=int(os.getenv("PORT", "8000")))
+    parser.add_argument("--workers", type=int,
+                        default=int(os.getenv("WEB_CONCURRENCY", str(cpus))))
+    parser.add_argument("--graceful-timeout", type=int, default=GRACEFUL_TIMEOUT,
+                        help="seconds to drain in-flight requests on SIGTERM")
+    parser.add_argument("--loop", choices=["auto", "uvloop", "asyncio"], default="auto")
+    parser.add_argument("--http", choices=["auto", "httptools", "h11"], default="auto")
+    args = parser.parse_args()
+
+    try:
+        check_cache_backend(args.workers)
+        os.environ.update(worker_environment(args.workers, cpus))
+    except ValueError as e:
+        print(f"❌ {e}")
+        raise SystemExit(1)
+
+    #  "auto" picks uvloop / httptools when installed
+    loop = args.loop if args.loop != "auto" else (
+        "uvloop" if _available("uvloop") else "asyncio")
+    http = args.http if args.http != "auto" else (
+        "httptools" if _available("httptools") else "h11")
+
+    pools = f"pool={os.getenv('DB_POOL_SIZE', '5')}+{os.getenv('DB_MAX_OVERFLOW', '10')}"
+    if USE_ASYNC_DB:
+        pools += f", sync pool={os.getenv('DB_SYNC_POOL_SIZE', '1')}+{os.getenv('DB_SYNC_MAX_OVERFLOW', '2')}"
+    print(f"✅ Starting {args.workers} workers on {args.host}:{args.port} ({cpus} cpus, loop={loop}, "
+          f"http={http}, {pools} per worker)")
+    uvicorn.run("app.main:app", host=args.host, port=args.port, workers=args.workers,
+                loop=loop, http=http, timeout_graceful_shutdown=args.graceful_timeout,
+                proxy_headers=True)
@@ -0,0 +1,143 @@
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.database import SessionLocal
+from app.models import Investment, MutualFund, PortfolioSnapshot
+from app.reports import investment_value
+
+#  Apply a newly created investment to the user's snapshot
+
+
+def apply_investment(db: Session, investment: Investment, fund_name: str):
+    """
+    Incrementally fold one investment into the owner's snapshot.
+    The caller is responsible for committing.
+    """
+    snapshot = _locked_snapshot(db, investment.user_id)
+    if not snapshot:
+        #  No row yet: build it from all of the user's investments, this one included
+        db.flush()
+        if create_snapshot(db, investment.user_id):
+            return db.get(PortfolioSnapshot, investment.user_id)
+        #  A concurrent first insert won; fold this investment into its row
+        snapshot = _locked_snapshot(db, investment.user_id)
+
+    value = investment_value(investment.amount_invested,
+                             investment.returns_since_investment)
+    snapshot.total_invested += investment.amount_invested
+    snapshot.current_value += value
+
+    if snapshot.best_scheme_return is None or investment.returns_since_investment > snapshot.best_scheme_return:
+        snapshot.best_scheme = fund_name
+        snapshot.best_scheme_return = investment.returns_since_investment
+    if snapshot.worst_scheme_return is None or investment.returns_since_investment < snapshot.worst_scheme_return:
+        snapshot.worst_scheme = fund_name
+        snapshot.worst_scheme_return = investment.returns_since_investment
+
+    if snapshot.last_investment_date is None or investment.date > snapshot.last_investment_date:
+        snapshot.last_investment_date = investment.date
+        snapshot.last_investment_date_value = value
+    elif investment.date == snapshot.last_investment_date:
+        snapshot.last_investment_date_value += value
+
+    return snapshot
+
+
+def _locked_snapshot(db: Session, user_id: int):
+    return db.query(PortfolioSnapshot).filter(
+        PortfolioSnapshot.user_id == user_id).with_for_update().first()
+
+#  Build a missing snapshot
+
+
+def create_snapshot(db: Session, user_id: int) -> bool:
+    """
+    Build the snapshot for a user who has none yet, in a savepoint. Returns False
+    when a concurrent transaction inserted the row first (primary key conflict).
+    """
+    try:
+        with db.begin_nested():
+            refresh_snapshots(db, [user_id])
+    except IntegrityError:
+        return False
+    return True
+
+#  Recompute snapshots from the investments table
+
+
+def refresh_snapshots(db: Session, user_ids=None, batch_size: int = 1000):
+    """
+    Recompute snapshots in one streaming pass over investments ordered by user.
+    Pass `user_ids` to limit the refresh (e.g. after NAV or returns updates);
+    leave it empty to rebuild every snapshot. The caller commits.
+    """
+    query = db.query(
+        Investment.user_id, Investment.date, Investment.amount_invested,
+        Investment.returns_since_investment, MutualFund.name
+    ).join(MutualFund, MutualFund.id == Investment.fund_id)
+    if user_ids is not None:
+        query = query.filter(Investment.user_id.in_(user_ids))
+
+    snapshots = {}
+    for user_id, date, amount, returns, fund_name in query.order_by(Investment.user_id).yield_per(batch_size):
+        snapshot = snapshots.get(user_id)
+        if snapshot is None:
+            snapshot = snapshots[user_id] = {
+                "user_id": user_id,
+                "total_invested": 0,
+                "current_value": 0,
+                "best_scheme": None,
+                "best_scheme_return": None,
+                "worst_scheme": None,
+                "worst_scheme_return": None,
+                "last_investment_date": None,
+                "last_investment_date_value": 0,
+            }
+
+        value = investment_value(amount, returns)
+        snapshot["total_invested"] += amount
+        snapshot["current_value"] += value
+
+        if snapshot["best_scheme_return"] is None or returns > snapshot["best_scheme_return"]:
+            snapshot["best_scheme"], snapshot["best_scheme_return"] = fund_name, returns
+        if snapshot["worst_scheme_return"] is None or returns < snapshot["worst_scheme_return"]:
+            snapshot["worst_scheme"], snapshot["worst_scheme_return"] = fund_name, returns
+
+        if snapshot["last_investment_date"] is None or date > snapshot["last_investment_date"]:
+            snapshot["last_investment_date"] = date
+            snapshot["last_investment_date_value"] = value
+        elif date == snapshot["last_investment_date"]:
+            snapshot["last_investment_date_value"] += value
+
+    #  Replace the affected rows in bulk
+    delete_query = db.query(PortfolioSnapshot)
+    if user_ids is not None:
+        delete_query = delete_query.filter(
+            PortfolioSnapshot.user_id.in_(user_ids))
+    delete_query.delete(synchronize_session=False)
+    if snapshots:
+        db.bulk_insert_mappings(PortfolioSnapshot, list(snapshots.values()))
+
+    return len(snapshots)
+
+#  Rebuild all snapshots
+
+
+def rebuild_snapshots():
+    db: Session = SessionLocal()
+
+    try:
+        count = refresh_snapshots(db)
+        db.commit()
+        print(f"✅ Rebuilt {count} portfolio snapshots")
+
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Error rebuilding snapshots: {e}")
+
+    finally:
+        db.close()
+
+
+#  Run the rebuild
+if __name__ == "__main__":
+    rebuild_snapshots()
@@ -1,28 +1,95 @@
-from datetime import datetime, timedelta
-from jose import JWTError, jwt
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from jose import ExpiredSignatureError, JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, Security
 from fastapi.security import OAuth2PasswordBearer
 import os
+from app.database import get_async_db, run_db
+from app.models import User
+from app.utils.cache import MemoryCache
 
 # Load environment variables
 SECRET_KEY = os.getenv("SECRET_KEY", "supersecret")
 ALGORITHM = "HS256"
-ACCESS_TOKEN_EXPIRE_MINUTES = 30
+ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
+
+#  Signing keys for rotation: "kid:secret,kid:secret". The first key signs new
+#  tokens; every listed key is accepted. Defaults to SECRET_KEY.
+SIGNING_KEYS = dict(
+    entry.split(":", 1) for entry in os.getenv("JWT_SIGNING_KEYS", "").split(",") if ":" in entry
+) or {"default": SECRET_KEY}
+CURRENT_KID = next(iter(SIGNING_KEYS))
+
+#  Tokens issued before expiry was added carry no `exp`. They are accepted until
+#  this ISO date/time (UTC), e.g. LEGACY_TOKEN_GRACE_UNTIL=2026-11-01; unset rejects them
+LEGACY_TOKEN_GRACE_UNTIL = os.getenv("LEGACY_TOKEN_GRACE_UNTIL")
+_legacy_grace_until = datetime.fromisoformat(LEGACY_TOKEN_GRACE_UNTIL) if LEGACY_TOKEN_GRACE_UNTIL else None
+if _legacy_grace_until is not None and _legacy_grace_until.tzinfo is None:
+    _legacy_grace_until = _legacy_grace_until.replace(tzinfo=timezone.utc)
+
+#  username -> id for tokens issued before they carried the user id, and
+#  which token user ids still exist (deleted users' tokens stop working after the TTL)
+USER_ID_CACHE_TTL = int(os.getenv("USER_ID_CACHE_TTL", "300"))
+_user_id_cache = MemoryCache(max_entries=10000, ttl=USER_ID_CACHE_TTL)
+_user_exists_cache = MemoryCache(max_entries=10000, ttl=USER_ID_CACHE_TTL)
 
 # Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+#  Hashes with a different cost are flagged for rehash on the next login
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS,
+                           bcrypt__min_rounds=BCRYPT_ROUNDS, bcrypt__max_rounds=BCRYPT_ROUNDS)
+
+#  Bounded pool for bcrypt work, so login spikes cannot starve other requests
+HASH_WORKERS = int(os.getenv("HASH_WORKERS", str(os.cpu_count() or 1)))
+HASH_MAX_PENDING = int(
+    os.getenv("HASH_MAX_PENDING", str(HASH_WORKERS * 4)))
+_hash_executor = ThreadPoolExecutor(
+    max_workers=HASH_WORKERS, thread_name_prefix="bcrypt")
+_hash_slots = threading.BoundedSemaphore(HASH_MAX_PENDING)
 
 #  OAuth2 scheme (for authentication)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
 
-def create_access_token(data: dict):
+def create_access_token(data: dict, expires_delta: timedelta = None):
     """
-    Creates a JWT token without expiration.
+    Creates a signed JWT that expires after ACCESS_TOKEN_EXPIRE_MINUTES.
     """
     to_encode = data.copy()
-    return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    to_encode["exp"] = datetime.now(timezone.utc) + \
+        (expires_delta or timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES))
+    return jwt.encode(to_encode, SIGNING_KEYS[CURRENT_KID], algorithm=ALGORITHM, headers={"kid": CURRENT_KID})
+
+
+def decode_access_token(token: str) -> dict:
+    """
+    Verify a token against the key named by its `kid`, or every key for tokens
+    without one. Raises JWTError when no key accepts it or it has expired.
+    """
+    kid = jwt.get_unverified_header(token).get("kid")
+    if kid is not None:
+        if kid not in SIGNING_KEYS:
+            raise JWTError("Unknown signing key")
+        return jwt.decode(token, SIGNING_KEYS[kid], algorithms=[ALGORITHM], options={"require_exp": True})
+
+    for secret in SIGNING_KEYS.values():
+        try:
+            payload = jwt.decode(token, secret, algorithms=[ALGORITHM])
+        except ExpiredSignatureError:
+            raise
+        except JWTError:
+            continue
+        if "exp" not in payload and not _legacy_grace_open():
+            raise JWTError("Token has no expiry")
+        return payload
+    raise JWTError("Signature verification failed")
+
+
+def _legacy_grace_open() -> bool:
+    return _legacy_grace_until is not None and datetime.now(timezone.utc) < _legacy_grace_until
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -39,13 +106,35 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+def verify_and_update_password(plain_password: str, hashed_password: str):
+    """
+    Verify a password, returning (valid, new_hash); new_hash is set when the
+    stored hash should be replaced (e.g. BCRYPT_ROUNDS changed).
+    """
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
+async def run_hashing(fn, *args):
+    """
+    Run a bcrypt call on the hashing pool. Raises 429 when HASH_MAX_PENDING
+    calls are already queued or running.
+    """
+    if not _hash_slots.acquire(blocking=False):
+        raise HTTPException(status_code=429, detail="Too many authentication requests, retry shortly",
+                            headers={"Retry-After": "1"})
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_hash_executor, fn, *args)
+    finally:
+        _hash_slots.release()
+
+
 # OAuth2 scheme
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
 #  Add `get_current_user`
 
 
-def get_current_user(token: str = Security(oauth2_scheme)):
+async def get_current_user(token: str = Security(oauth2_scheme), db=Depends(get_async_db)):
     """
     Decodes JWT and returns user information.
     """
@@ -53,11 +142,48 @@ def get_current_user(token: str = Security(oauth2_scheme)):
         status_code=401, detail="Invalid credentials")
 
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = decode_access_token(token)
         username: str = payload.get("sub")
         if username is None:
             raise credentials_exception
     except JWTError:
         raise credentials_exception
 
-    return {"username": username}
+    user_id = payload.get("uid")
+    if user_id is None:
+        user_id = await _resolve_user_id(db, username)
+    elif not await _user_exists(db, user_id):
+        user_id = None
+    if user_id is None:
+        raise credentials_exception
+
+    return {"username": username, "user_id": user_id}
+
+#  Legacy tokens only carry the username
+
+
+async def _resolve_user_id(db, username: str):
+    user_id = await _user_id_cache.get(username)
+    if user_id is None:
+        user_id = await run_db(db, _lookup_user_id, username)
+        if user_id is not None:
+            await _user_id_cache.set(username, user_id)
+    return user_id
+
+
+def _lookup_user_id(db, username: str):
+    return db.query(User.id).filter(User.username == username).scalar()
+
+#  Tokens that carry the user id: check the user still exists (cached)
+
+
+async def _user_exists(db, user_id: int) -> bool:
+    if await _user_exists_cache.get(user_id) is None:
+        if not await run_db(db, _lookup_user_exists, user_id):
+            return False
+        await _user_exists_cache.set(user_id, True)
+    return True
+
+
+def _lookup_user_exists(db, user_id: int) -> bool:
+    return db.query(User.id).filter(User.id == user_id).scalar() is not None
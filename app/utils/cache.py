@@ -0,0 +1,109 @@
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from fastapi.encoders import jsonable_encoder
+
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "memory").lower()  # memory, redis or none
+CACHE_TTL = int(os.getenv("CACHE_TTL", "60"))
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "10000"))
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
+#  In-process LRU cache with per-entry expiry
+
+
+class MemoryCache:
+    def __init__(self, max_entries: int = CACHE_MAX_ENTRIES, ttl: int = CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    async def get(self, key: str):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    async def set(self, key: str, value, ttl: int = None):
+        with self._lock:
+            self._entries[key] = (
+                time.monotonic() + (ttl or self.ttl), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    async def delete(self, *keys: str):
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    async def clear(self, prefix: str = ""):
+        with self._lock:
+            for key in [key for key in self._entries if key.startswith(prefix)]:
+                del self._entries[key]
+
+#  Redis-backed cache shared between workers
+
+
+class RedisCache:
+    def __init__(self, url: str = REDIS_URL, ttl: int = CACHE_TTL, client=None):
+        if client is None:
+            try:
+                from redis import asyncio as aioredis
+            except ImportError:
+                import aioredis
+            client = aioredis.from_url(url)
+        self.client = client
+        self.ttl = ttl
+
+    async def get(self, key: str):
+        raw = await self.client.get(key)
+        return json.loads(raw) if raw is not None else None
+
+    async def set(self, key: str, value, ttl: int = None):
+        #  Redis eviction (maxmemory-policy) handles size limits
+        await self.client.set(key, json.dumps(jsonable_encoder(value)), ex=ttl or self.ttl)
+
+    async def delete(self, *keys: str):
+        if keys:
+            await self.client.delete(*keys)
+
+    async def clear(self, prefix: str = ""):
+        keys = [key async for key in self.client.scan_iter(match=f"{prefix}*")]
+        if keys:
+            await self.client.delete(*keys)
+
+#  No-op backend (CACHE_BACKEND=none)
+
+
+class NullCache:
+    async def get(self, key: str):
+        return None
+
+    async def set(self, key: str, value, ttl: int = None):
+        pass
+
+    async def delete(self, *keys: str):
+        pass
+
+    async def clear(self, prefix: str = ""):
+        pass
+
+
+def build_cache(backend: str = CACHE_BACKEND):
+    if backend == "redis":
+        return RedisCache()
+    if backend == "none":
+        return NullCache()
+    return MemoryCache()
+
+
+cache = build_cache()
@@ -0,0 +1,62 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from app import schemas
+
+CATALOGUE_TTL = int(os.getenv("CATALOGUE_TTL", "300"))
+
+#  Serialized mutual fund list, shared by every request in this process
+
+
+class CatalogueEntry:
+    def __init__(self, body: bytes):
+        self.body = body
+        #  Content hash, so every worker produces the same ETag for the same list
+        self.etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+        self.expires_at = time.monotonic() + CATALOGUE_TTL
+
+
+class CatalogueCache:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entry = None
+        self.version = 0
+
+    def get(self):
+        entry = self._entry
+        if entry is None or entry.expires_at < time.monotonic():
+            return None
+        return entry
+
+    def store(self, funds, version: int) -> CatalogueEntry:
+        """
+        Serialize `funds` once. Not kept if the catalogue changed while it was loading.
+        """
+        body = json.dumps([
+            schemas.MutualFundResponse.model_validate(
+                fund, from_attributes=True).model_dump()
+            for fund in funds
+        ], separators=(",", ":")).encode()
+        entry = CatalogueEntry(body)
+        with self._lock:
+            if version == self.version:
+                self._entry = entry
+        return entry
+
+    def invalidate(self):
+        with self._lock:
+            self.version += 1
+            self._entry = None
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+
+catalogue = CatalogueCache()
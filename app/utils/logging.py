@@ -0,0 +1,158 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from loguru import logger
+from sqlalchemy import event
+
+SLOW_REQUEST_MS = float(os.getenv("SLOW_REQUEST_MS", "500"))
+#  Statements kept per request for the slow-request log
+MAX_LOGGED_STATEMENTS = 50
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1,
+                    0.25, 0.5, 1, 2.5, 5, 10)
+
+#  Per-request database counters
+
+
+class RequestStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.db_time = 0.0
+        self.statements = 0
+        self.rows = 0
+        self.statement_log = []
+
+    def record(self, statement: str, seconds: float, rows: int):
+        with self._lock:
+            self.db_time += seconds
+            self.statements += 1
+            self.rows += max(rows, 0)
+            if len(self.statement_log) < MAX_LOGGED_STATEMENTS:
+                self.statement_log.append((seconds, statement))
+
+
+_request_stats: ContextVar = ContextVar("request_stats", default=None)
+
+#  Count statements outside a request (jobs, benchmarks)
+
+
+@contextmanager
+def track_queries():
+    stats = RequestStats()
+    token = _request_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _request_stats.reset(token)
+
+#  SQLAlchemy hooks: time every statement run inside a request
+
+
+def instrument_queries(engine):
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info["query_started"].pop()
+        stats = _request_stats.get()
+        if stats is not None:
+            #  rowcount is the number of rows fetched for buffered SELECTs (-1 when unknown)
+            stats.record(statement, time.perf_counter() - started, cursor.rowcount)
+
+#  Process-wide Prometheus counters
+
+
+class Metrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = {}
+        self.durations = {}
+        self.db_time = {}
+        self.statements = {}
+        self.rows = {}
+        self.slow_requests = 0
+
+    def observe(self, method: str, route: str, status: int, duration: float, stats: RequestStats):
+        key = (method, route)
+        with self._lock:
+            self.requests[key + (status,)] = self.requests.get(key + (status,), 0) + 1
+            buckets = self.durations.setdefault(
+                key, [[0] * len(DURATION_BUCKETS), 0, 0.0])
+            for i, bound in enumerate(DURATION_BUCKETS):
+                if duration <= bound:
+                    buckets[0][i] += 1
+            buckets[1] += 1
+            buckets[2] += duration
+            self.db_time[key] = self.db_time.get(key, 0.0) + stats.db_time
+            self.statements[key] = self.statements.get(key, 0) + stats.statements
+            self.rows[key] = self.rows.get(key, 0) + stats.rows
+            if duration * 1000 >= SLOW_REQUEST_MS:
+                self.slow_requests += 1
+
+    def render(self) -> str:
+        lines = []
+        with self._lock:
+            lines.append("# TYPE http_requests_total counter")
+            for (method, route, status), count in self.requests.items():
+                lines.append(
+                    f'http_requests_total{{method="{method}",route="{route}",status="{status}"}} {count}')
+
+            lines.append("# TYPE http_request_duration_seconds histogram")
+            for (method, route), (counts, total, seconds) in self.durations.items():
+                labels = f'method="{method}",route="{route}"'
+                for bound, count in zip(DURATION_BUCKETS, counts):
+                    lines.append(
+                        f'http_request_duration_seconds_bucket{{{labels},le="{bound}"}} {count}')
+                lines.append(
+                    f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}} {total}')
+                lines.append(
+                    f"http_request_duration_seconds_sum{{{labels}}} {seconds:.6f}")
+                lines.append(
+                    f"http_request_duration_seconds_count{{{labels}}} {total}")
+
+            for name, kind, values in (("db_time_seconds_total", "counter", self.db_time),
+                                       ("db_statements_total", "counter", self.statements),
+                                       ("db_rows_fetched_total", "counter", self.rows)):
+                lines.append(f"# TYPE {name} {kind}")
+                for (method, route), value in values.items():
+                    lines.append(
+                        f'{name}{{method="{method}",route="{route}"}} {value}')
+
+            lines.append("# TYPE http_slow_requests_total counter")
+            lines.append(f"http_slow_requests_total {self.slow_requests}")
+        return "\n".join(lines) + "\n"
+
+
+metrics = Metrics()
+
+#  HTTP middleware: Server-Timing header, metrics and slow-request log
+
+
+async def instrument_request(request, call_next):
+    stats = RequestStats()
+    token = _request_stats.set(stats)
+    started = time.perf_counter()
+    try:
+        response = await call_next(request)
+    finally:
+        _request_stats.reset(token)
+    duration = time.perf_counter() - started
+
+    #  Route template (e.g. /api/mutual-funds/{fund_id}) keeps label cardinality bounded
+    route = getattr(request.scope.get("route"), "path", "unmatched")
+    metrics.observe(request.method, route,
+                    response.status_code, duration, stats)
+
+    response.headers["Server-Timing"] = (
+        f'app;dur={duration * 1000:.1f}, db;dur={stats.db_time * 1000:.1f};desc="{stats.statements} statements"')
+
+    if duration * 1000 >= SLOW_REQUEST_MS:
+        logger.warning(
+            "Slow request {} {} took {:.1f}ms ({:.1f}ms in {} statements, {} rows)\n{}",
+            request.method, request.url.path, duration * 1000, stats.db_time * 1000,
+            stats.statements, stats.rows,
+            "\n".join(f"  {seconds * 1000:.1f}ms  {statement}" for seconds, statement in stats.statement_log))
+    return response
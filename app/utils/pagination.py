@@ -0,0 +1,38 @@
+import base64
+import json
+from datetime import date
+
+#  Opaque keyset cursors
+
+
+def encode_cursor(*values) -> str:
+    raw = json.dumps([value.isoformat() if isinstance(value, date) else value
+                      for value in values])
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> list:
+    """
+    Decode a cursor produced by `encode_cursor`. Raises ValueError if malformed.
+    """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+    if not isinstance(values, list):
+        raise ValueError("Invalid cursor")
+    return values
+
+#  `fields=` projection
+
+
+def parse_fields(fields: str, allowed, required=()) -> list:
+    """
+    Split a comma-separated field list, always keeping the `required` fields.
+    Raises ValueError on unknown names.
+    """
+    requested = [field.strip() for field in fields.split(",") if field.strip()]
+    unknown = [field for field in requested if field not in allowed]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    return list(required) + [field for field in requested if field not in required]
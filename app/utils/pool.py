@@ -0,0 +1,82 @@
+import threading
+import time
+from sqlalchemy import event, exc
+
+#  Connection pool counters for one engine
+
+
+class PoolStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.connects = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.timeouts = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+
+    def record_wait(self, seconds: float, timed_out: bool = False):
+        with self._lock:
+            self.wait_time_total += seconds
+            self.wait_time_max = max(self.wait_time_max, seconds)
+            if timed_out:
+                self.timeouts += 1
+
+    def incr(self, counter: str):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "connects": self.connects,
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "timeouts": self.timeouts,
+                "wait_time_total": round(self.wait_time_total, 6),
+                "wait_time_max": round(self.wait_time_max, 6),
+                "wait_time_avg": round(self.wait_time_total / self.checkouts, 6) if self.checkouts else 0,
+            }
+
+#  Pool class that times how long each checkout waits
+
+
+def instrumented_pool_class(pool_class, stats: PoolStats):
+    """
+    Subclass `pool_class` so every checkout records its wait in `stats`.
+    Stats live on the class so they survive `Pool.recreate()`.
+    """
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = pool_class._do_get(self)
+        except exc.TimeoutError:
+            stats.record_wait(time.perf_counter() - started, timed_out=True)
+            raise
+        stats.record_wait(time.perf_counter() - started)
+        return connection
+
+    return type(f"Instrumented{pool_class.__name__}", (pool_class,), {"_do_get": _do_get, "stats": stats})
+
+#  Count connects, checkouts and checkins on an engine
+
+
+def instrument_engine(engine, stats: PoolStats):
+    event.listen(engine, "connect", lambda *args: stats.incr("connects"))
+    event.listen(engine, "checkout", lambda *args: stats.incr("checkouts"))
+    event.listen(engine, "checkin", lambda *args: stats.incr("checkins"))
+
+#  Current pool state plus counters
+
+
+def pool_status(engine, stats: PoolStats) -> dict:
+    pool = engine.pool
+    status = {"pool_class": type(pool).__name__, **stats.snapshot()}
+    if hasattr(pool, "overflow"):
+        status.update({
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": pool.overflow(),
+        })
+    return status
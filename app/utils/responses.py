@@ -0,0 +1,47 @@
+import os
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+#  Opt-in fast JSON mode (needs orjson): orjson rendering, and routes whose output
+#  is already shaped by crud skip response_model re-validation
+FAST_JSON = os.getenv("FAST_JSON", "false").lower() == "true" and orjson is not None
+
+#  orjson renders dates, datetimes and numpy values natively
+ORJSON_OPTIONS = (orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS) if orjson else 0
+
+#  Response class rendered with orjson
+
+
+class TrustedJSONResponse(JSONResponse):
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, option=ORJSON_OPTIONS)
+
+
+#  Default response class for the app
+DefaultJSONResponse = TrustedJSONResponse if FAST_JSON else JSONResponse
+
+#  Helpers for routes
+
+
+def trusted(content, headers: dict = None):
+    """
+    In fast mode, send `content` as-is, skipping the route's response_model.
+    Otherwise return it unchanged for the usual validation.
+    """
+    if FAST_JSON:
+        return TrustedJSONResponse(content, headers=headers)
+    return content
+
+
+def json_response(content, headers: dict = None):
+    """
+    Response for routes that build their own JSON (projections, pages).
+    """
+    if FAST_JSON:
+        return TrustedJSONResponse(content, headers=headers)
+    return JSONResponse(jsonable_encoder(content), headers=headers)
@@ -0,0 +1,103 @@
+import numpy as np
+from datetime import date, timedelta
+
+#  Daily portfolio value series from units held x NAV, for all holdings at once
+
+
+def daily_portfolio_values(investments, nav_points, start_date: date, end_date: date):
+    """
+    Value the portfolio on every day from `start_date` to `end_date`.
+
+    `investments` are (fund_id, date, amount_invested, nav_at_investment, returns_since_investment)
+    rows for every purchase up to `end_date`; `nav_points` are (fund_id, date, nav) rows,
+    including the latest NAV before `start_date` for each fund. NAVs are carried forward
+    over days without a price; a fund with no NAV yet is valued at the NAV implied by its
+    latest purchase's returns. Returns (dates, values), skipping days before the first purchase.
+    """
+    if not investments:
+        return [], np.zeros(0)
+
+    fund_ids = sorted({row[0] for row in investments})
+    fund_index = {fund_id: i for i, fund_id in enumerate(fund_ids)}
+    n_funds = len(fund_ids)
+    n_days = (end_date - start_date).days + 1
+    start = np.datetime64(start_date, "D")
+
+    #  Units bought per fund per day, then cumulative holdings
+    inv_fund = np.fromiter((fund_index[row[0]] for row in investments), dtype=np.int64, count=len(investments))
+    inv_day = np.array([row[1] for row in investments], dtype="datetime64[D]")
+    inv_day = np.clip((inv_day - start).astype(np.int64), 0, None)
+    amounts = np.array([row[2] for row in investments], dtype=np.float64)
+    purchase_navs = np.array([row[3] or 0 for row in investments], dtype=np.float64)
+    units_bought = np.divide(amounts, purchase_navs, out=np.zeros_like(amounts), where=purchase_navs > 0)
+
+    units = np.zeros((n_funds, n_days))
+    in_range = inv_day < n_days
+    np.add.at(units, (inv_fund[in_range], inv_day[in_range]), units_bought[in_range])
+    units = np.cumsum(units, axis=1)
+
+    #  NAV implied by each fund's latest purchase, used until real prices exist
+    returns = np.array([row[4] or 0 for row in investments], dtype=np.float64)
+    implied_navs = np.full(n_funds, np.nan)
+    order = np.argsort(np.array([row[1] for row in investments], dtype="datetime64[D]"), kind="stable")
+    implied_navs[inv_fund[order]] = (purchase_navs * (1 + returns / 100))[order]
+
+    #  Forward-filled NAV matrix
+    navs = np.full((n_funds, n_days), np.nan)
+    if nav_points:
+        nav_fund = np.fromiter((fund_index[row[0]] for row in nav_points), dtype=np.int64, count=len(nav_points))
+        nav_day = np.array([row[1] for row in nav_points], dtype="datetime64[D]")
+        nav_day = (nav_day - start).astype(np.int64)
+        nav_value = np.array([row[2] for row in nav_points], dtype=np.float64)
+        #  Latest price on or before the first day seeds column 0
+        order = np.argsort(nav_day, kind="stable")
+        nav_fund, nav_day, nav_value = nav_fund[order], np.clip(nav_day[order], 0, None), nav_value[order]
+        navs[nav_fund, nav_day] = nav_value
+
+    filled_at = np.where(np.isnan(navs), 0, np.arange(n_days))
+    np.maximum.accumulate(filled_at, axis=1, out=filled_at)
+    navs = navs[np.arange(n_funds)[:, None], filled_at]
+    navs = np.where(np.isnan(navs), implied_navs[:, None], navs)
+
+    values = np.nansum(units * navs, axis=0)
+
+    #  Skip days before the first purchase
+    held = np.flatnonzero(units.sum(axis=0) > 0)
+    if not held.size:
+        return [], np.zeros(0)
+    first_day = held[0]
+    dates = [start_date + timedelta(days=int(day)) for day in range(first_day, n_days)]
+    return dates, values[first_day:]
+
+#  Largest-Triangle-Three-Buckets downsampling for graph series
+
+
+def lttb(values, threshold: int):
+    """
+    Pick `threshold` points of an evenly spaced series that keep its visual shape.
+    Returns the indices of the kept points, always including the first and last.
+    """
+    n = len(values)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    y = np.asarray(values, dtype=np.float64)
+    #  threshold - 2 buckets over the points between the first and the last
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    keep = np.empty(threshold, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+
+    a = 0
+    for i in range(threshold - 2):
+        lo, hi = edges[i], edges[i + 1]
+        #  Third vertex: average of the next bucket, or the last point
+        if i + 2 < len(edges):
+            next_lo, next_hi = edges[i + 1], edges[i + 2]
+            avg_x, avg_y = (next_lo + next_hi - 1) / 2, y[next_lo:next_hi].mean()
+        else:
+            avg_x, avg_y = n - 1, y[-1]
+        xs = np.arange(lo, hi)
+        area = np.abs((a - avg_x) * (y[lo:hi] - y[a]) - (a - xs) * (avg_y - y[a]))
+        a = lo + int(np.argmax(area))
+        keep[i + 1] = a
+    return keep
@@ -0,0 +1,87 @@
+"""
+Cold-start time of a fresh API process: how long a new pod takes to serve.
+
+For each run, starts `uvicorn app.main:app` in a new process and measures the time
+to import the app, to finish startup (first response from /openapi.json), and to
+the first successful response from `--path`, which hits the database. Run it with
+and without warm-up to compare:
+
+    python benchmarks/cold_start.py --runs 5
+    DB_WARMUP_CONNECTIONS=5 WARMUP_CATALOGUE=true python benchmarks/cold_start.py --runs 5
+"""
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def import_time() -> float:
+    output = subprocess.check_output([
+        sys.executable, "-c",
+        "import time; started = time.perf_counter(); import app.main; print(time.perf_counter() - started)"])
+    return float(output.decode().strip().splitlines()[-1])
+
+
+def wait_for(url: str, started: float, timeout: float) -> float:
+    while time.perf_counter() - started < timeout:
+        try:
+            with urllib.request.urlopen(url, timeout=1) as response:
+                if response.status == 200:
+                    return time.perf_counter() - started
+        except (urllib.error.URLError, ConnectionError):
+            time.sleep(0.005)
+    raise TimeoutError(f"{url} did not answer within {timeout}s")
+
+
+def cold_start(path: str, timeout: float):
+    port = free_port()
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        env=os.environ.copy())
+    try:
+        ready = wait_for(f"http://127.0.0.1:{port}/openapi.json", started, timeout)
+        #  First request that needs the database
+        request_started = time.perf_counter()
+        wait_for(f"http://127.0.0.1:{port}{path}", request_started, timeout)
+        first_request = time.perf_counter() - request_started
+        return ready, first_request
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main(args):
+    imports, ready, first = [], [], []
+    for _ in range(args.runs):
+        imports.append(import_time())
+        ready_seconds, first_seconds = cold_start(args.path, args.timeout)
+        ready.append(ready_seconds)
+        first.append(first_seconds)
+
+    def median_ms(values):
+        return statistics.median(values) * 1000
+
+    print(f"runs={args.runs} warmup_connections={os.getenv('DB_WARMUP_CONNECTIONS', '0')} "
+          f"warmup_catalogue={os.getenv('WARMUP_CATALOGUE', 'false')}")
+    print(f"import={median_ms(imports):.0f}ms ready={median_ms(ready):.0f}ms "
+          f"first {args.path}={median_ms(first):.1f}ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--path", default="/api/mutual-funds")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    main(parser.parse_args())
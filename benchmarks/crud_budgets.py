@@ -0,0 +1,256 @@
+"""
+Statement-count and latency budgets for every crud function and dashboard route.
+
+Creates the schema on LIVE_DATABASE_URL (use a scratch PostgreSQL database, or
+sqlite:///budgets.sqlite for a quick local run), seeds a synthetic dataset, then
+runs each crud function and route `--repeats` times. A function that issues more
+statements than its budget, or whose median exceeds `--max-ms`, fails the run:
+
+    LIVE_DATABASE_URL=postgresql://localhost/mf_bench CACHE_BACKEND=none \\
+        python benchmarks/crud_budgets.py --users 1000 --investments-per-user 50 --output budgets.json
+
+Route statement counts include statements run while a response streams (exports),
+so the portfolio cache should be off (CACHE_BACKEND=none) to measure the database path.
+The auth routes' latency is bcrypt's and is not held to `--max-ms`.
+"""
+import argparse
+import json
+import statistics
+import sys
+import time
+from contextlib import contextmanager
+from datetime import date
+from itertools import count
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from app import crud, database, schemas
+from app.database import Base, SessionLocal, init_engines
+from app.seeder import seed_synthetic
+from app.utils.auth import create_access_token
+from app.utils.logging import RequestStats, track_queries
+
+#  Statements each call may issue with a warm snapshot table
+CRUD_BUDGETS = {
+    "get_user_by_username": 1,
+    "get_portfolio": 1,
+    "get_all_mutual_funds": 1,
+    "get_mutual_fund": 1,
+    "get_user_investments": 1,
+    "iter_user_investments": 1,
+    "get_sector_allocation": 1,
+    "get_stock_allocation": 2,
+    "get_stock_exposure": 1,
+    "get_holdings_allocation": 2,
+    "get_fund_overlap": 4,
+    "get_dashboard": 7,
+    "create_user": 2,
+    "update_password_hash": 1,
+    "create_mutual_fund": 2,
+    "update_mutual_fund": 5,  # a rename also updates the snapshots naming the fund
+    "delete_mutual_fund": 6,
+    "create_investment": 5,
+    "bulk_create_investments": 5,
+}
+
+#  Statements per GET request; tokens carry the user id and its existence check is
+#  cached, so warm requests spend none on auth
+ROUTE_BUDGETS = {
+    "/api/portfolio": 1,
+    "/api/portfolio/sector-allocation": 1,
+    "/api/portfolio/stock-allocation?period=1Y": 2,
+    "/api/portfolio/overlap": 4,
+    "/api/portfolio/holdings-allocation": 2,
+    "/api/portfolio/dashboard?period=1Y": 7,
+    "/api/investments?limit=100": 1,
+    "/api/investments/export?format=ndjson": 1,
+    "/api/investments/export?format=csv": 1,
+    "/api/mutual-funds": 1,
+    "/api/mutual-funds?limit=100": 1,
+}
+
+#  Statements per POST request
+POST_ROUTE_BUDGETS = {
+    "/auth/signup": 2,
+    "/auth/login": 1,
+    "/api/investments": 5,
+    "/api/investments/import": 5,
+}
+
+#  Routes whose latency is bcrypt's, not the database's
+HASHING_ROUTES = {"/auth/signup", "/auth/login"}
+
+
+def crud_calls(username: str, user_id: int, fund_id: int, security: str, hashed_password: str, scratch_fund_ids: list):
+    """
+    Calls to measure. Writes go to `user_id` or to `scratch_fund_ids` (the first is
+    updated, the rest are deleted one per call), so the seeded catalogue stays intact.
+    """
+    investment = schemas.InvestmentBase(fund_id=fund_id, date=date.today(), amount_invested=1000,
+                                        nav_at_investment=100, returns_since_investment=1)
+    import_rows = [(row_number, investment) for row_number in range(1, 101)]
+    names = count()
+
+    def next_fund():
+        n = next(names)
+        return schemas.MutualFundBase(name=f"Budget Fund {n}", isin=f"INFBGT{n:06d}")
+
+    return {
+        "get_user_by_username": lambda db: crud.get_user_by_username(db, username),
+        "get_portfolio": lambda db: crud.get_portfolio(db, user_id),
+        "get_all_mutual_funds": lambda db: crud.get_all_mutual_funds(db, limit=100),
+        "get_mutual_fund": lambda db: crud.get_mutual_fund(db, fund_id),
+        "get_user_investments": lambda db: crud.get_user_investments(db, user_id, limit=100),
+        "iter_user_investments": lambda db: list(crud.iter_user_investments(
+            db, user_id, list(schemas.InvestmentResponse.model_fields))),
+        "get_sector_allocation": lambda db: crud.get_sector_allocation(db, user_id),
+        "get_stock_allocation": lambda db: crud.get_stock_allocation(db, user_id, "1Y"),
+        "get_stock_exposure": lambda db: crud.get_stock_exposure(db, user_id, security),
+        "get_holdings_allocation": lambda db: crud.get_holdings_allocation(db, user_id),
+        "get_fund_overlap": lambda db: crud.get_fund_overlap(db, user_id),
+        "get_dashboard": lambda db: crud.get_dashboard(db, user_id, period="1Y"),
+        "create_user": lambda db: crud.create_user(
+            db, schemas.UserCreate(username=f"budget_user_{next(names)}_{user_id}", password="-"), hashed_password),
+        "update_password_hash": lambda db: crud.update_password_hash(db, user_id, hashed_password),
+        "create_mutual_fund": lambda db: crud.create_mutual_fund(db, next_fund()),
+        "update_mutual_fund": lambda db: crud.update_mutual_fund(db, scratch_fund_ids[0], next_fund()),
+        "delete_mutual_fund": lambda db: crud.delete_mutual_fund(db, scratch_fund_ids.pop()),
+        "create_investment": lambda db: crud.create_investment(db, user_id, investment),
+        "bulk_create_investments": lambda db: crud.bulk_create_investments(db, user_id, import_rows),
+    }
+
+
+def post_requests(username: str, fund_id: int):
+    """
+    POST route -> function building the next request's arguments.
+    """
+    names = count()
+    investment = {"fund_id": fund_id, "date": date.today().isoformat(), "amount_invested": 1000,
+                  "nav_at_investment": 100, "returns_since_investment": 1}
+    return {
+        "/auth/signup": lambda: {"json": {"username": f"budget_signup_{next(names)}_{username}", "password": "password123"}},
+        "/auth/login": lambda: {"json": {"username": username, "password": "password123"}},
+        "/api/investments": lambda: {"json": investment},
+        "/api/investments/import": lambda: {"json": [investment] * 100},
+    }
+
+
+def scratch_funds(db, funds: int) -> list:
+    return [crud.create_mutual_fund(db, schemas.MutualFundBase(name=f"Scratch Fund {i}", isin=f"INFSCR{i:06d}")).id
+            for i in range(funds)]
+
+
+def measure(fn, repeats: int):
+    """Median milliseconds and worst-case statement count over `repeats` runs."""
+    timings, statements = [], 0
+    for _ in range(repeats):
+        with track_queries() as stats:
+            started = time.perf_counter()
+            fn()
+            timings.append((time.perf_counter() - started) * 1000)
+        statements = max(statements, stats.statements)
+    return {"median_ms": round(statistics.median(timings), 2), "max_ms": round(max(timings), 2),
+            "statements": statements}
+
+
+@contextmanager
+def engine_statements():
+    """
+    Count every statement the engines run, including those issued on other threads
+    or after the response headers (streamed exports), which Server-Timing misses.
+    """
+    stats = RequestStats()
+    engines = [database.engine] + ([database.async_engine.sync_engine] if database.async_engine else [])
+
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        stats.record(statement, 0.0, 0)
+
+    for engine in engines:
+        event.listen(engine, "after_cursor_execute", _count)
+    try:
+        yield stats
+    finally:
+        for engine in engines:
+            event.remove(engine, "after_cursor_execute", _count)
+
+
+def measure_request(client: TestClient, method: str, path: str, repeats: int, request_args=dict, headers=None):
+    #  Warm-up request (lazy snapshot, catalogue)
+    client.request(method, path, headers=headers, **request_args()).raise_for_status()
+    timings, statements = [], 0
+    for _ in range(repeats):
+        with engine_statements() as stats:
+            started = time.perf_counter()
+            response = client.request(method, path, headers=headers, **request_args())
+            timings.append((time.perf_counter() - started) * 1000)
+        response.raise_for_status()
+        statements = max(statements, stats.statements)
+    return {"median_ms": round(statistics.median(timings), 2), "max_ms": round(max(timings), 2),
+            "statements": statements}
+
+
+def main(args):
+    Base.metadata.create_all(bind=init_engines())
+    db = SessionLocal()
+    try:
+        usernames = seed_synthetic(db, users=args.users, funds=args.funds,
+                                   investments_per_user=args.investments_per_user,
+                                   holdings_per_fund=args.holdings_per_fund, seed=args.seed)
+        username = usernames[0]
+        user = crud.get_user_by_username(db, username)
+        user_id, hashed_password = user.id, user.hashed_password
+        fund_id = crud.get_user_investments(db, user_id, limit=1)[0].fund_id
+        security = crud.get_holdings_allocation(db, user_id, limit=1)["holdings"][0]["security_isin"]
+
+        results, failures = {"crud": {}, "routes": {}}, []
+        calls = crud_calls(username, user_id, fund_id, security, hashed_password,
+                           scratch_funds(db, args.repeats + 2))
+        for name, call in calls.items():
+            #  First call builds lazy state (portfolio snapshot); budgets apply to warm calls
+            call(db)
+            result = measure(lambda: call(db), args.repeats)
+            result["budget"] = CRUD_BUDGETS[name]
+            results["crud"][name] = result
+            if result["statements"] > result["budget"] or result["median_ms"] > args.max_ms:
+                failures.append(f"crud.{name}: {result}")
+    finally:
+        db.close()
+
+    from app.main import app
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': username, 'uid': user_id})}"}
+    requests = [("GET", path, budget, dict) for path, budget in ROUTE_BUDGETS.items()]
+    requests += [("POST", path, POST_ROUTE_BUDGETS[path], request_args)
+                 for path, request_args in post_requests(username, fund_id).items()]
+    with TestClient(app) as client:
+        for method, path, budget, request_args in requests:
+            result = measure_request(client, method, path, args.repeats, request_args, headers)
+            result["budget"] = budget
+            results["routes"][f"{method} {path}"] = result
+            slow = result["median_ms"] > args.max_ms and path not in HASHING_ROUTES
+            if result["statements"] > budget or slow:
+                failures.append(f"route {method} {path}: {result}")
+
+    for section, rows in results.items():
+        for name, result in rows.items():
+            print(f"{section:6} {name:50} {result['statements']:>3}/{result['budget']:<3} statements  "
+                  f"p50={result['median_ms']:.1f}ms max={result['max_ms']:.1f}ms")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if failures:
+        print("\nBudget violations:\n  " + "\n  ".join(failures))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--funds", type=int, default=50)
+    parser.add_argument("--investments-per-user", type=int, default=20)
+    parser.add_argument("--holdings-per-fund", type=int, default=30)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--max-ms", type=float, default=200.0)
+    parser.add_argument("--output", default=None)
+    main(parser.parse_args())
@@ -0,0 +1,64 @@
+"""
+Concurrent dashboard load against a running server.
+
+Start the API once with USE_ASYNC_DB=false and once with USE_ASYNC_DB=true,
+then run this script against each and compare the numbers:
+
+    python benchmarks/load_dashboard.py --token <jwt> --concurrency 1000
+"""
+import argparse
+import asyncio
+import time
+from urllib.parse import urlsplit
+
+DASHBOARD_PATHS = [
+    "/api/portfolio",
+    "/api/portfolio/sector-allocation",
+    "/api/portfolio/stock-allocation?period=1Y",
+    "/api/portfolio/overlap",
+]
+
+
+async def fetch(host: str, port: int, path: str, token: str) -> int:
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write((f"GET {path} HTTP/1.1\r\nHost: {host}\r\n"
+                  f"Authorization: Bearer {token}\r\nConnection: close\r\n\r\n").encode())
+    await writer.drain()
+    status_line = await reader.readline()
+    await reader.read()
+    writer.close()
+    return int(status_line.split()[1])
+
+
+async def dashboard_load(host: str, port: int, token: str, semaphore: asyncio.Semaphore, latencies: list):
+    async with semaphore:
+        started = time.perf_counter()
+        statuses = await asyncio.gather(*(fetch(host, port, path, token) for path in DASHBOARD_PATHS))
+        latencies.append(time.perf_counter() - started)
+        return all(status == 200 for status in statuses)
+
+
+async def main(args):
+    url = urlsplit(args.url)
+    semaphore = asyncio.Semaphore(args.concurrency)
+    latencies = []
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*(dashboard_load(url.hostname, url.port or 80, args.token, semaphore, latencies)
+                                     for _ in range(args.loads)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    print(f"loads={args.loads} concurrency={args.concurrency} failed={results.count(False)}")
+    print(f"throughput={args.loads / elapsed:.1f} dashboards/s")
+    print(f"p50={latencies[len(latencies) // 2] * 1000:.1f}ms "
+          f"p99={latencies[int(len(latencies) * 0.99) - 1] * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--token", required=True)
+    parser.add_argument("--loads", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=1000)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,47 @@
+"""
+Login throughput through the bounded bcrypt pool.
+
+Sends `--logins` password verifications to the hashing pool, `--concurrency` at a
+time, and reports verified logins per second and how many were shed with 429:
+
+    BCRYPT_ROUNDS=12 HASH_WORKERS=4 python benchmarks/login_throughput.py --logins 200 --concurrency 64
+"""
+import argparse
+import asyncio
+import time
+from fastapi import HTTPException
+from app.utils.auth import (HASH_MAX_PENDING, HASH_WORKERS, get_password_hash, run_hashing,
+                            verify_and_update_password)
+
+
+async def attempt(password: str, hashed: str, semaphore: asyncio.Semaphore) -> bool:
+    async with semaphore:
+        try:
+            valid, _ = await run_hashing(verify_and_update_password, password, hashed)
+            return valid
+        except HTTPException as e:
+            if e.status_code != 429:
+                raise
+            return None
+
+
+async def main(args):
+    hashed = get_password_hash("password123")
+    semaphore = asyncio.Semaphore(args.concurrency or args.logins)
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*(attempt("password123", hashed, semaphore) for _ in range(args.logins)))
+    elapsed = time.perf_counter() - started
+
+    verified = results.count(True)
+    print(f"workers={HASH_WORKERS} max_pending={HASH_MAX_PENDING} logins={args.logins} "
+          f"concurrency={args.concurrency or args.logins}")
+    print(f"verified={verified} rejected_429={results.count(None)} elapsed={elapsed:.2f}s")
+    print(f"throughput={verified / elapsed:.1f} logins/s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=None)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,85 @@
+"""
+Response serialization cost for large payloads, default path vs fast JSON path.
+
+Builds `--rows` investments (as ORM-like objects) and a `--rows`-point value history,
+then times what FastAPI does with each:
+
+  default:  response_model validation + serialization, rendered with json
+  fast:     crud output rendered directly with orjson (FAST_JSON=true)
+
+    python benchmarks/serialization.py --rows 10000 --repeats 20
+"""
+import argparse
+import json
+import random
+import statistics
+import time
+from datetime import date, timedelta
+from types import SimpleNamespace
+from pydantic import TypeAdapter
+from app import schemas
+from app.utils.responses import ORJSON_OPTIONS, orjson
+
+INVESTMENT_FIELDS = tuple(schemas.InvestmentResponse.model_fields)
+
+
+def build_payloads(rows: int):
+    rng = random.Random(0)
+    start = date.today() - timedelta(days=rows)
+    investments = [SimpleNamespace(
+        id=i, user_id=1, fund_id=rng.randint(1, 500), date=start + timedelta(days=i),
+        amount_invested=round(rng.uniform(1000, 100000), 2),
+        nav_at_investment=round(rng.uniform(50, 150), 4),
+        returns_since_investment=round(rng.uniform(-10, 30), 2)) for i in range(rows)]
+    #  Fast mode reads rows, which become plain dicts
+    investment_rows = [{field: getattr(inv, field) for field in INVESTMENT_FIELDS} for inv in investments]
+    history = {
+        "history": [{"date": start + timedelta(days=i), "value": rng.uniform(1e5, 1e6)} for i in range(rows)],
+        "total_value": 1.0, "change_amount": 0.0, "change_percentage": 0.0,
+    }
+    return investments, investment_rows, history
+
+
+def default_render(adapter: TypeAdapter, content) -> bytes:
+    #  What FastAPI does for a response_model route returning JSONResponse
+    validated = adapter.validate_python(content, from_attributes=True)
+    serialized = adapter.dump_python(validated, mode="json")
+    return json.dumps(serialized, ensure_ascii=False, allow_nan=False, indent=None,
+                      separators=(",", ":")).encode("utf-8")
+
+
+def fast_render(content) -> bytes:
+    return orjson.dumps(content, option=ORJSON_OPTIONS)
+
+
+def timed(fn, repeats: int):
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        body = fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings), len(body)
+
+
+def main(args):
+    investments, investment_rows, history = build_payloads(args.rows)
+    cases = {
+        "investments": (TypeAdapter(list[schemas.InvestmentResponse]), investments, investment_rows),
+        "value history": (TypeAdapter(schemas.StockAllocationResponse), history, history),
+    }
+    for name, (adapter, default_content, fast_content) in cases.items():
+        default_ms, default_bytes = timed(lambda: default_render(adapter, default_content), args.repeats)
+        line = f"{name:14} rows={args.rows} default={default_ms:.1f}ms ({default_bytes} bytes)"
+        if orjson is not None:
+            fast_ms, fast_bytes = timed(lambda: fast_render(fast_content), args.repeats)
+            line += f" fast={fast_ms:.1f}ms ({fast_bytes} bytes) speedup={default_ms / fast_ms:.1f}x"
+        else:
+            line += " fast=n/a (orjson not installed)"
+        print(line)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeats", type=int, default=20)
+    main(parser.parse_args())
@@ -0,0 +1,77 @@
+import os
+import tempfile
+from itertools import count
+
+#  Tests run against TEST_DATABASE_URL (a scratch PostgreSQL database), or a
+#  throwaway SQLite file when it is not set. Set before the app is imported.
+_sqlite_dir = tempfile.mkdtemp(prefix="portfolio-tests-")
+os.environ["LIVE_DATABASE_URL"] = os.getenv(
+    "TEST_DATABASE_URL", f"sqlite:///{_sqlite_dir}/test.sqlite")
+os.environ.setdefault("CACHE_BACKEND", "none")
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+
+import pytest
+from fastapi.testclient import TestClient
+from app import database, models
+from app.seeder import seed_synthetic
+
+IS_POSTGRES = os.environ["LIVE_DATABASE_URL"].startswith("postgresql")
+_new_users = count()
+
+
+@pytest.fixture(scope="session")
+def engine():
+    engine = database.init_engines()
+    database.Base.metadata.create_all(bind=engine)
+    yield engine
+    database.Base.metadata.drop_all(bind=engine)
+    engine.dispose()
+
+
+@pytest.fixture(scope="session")
+def seeded(engine):
+    """
+    Synthetic users, funds and investments shared by the read-only tests.
+    """
+    db = database.SessionLocal()
+    try:
+        usernames = seed_synthetic(db, users=5, funds=12, investments_per_user=15,
+                                   holdings_per_fund=10, overlaps_per_fund=3, nav_days=60)
+        users = db.query(models.User).filter(models.User.username.in_(usernames)).order_by(models.User.id).all()
+        return [(user.id, user.username) for user in users]
+    finally:
+        db.close()
+
+
+@pytest.fixture
+def db(engine):
+    session = database.SessionLocal()
+    yield session
+    session.close()
+
+
+@pytest.fixture(scope="session")
+def client(seeded):
+    from app.main import app
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture(scope="session")
+def auth_headers(client, seeded):
+    _, username = seeded[0]
+    response = client.post("/auth/login", json={"username": username, "password": "password123"})
+    assert response.status_code == 200, response.text
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+@pytest.fixture
+def new_user_headers(client):
+    """
+    Sign up and log in a fresh user (no investments) for tests that write.
+    """
+    username = f"test_user_{next(_new_users)}"
+    credentials = {"username": username, "password": "password123"}
+    assert client.post("/auth/signup", json=credentials).status_code == 200
+    response = client.post("/auth/login", json=credentials)
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
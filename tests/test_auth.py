@@ -0,0 +1,115 @@
+import threading
+from datetime import datetime, timedelta, timezone
+import pytest
+from jose import jwt
+from passlib.hash import bcrypt
+from app import models
+from app.utils import auth
+
+
+def bearer(token: str) -> dict:
+    return {"Authorization": f"Bearer {token}"}
+
+
+def legacy_token(claims: dict) -> str:
+    #  As issued before tokens carried a kid, uid or expiry
+    return jwt.encode(claims, auth.SIGNING_KEYS[auth.CURRENT_KID], algorithm=auth.ALGORITHM)
+
+
+@pytest.fixture
+def user(seeded):
+    return {"sub": seeded[0][1], "uid": seeded[0][0]}
+
+
+def test_login_rejects_wrong_password(client, seeded):
+    response = client.post("/auth/login", json={"username": seeded[0][1], "password": "wrong"})
+    assert response.status_code == 400
+
+
+def test_token_round_trip(client, user):
+    token = auth.create_access_token(user)
+    assert jwt.get_unverified_header(token)["kid"] == auth.CURRENT_KID
+    assert client.get("/api/portfolio", headers=bearer(token)).status_code == 200
+
+
+def test_expired_token_is_rejected(client, user):
+    token = auth.create_access_token(user, expires_delta=timedelta(seconds=-1))
+    assert client.get("/api/portfolio", headers=bearer(token)).status_code == 401
+
+
+def test_token_with_kid_must_expire(client, user):
+    token = jwt.encode(user, auth.SIGNING_KEYS[auth.CURRENT_KID], algorithm=auth.ALGORITHM,
+                       headers={"kid": auth.CURRENT_KID})
+    assert client.get("/api/portfolio", headers=bearer(token)).status_code == 401
+
+
+def test_legacy_token_without_expiry_is_rejected(client, user, monkeypatch):
+    monkeypatch.setattr(auth, "_legacy_grace_until", None)
+    assert client.get("/api/portfolio", headers=bearer(legacy_token({"sub": user["sub"]}))).status_code == 401
+
+
+def test_legacy_token_without_expiry_within_grace_window(client, user, monkeypatch):
+    token = legacy_token({"sub": user["sub"]})
+    monkeypatch.setattr(auth, "_legacy_grace_until", datetime.now(timezone.utc) + timedelta(days=1))
+    assert client.get("/api/portfolio", headers=bearer(token)).status_code == 200
+    monkeypatch.setattr(auth, "_legacy_grace_until", datetime.now(timezone.utc) - timedelta(seconds=1))
+    assert client.get("/api/portfolio", headers=bearer(token)).status_code == 401
+
+
+def test_legacy_token_with_expiry_resolves_user_id(client, user, monkeypatch):
+    monkeypatch.setattr(auth, "_legacy_grace_until", None)
+    token = legacy_token({"sub": user["sub"], "exp": datetime.now(timezone.utc) + timedelta(minutes=5)})
+    assert client.get("/api/portfolio", headers=bearer(token)).status_code == 200
+
+
+def test_unknown_signing_key_is_rejected(client, user):
+    token = jwt.encode({**user, "exp": datetime.now(timezone.utc) + timedelta(minutes=5)}, "other",
+                       algorithm=auth.ALGORITHM, headers={"kid": "retired"})
+    assert client.get("/api/portfolio", headers=bearer(token)).status_code == 401
+
+
+def test_deleted_user_token_is_rejected(client, db, new_user_headers):
+    payload = auth.decode_access_token(new_user_headers["Authorization"].split()[1])
+    db.query(models.User).filter(models.User.id == payload["uid"]).delete()
+    db.commit()
+
+    assert client.get("/api/portfolio", headers=new_user_headers).status_code == 401
+    response = client.post("/api/investments", headers=new_user_headers, json={
+        "fund_id": 1, "date": "2024-01-02", "amount_invested": 10.0,
+        "nav_at_investment": 10.0, "returns_since_investment": 0.0})
+    assert response.status_code == 401
+
+
+def test_investment_in_unknown_fund_is_rejected(client, new_user_headers):
+    response = client.post("/api/investments", headers=new_user_headers, json={
+        "fund_id": 10 ** 9, "date": "2024-01-02", "amount_invested": 10.0,
+        "nav_at_investment": 10.0, "returns_since_investment": 0.0})
+    assert response.status_code == 400
+
+
+def test_login_gets_429_when_hashing_slots_are_taken(client, seeded, monkeypatch):
+    slots = threading.BoundedSemaphore(1)
+    monkeypatch.setattr(auth, "_hash_slots", slots)
+    slots.acquire()
+    try:
+        response = client.post("/auth/login", json={"username": seeded[0][1], "password": "password123"})
+    finally:
+        slots.release()
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "1"
+    assert client.post("/auth/login", json={"username": seeded[0][1], "password": "password123"}).status_code == 200
+
+
+def test_login_rehashes_a_password_with_another_cost(client, db):
+    old_hash = bcrypt.using(rounds=auth.BCRYPT_ROUNDS + 1).hash("password123")
+    user = models.User(username="rehash_user", hashed_password=old_hash)
+    db.add(user)
+    db.commit()
+
+    credentials = {"username": "rehash_user", "password": "password123"}
+    assert client.post("/auth/login", json=credentials).status_code == 200
+    db.expire_all()
+    new_hash = db.get(models.User, user.id).hashed_password
+    assert new_hash != old_hash
+    assert bcrypt.from_string(new_hash).rounds == auth.BCRYPT_ROUNDS
+    assert client.post("/auth/login", json=credentials).status_code == 200
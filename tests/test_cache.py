@@ -0,0 +1,116 @@
+import asyncio
+import fnmatch
+from datetime import date
+import pytest
+from app import async_crud
+from app.utils import cache as cache_module
+from app.utils.cache import MemoryCache, NullCache, RedisCache, build_cache
+
+
+class FakeRedis:
+    """
+    The subset of the redis.asyncio client RedisCache uses.
+    """
+
+    def __init__(self):
+        self.values = {}
+        self.expiry = {}
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.values[key] = value.encode()
+        self.expiry[key] = ex
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.values.pop(key, None)
+
+    async def scan_iter(self, match="*"):
+        for key in list(self.values):
+            if fnmatch.fnmatchcase(key, match):
+                yield key
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+def test_memory_cache_round_trip_and_delete():
+    cache = MemoryCache(max_entries=10, ttl=60)
+    run(cache.set("a", {"value": 1}))
+    assert run(cache.get("a")) == {"value": 1}
+    run(cache.delete("a", "missing"))
+    assert run(cache.get("a")) is None
+
+
+def test_memory_cache_expires_entries(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+    cache = MemoryCache(max_entries=10, ttl=60)
+    run(cache.set("a", 1))
+    run(cache.set("b", 2, ttl=300))
+    now[0] += 61
+    assert run(cache.get("a")) is None
+    assert run(cache.get("b")) == 2
+
+
+def test_memory_cache_evicts_least_recently_used():
+    cache = MemoryCache(max_entries=2, ttl=60)
+    run(cache.set("a", 1))
+    run(cache.set("b", 2))
+    run(cache.get("a"))
+    run(cache.set("c", 3))
+    assert run(cache.get("b")) is None
+    assert run(cache.get("a")) == 1 and run(cache.get("c")) == 3
+
+
+def test_memory_cache_clear_by_prefix():
+    cache = MemoryCache()
+    for key in ("portfolio-cache:1:portfolio", "portfolio-cache:2:overlap", "other"):
+        run(cache.set(key, key))
+    run(cache.clear("portfolio-cache:"))
+    assert run(cache.get("other")) == "other"
+    assert run(cache.get("portfolio-cache:1:portfolio")) is None
+
+
+def test_redis_cache_stores_json_with_ttl():
+    client = FakeRedis()
+    cache = RedisCache(client=client, ttl=60)
+    run(cache.set("k", {"date": date(2024, 1, 2), "value": 1.5}))
+    assert run(cache.get("k")) == {"date": "2024-01-02", "value": 1.5}
+    assert client.expiry["k"] == 60
+    run(cache.set("short", 1, ttl=5))
+    assert client.expiry["short"] == 5
+    assert run(cache.get("missing")) is None
+
+
+def test_redis_cache_delete_and_clear():
+    cache = RedisCache(client=FakeRedis())
+    for key in ("portfolio-cache:1:portfolio", "portfolio-cache:1:overlap", "other"):
+        run(cache.set(key, 1))
+    run(cache.delete("portfolio-cache:1:portfolio"))
+    assert run(cache.get("portfolio-cache:1:portfolio")) is None
+    run(cache.clear("portfolio-cache:"))
+    assert run(cache.get("portfolio-cache:1:overlap")) is None
+    assert run(cache.get("other")) == 1
+    run(cache.delete())
+
+
+def test_build_cache_backends():
+    assert isinstance(build_cache("memory"), MemoryCache)
+    assert isinstance(build_cache("none"), NullCache)
+    assert run(build_cache("none").get("anything")) is None
+
+
+@pytest.mark.parametrize("backend", [MemoryCache, lambda: RedisCache(client=FakeRedis())])
+def test_portfolio_cache_is_invalidated_by_writes(client, new_user_headers, monkeypatch, backend):
+    monkeypatch.setattr(async_crud, "cache", backend())
+    assert client.get("/api/portfolio", headers=new_user_headers).json()["initial_investment"] == 0
+
+    response = client.post("/api/investments", headers=new_user_headers, json={
+        "fund_id": client.get("/api/mutual-funds?limit=1").json()[0]["id"], "date": "2024-01-02", "amount_invested": 1000.0,
+        "nav_at_investment": 10.0, "returns_since_investment": 5.0})
+    assert response.status_code == 200, response.text
+    assert client.get("/api/portfolio", headers=new_user_headers).json()["initial_investment"] == 1000.0
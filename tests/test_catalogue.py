@@ -0,0 +1,67 @@
+from itertools import count
+from types import SimpleNamespace
+import pytest
+from app.utils.catalogue import CatalogueCache, catalogue, etag_matches
+from benchmarks.crud_budgets import engine_statements
+
+_funds = count()
+
+
+@pytest.fixture(autouse=True)
+def fresh_catalogue():
+    #  Other tests insert funds directly, which the process-wide catalogue does not see
+    catalogue.invalidate()
+    yield
+    catalogue.invalidate()
+
+
+def test_matching_etag_gets_304_without_a_query(client):
+    etag = client.get("/api/mutual-funds").headers["ETag"]
+
+    with engine_statements() as stats:
+        response = client.get("/api/mutual-funds", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["ETag"] == etag
+    assert stats.statements == 0
+
+    assert client.get("/api/mutual-funds", headers={"If-None-Match": '"stale"'}).status_code == 200
+
+
+def test_etag_changes_after_every_write(client):
+    etags = [client.get("/api/mutual-funds").headers["ETag"]]
+    n = next(_funds)
+    fund = client.post("/api/mutual-funds", json={"name": f"Catalogue Fund {n}", "isin": f"CATALOGUE{n}"}).json()
+    writes = [
+        lambda: None,  # the create above
+        lambda: client.put(f"/api/mutual-funds/{fund['id']}",
+                           json={"name": f"Catalogue Fund {n} (renamed)", "isin": f"CATALOGUE{n}"}),
+        lambda: client.delete(f"/api/mutual-funds/{fund['id']}"),
+    ]
+    for write in writes:
+        write()
+        response = client.get("/api/mutual-funds", headers={"If-None-Match": etags[-1]})
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etags[-1]
+        etags.append(response.headers["ETag"])
+    assert fund["id"] not in [f["id"] for f in client.get("/api/mutual-funds").json()]
+
+
+def test_load_racing_a_write_is_not_kept():
+    cache = CatalogueCache()
+    funds = [SimpleNamespace(id=1, name="Fund", isin="ISIN1")]
+
+    version = cache.version
+    cache.invalidate()
+    entry = cache.store(funds, version)
+    assert entry.body == b'[{"name":"Fund","isin":"ISIN1","id":1}]'
+    assert cache.get() is None
+
+    assert cache.store(funds, cache.version) is cache.get()
+
+
+def test_etag_matching():
+    assert etag_matches('W/"a", "b"', '"b"')
+    assert etag_matches("*", '"b"')
+    assert not etag_matches(None, '"b"')
+    assert not etag_matches('"a"', '"b"')
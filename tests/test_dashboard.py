@@ -0,0 +1,41 @@
+import pytest
+from app import async_crud
+from app.utils.cache import MemoryCache, NullCache
+
+SINGLE_ENDPOINTS = {
+    "portfolio": "/api/portfolio",
+    "sector_allocation": "/api/portfolio/sector-allocation",
+    "stock_allocation": "/api/portfolio/stock-allocation?period=1Y",
+    "overlap": "/api/portfolio/overlap",
+}
+
+
+def test_dashboard_sections_match_single_endpoints(client, auth_headers, monkeypatch):
+    monkeypatch.setattr(async_crud, "cache", NullCache())
+    dashboard = client.get("/api/portfolio/dashboard?period=1Y", headers=auth_headers).json()
+    assert dashboard.keys() == SINGLE_ENDPOINTS.keys()
+    for section, path in SINGLE_ENDPOINTS.items():
+        assert dashboard[section] == client.get(path, headers=auth_headers).json(), section
+
+
+@pytest.mark.parametrize("dashboard_first", [True, False])
+def test_shared_cache_entries_serve_both_routes(client, auth_headers, monkeypatch, dashboard_first):
+    monkeypatch.setattr(async_crud, "cache", NullCache())
+    expected = {section: client.get(path, headers=auth_headers).json() for section, path in SINGLE_ENDPOINTS.items()}
+
+    monkeypatch.setattr(async_crud, "cache", MemoryCache())
+    if dashboard_first:
+        dashboard = client.get("/api/portfolio/dashboard?period=1Y", headers=auth_headers).json()
+        singles = {section: client.get(path, headers=auth_headers).json() for section, path in SINGLE_ENDPOINTS.items()}
+    else:
+        singles = {section: client.get(path, headers=auth_headers).json() for section, path in SINGLE_ENDPOINTS.items()}
+        dashboard = client.get("/api/portfolio/dashboard?period=1Y", headers=auth_headers).json()
+    assert singles == expected
+    assert dashboard == expected
+
+
+def test_dashboard_sections_subset(client, auth_headers):
+    response = client.get("/api/portfolio/dashboard?sections=overlap,portfolio", headers=auth_headers)
+    assert response.status_code == 200
+    assert set(response.json()) == {"overlap", "portfolio"}
+    assert client.get("/api/portfolio/dashboard?sections=unknown", headers=auth_headers).status_code == 400
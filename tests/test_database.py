@@ -0,0 +1,15 @@
+from app.database import _async_url
+
+
+def test_async_url_swaps_driver_and_drops_sslmode():
+    for url in ["postgresql://u:p@db:5432/app?sslmode=require",
+                "postgresql+psycopg2://u:p@db:5432/app?sslmode=require"]:
+        async_url = _async_url(url)
+        assert async_url.drivername == "postgresql+asyncpg"
+        assert "sslmode" not in async_url.query
+        assert (async_url.host, async_url.port, async_url.database) == ("db", 5432, "app")
+
+
+def test_async_url_keeps_other_query_arguments():
+    async_url = _async_url("postgresql://u:p@db/app?sslmode=require&application_name=api")
+    assert dict(async_url.query) == {"application_name": "api"}
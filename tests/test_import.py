@@ -0,0 +1,69 @@
+import pytest
+from sqlalchemy import event
+from sqlalchemy.exc import OperationalError
+from app import database
+
+UNKNOWN_FUND_ID = 999999
+
+
+@pytest.fixture
+def fund_id(client):
+    return client.get("/api/mutual-funds?limit=1").json()[0]["id"]
+
+
+def investment(fund_id: int, day: int) -> dict:
+    return {"fund_id": fund_id, "date": f"2024-01-{day:02d}", "amount_invested": 1000.0,
+            "nav_at_investment": 10.0, "returns_since_investment": 5.0}
+
+
+def test_csv_import_reports_each_bad_row(client, new_user_headers, fund_id):
+    body = "\n".join([
+        "fund_id,date,amount_invested,nav_at_investment,returns_since_investment",
+        f"{fund_id},2024-01-02,1000.0,10.0,5.0",
+        f"{UNKNOWN_FUND_ID},2024-01-03,1000.0,10.0,5.0",
+        f"{fund_id},2024-01-04,not-a-number,10.0,5.0",
+    ])
+    response = client.post("/api/investments/import", content=body,
+                           headers={**new_user_headers, "Content-Type": "text/csv"})
+    assert response.status_code == 200, response.text
+    result = response.json()
+
+    assert result["inserted"] == 1
+    assert result["failed"] == 2
+    assert [error["row"] for error in result["errors"]] == [2, 3]
+    assert result["errors"][0]["error"] == f"Unknown fund_id {UNKNOWN_FUND_ID}"
+    assert result["errors"][1]["error"].startswith("amount_invested:")
+    assert len(client.get("/api/investments", headers=new_user_headers).json()) == 1
+
+
+@pytest.mark.parametrize("body", ['{"fund_id": 1}', "not json"])
+def test_import_rejects_a_body_that_is_not_a_list(client, new_user_headers, body):
+    response = client.post("/api/investments/import", content=body,
+                           headers={**new_user_headers, "Content-Type": "application/json"})
+    assert response.status_code == 400
+
+
+def test_failed_batch_is_reported_per_row_and_keeps_earlier_batches(client, new_user_headers, fund_id):
+    inserts = []
+
+    def fail_second_batch(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("INSERT INTO investments"):
+            inserts.append(statement)
+            if len(inserts) == 2:
+                raise OperationalError(statement, parameters, Exception("connection lost"))
+
+    event.listen(database.engine, "before_cursor_execute", fail_second_batch)
+    try:
+        response = client.post("/api/investments/import?batch_size=2", headers=new_user_headers,
+                               json=[investment(fund_id, day) for day in range(1, 6)])
+    finally:
+        event.remove(database.engine, "before_cursor_execute", fail_second_batch)
+
+    assert response.status_code == 200, response.text
+    result = response.json()
+    assert result["inserted"] == 3
+    assert result["errors"] == [{"row": 3, "error": "Batch failed: OperationalError"},
+                                {"row": 4, "error": "Batch failed: OperationalError"}]
+    dates = sorted(inv["date"] for inv in client.get("/api/investments", headers=new_user_headers).json())
+    assert dates == ["2024-01-01", "2024-01-02", "2024-01-05"]
+    assert client.get("/api/portfolio", headers=new_user_headers).json()["initial_investment"] == 3000.0
@@ -0,0 +1,90 @@
+"""
+The investment hot paths must be answered by index-only scans on their covering
+indexes. Needs a planner with realistic statistics, so it runs on PostgreSQL only
+(set TEST_DATABASE_URL); EXPLAIN_USERS sizes the extra synthetic dataset.
+"""
+import json
+import os
+import pytest
+from sqlalchemy import event
+from app import crud, database
+from app.seeder import seed_synthetic
+from conftest import IS_POSTGRES
+
+pytestmark = pytest.mark.skipif(not IS_POSTGRES, reason="EXPLAIN checks need TEST_DATABASE_URL (PostgreSQL)")
+
+EXPLAIN_USERS = int(os.getenv("EXPLAIN_USERS", "5000"))
+
+#  Index each table's hot-path scans must use
+EXPECTED_INDEXES = {
+    "investments": "idx_investment_user_date",
+    "fund_allocations": "idx_fund_allocation_fund",
+}
+
+HOT_PATHS = {
+    "get_user_investments": lambda db, user_id: crud.get_user_investments(db, user_id, limit=100),
+    "get_stock_allocation": lambda db, user_id: crud.get_stock_allocation(db, user_id, "1Y"),
+    "get_sector_allocation": lambda db, user_id: crud.get_sector_allocation(db, user_id),
+    "get_fund_overlap": lambda db, user_id: crud.get_fund_overlap(db, user_id),
+    "get_holdings_allocation": lambda db, user_id: crud.get_holdings_allocation(db, user_id),
+}
+
+
+@pytest.fixture(scope="module")
+def large_dataset(engine, seeded):
+    db = database.SessionLocal()
+    try:
+        usernames = seed_synthetic(db, users=EXPLAIN_USERS, funds=500, investments_per_user=25,
+                                   holdings_per_fund=30, seed=1)
+        user_id = crud.get_user_by_username(db, usernames[len(usernames) // 2]).id
+    finally:
+        db.close()
+    #  Fresh statistics, and a visibility map so index-only scans skip the heap
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.exec_driver_sql("VACUUM ANALYZE")
+    return user_id
+
+
+def capture_statements(engine, fn):
+    """Run `fn` and return the (statement, parameters) pairs it sent to the database."""
+    captured = []
+
+    def _capture(conn, cursor, statement, parameters, context, executemany):
+        captured.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", _capture)
+    try:
+        fn()
+    finally:
+        event.remove(engine, "before_cursor_execute", _capture)
+    return captured
+
+
+def scans(conn, statement, parameters):
+    """(table, node type, index) for every scan in the plan."""
+    plan = conn.exec_driver_sql("EXPLAIN (FORMAT JSON) " + statement, parameters).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    found, nodes = [], [plan[0]["Plan"]]
+    while nodes:
+        node = nodes.pop()
+        if "Relation Name" in node:
+            found.append((node["Relation Name"], node["Node Type"], node.get("Index Name")))
+        nodes.extend(node.get("Plans", []))
+    return found
+
+
+@pytest.mark.parametrize("name", list(HOT_PATHS))
+def test_hot_path_uses_index_only_scans(engine, db, large_dataset, name):
+    statements = capture_statements(engine, lambda: HOT_PATHS[name](db, large_dataset))
+    checked = []
+    with engine.connect() as conn:
+        for statement, parameters in statements:
+            if not any(table in statement for table in EXPECTED_INDEXES):
+                continue
+            for table, node_type, index in scans(conn, statement, parameters):
+                if table in EXPECTED_INDEXES:
+                    checked.append((table, node_type, index))
+                    assert (node_type, index) == ("Index Only Scan", EXPECTED_INDEXES[table]), (
+                        f"{name}: {table} read by {node_type} on {index}")
+    assert checked, f"{name} issued no statements on {', '.join(EXPECTED_INDEXES)}"
@@ -0,0 +1,28 @@
+import pytest
+from app.routes import internal
+
+
+@pytest.fixture
+def internal_token(monkeypatch):
+    monkeypatch.setattr(internal, "INTERNAL_TOKEN", "s3cret")
+    return {"Authorization": "Bearer s3cret"}
+
+
+def test_pool_is_disabled_without_token_setting(client, monkeypatch):
+    monkeypatch.setattr(internal, "INTERNAL_TOKEN", None)
+    assert client.get("/internal/pool").status_code == 404
+
+
+def test_pool_requires_internal_token(client, internal_token, auth_headers):
+    assert client.get("/internal/pool").status_code == 401
+    assert client.get("/internal/pool", headers=auth_headers).status_code == 401
+    response = client.get("/internal/pool", headers=internal_token)
+    assert response.status_code == 200
+    assert "sync" in response.json()
+
+
+def test_metrics_require_internal_token(client, internal_token):
+    assert client.get("/metrics").status_code == 401
+    response = client.get("/metrics", headers=internal_token)
+    assert response.status_code == 200
+    assert 'db_pool_checkouts_total{engine="sync"}' in response.text
@@ -0,0 +1,30 @@
+from pathlib import Path
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.config import Config
+from alembic.migration import MigrationContext
+from sqlalchemy import create_engine, inspect
+from app.database import Base
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def test_migrations_build_the_models_schema(tmp_path, monkeypatch):
+    """
+    The full chain on an empty SQLite database, from base to head and back.
+    """
+    url = f"sqlite:///{tmp_path}/migrations.sqlite"
+    monkeypatch.setenv("LIVE_DATABASE_URL", url)
+    config = Config(str(ROOT / "alembic.ini"))
+    config.set_main_option("script_location", str(ROOT / "alembic"))
+
+    command.upgrade(config, "head")
+    engine = create_engine(url)
+    try:
+        with engine.connect() as connection:
+            assert compare_metadata(MigrationContext.configure(connection), Base.metadata) == []
+
+        command.downgrade(config, "base")
+        assert inspect(engine).get_table_names() == ["alembic_version"]
+    finally:
+        engine.dispose()
@@ -0,0 +1,74 @@
+import asyncio
+from datetime import date
+from pathlib import Path
+import pytest
+from app import async_crud, crud, models, nav_loader
+from app.utils.cache import MemoryCache
+
+NAV_FILE = Path(__file__).parent / "fixtures" / "NAVAll.txt"
+
+
+@pytest.fixture
+def nav_funds(db, engine):
+    funds = [models.MutualFund(name=f"NAV Test Fund {isin}", isin=isin)
+             for isin in ("INFNAVTEST01", "INFNAVTEST02", "INFNAVTEST04")]
+    user = models.User(username="nav_loader_user", hashed_password="x")
+    db.add_all(funds + [user])
+    db.flush()
+    db.add(models.Investment(user_id=user.id, fund_id=funds[0].id, date=date(2026, 1, 5),
+                             amount_invested=1000.0, nav_at_investment=90.0, returns_since_investment=12.0))
+    db.commit()
+    yield [fund.id for fund in funds], user.id
+    db.query(models.NavHistory).filter(models.NavHistory.fund_id.in_([fund.id for fund in funds])).delete()
+    db.commit()
+
+
+def test_parse_skips_headers_and_unpriced_schemes():
+    with open(NAV_FILE) as f:
+        rows = list(nav_loader.parse_nav_lines(f))
+    assert rows == [
+        ("INFNAVTEST01", date(2026, 10, 17), 101.2345),
+        ("INFNAVTEST02", date(2026, 10, 17), 55.5),
+        ("INFNAVTEST03", date(2026, 10, 17), 55.5),
+        ("INFNAVUNKNOWN", date(2026, 10, 17), 10.0),
+    ]
+
+
+def value_on(db, user_id: int, day: date) -> float:
+    investments = db.query(
+        models.Investment.fund_id, models.Investment.date, models.Investment.amount_invested,
+        models.Investment.nav_at_investment, models.Investment.returns_since_investment
+    ).filter(models.Investment.user_id == user_id).all()
+    return crud._value_series_from(db, investments, day)["values"][-1]
+
+
+def test_load_nav_file_upserts_and_invalidates(db, nav_funds, monkeypatch):
+    (fund_a, fund_b, _), user_id = nav_funds
+    cache = MemoryCache()
+    monkeypatch.setattr(async_crud, "cache", cache)
+    series_key = async_crud._cache_key(user_id, "value-series")
+    asyncio.run(cache.set(series_key, {"start": "2026-01-05", "values": [1.0]}))
+    #  Before any price, the fund is valued at the NAV implied by the purchase's returns
+    assert value_on(db, user_id, date(2026, 10, 17)) == pytest.approx(1000.0 / 90.0 * 100.8)
+
+    result = nav_loader.load_nav_file(str(NAV_FILE))
+    assert (result["loaded"], result["unmatched"]) == (2, 2)
+    assert result["user_ids"] == [user_id]
+
+    navs = dict(db.query(models.NavHistory.fund_id, models.NavHistory.nav).filter(
+        models.NavHistory.date == date(2026, 10, 17), models.NavHistory.fund_id.in_([fund_a, fund_b])))
+    assert navs == {fund_a: 101.2345, fund_b: 55.5}
+
+    #  The loaded NAV now prices the units bought at 90.0
+    assert value_on(db, user_id, date(2026, 10, 17)) == pytest.approx(1000.0 / 90.0 * 101.2345)
+    assert asyncio.run(cache.get(series_key)) is None
+
+    #  Re-loading the same day's file overwrites instead of duplicating
+    nav_loader.load_nav_file(str(NAV_FILE))
+    assert db.query(models.NavHistory).filter(models.NavHistory.fund_id == fund_a).count() == 1
+
+
+def test_load_nav_file_fails_loudly(tmp_path):
+    with pytest.raises(SystemExit) as error:
+        nav_loader.load_nav_file(str(tmp_path / "missing.txt"))
+    assert error.value.code == 1
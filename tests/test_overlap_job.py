@@ -0,0 +1,131 @@
+from itertools import combinations
+import random
+import pytest
+from datetime import date
+from app import crud, models
+from app.overlap_job import compute_overlaps, load_holdings, store_overlaps
+
+
+def brute_force(holdings, min_overlap):
+    weights = {}
+    for fund_id, holding, weight in holdings:
+        fund = weights.setdefault(fund_id, {})
+        fund[holding] = fund.get(holding, 0) + weight
+    expected = {}
+    for a, b in combinations(sorted(weights), 2):
+        value = sum(min(weight, weights[b][holding]) for holding, weight in weights[a].items()
+                    if holding in weights[b])
+        if value > min_overlap:
+            expected[(a, b)] = round(value, 2)
+    return expected
+
+
+def random_holdings(funds=37, securities=60, per_fund=12, seed=1):
+    rng = random.Random(seed)
+    #  Fund ids out of order, and one duplicated holding row
+    fund_ids = rng.sample(range(100, 1000), funds)
+    holdings = [(fund_id, f"S{security}", round(rng.uniform(0.5, 10), 4))
+                for fund_id in fund_ids for security in rng.sample(range(securities), per_fund)]
+    holdings.append(holdings[0])
+    return holdings
+
+
+@pytest.mark.parametrize("block_size", [1, 5, 500])
+@pytest.mark.parametrize("min_overlap", [0.0, 5.0])
+def test_blocks_match_brute_force(block_size, min_overlap):
+    holdings = random_holdings()
+    pairs = {}
+    for fund_a, fund_b, values in compute_overlaps(holdings, min_overlap, block_size):
+        for a, b, value in zip(fund_a, fund_b, values):
+            assert (int(a), int(b)) not in pairs and a < b
+            pairs[(int(a), int(b))] = float(value)
+    expected = brute_force(holdings, min_overlap)
+    assert pairs.keys() == expected.keys()
+    for key, value in expected.items():
+        assert pairs[key] == pytest.approx(value, abs=0.011)
+
+
+def test_no_holdings():
+    assert list(compute_overlaps([])) == []
+
+
+@pytest.fixture
+def own_overlaps(db, seeded):
+    """
+    store_overlaps replaces the whole table; put the seeded pairs back afterwards.
+    """
+    saved = [{"fund_id": row.fund_id, "overlapping_fund_id": row.overlapping_fund_id,
+              "overlap_percentage": row.overlap_percentage} for row in db.query(models.FundOverlap)]
+    yield
+    db.query(models.FundOverlap).delete()
+    db.bulk_insert_mappings(models.FundOverlap, saved)
+    db.commit()
+
+
+def test_store_overlaps_upserts_and_removes_stale_pairs(db, own_overlaps):
+    funds = [models.MutualFund(name=f"Overlap Test {i}", isin=f"INFOVL{i:06d}") for i in range(3)]
+    db.add_all(funds)
+    db.flush()
+    a, b, c = (fund.id for fund in funds)
+    db.add_all([models.FundOverlap(fund_id=a, overlapping_fund_id=b, overlap_percentage=1.0),
+                models.FundOverlap(fund_id=b, overlapping_fund_id=c, overlap_percentage=2.0)])
+    db.commit()
+
+    holdings = [(a, "X", 10.0), (a, "Y", 5.0), (b, "X", 4.0), (c, "Y", 7.0)]
+    result = store_overlaps(db, compute_overlaps(holdings))
+    db.commit()
+
+    rows = {(row.fund_id, row.overlapping_fund_id): row.overlap_percentage
+            for row in db.query(models.FundOverlap)}
+    #  The job owns the table: every pair not recomputed is gone
+    assert rows == {(a, b): 4.0, (a, c): 5.0}
+    assert result["upserted"] == 2
+
+    #  Re-running updates in place
+    store_overlaps(db, compute_overlaps([(a, "X", 10.0), (b, "X", 6.0)]))
+    db.commit()
+    assert {(row.fund_id, row.overlapping_fund_id): row.overlap_percentage
+            for row in db.query(models.FundOverlap)} == {(a, b): 6.0}
+
+
+@pytest.fixture
+def symbol_only_funds(db, seeded):
+    """
+    Two funds whose holdings have symbols but no ISINs, sharing only CCC, held by one user.
+    """
+    funds = [models.MutualFund(name=f"Symbol Only {i}", isin=f"INFSYM{i:06d}") for i in range(2)]
+    user = models.User(username="symbol_only_user", hashed_password="x")
+    db.add_all(funds + [user])
+    db.flush()
+    a, b = (fund.id for fund in funds)
+    db.add_all([
+        models.FundHolding(fund_id=a, symbol="AAA", sector="IT", weight=30.0),
+        models.FundHolding(fund_id=a, symbol="CCC", sector="Energy", weight=10.0),
+        models.FundHolding(fund_id=b, symbol="BBB", sector="IT", weight=40.0),
+        models.FundHolding(fund_id=b, symbol="CCC", sector="Energy", weight=5.0),
+        models.FundOverlap(fund_id=a, overlapping_fund_id=b, overlap_percentage=5.0),
+    ] + [models.Investment(user_id=user.id, fund_id=fund_id, date=date(2024, 1, 2), amount_invested=1000.0,
+                           nav_at_investment=10.0, returns_since_investment=0.0) for fund_id in (a, b)])
+    db.commit()
+    yield a, b, user.id
+    for model, column in ((models.Investment, models.Investment.user_id), (models.User, models.User.id)):
+        db.query(model).filter(column == user.id).delete(synchronize_session=False)
+    for model in (models.FundOverlap, models.FundHolding):
+        db.query(model).filter(model.fund_id.in_((a, b))).delete(synchronize_session=False)
+    db.query(models.MutualFund).filter(models.MutualFund.id.in_((a, b))).delete(synchronize_session=False)
+    db.commit()
+
+
+def test_symbol_only_holdings_keep_their_identity(db, symbol_only_funds):
+    a, b, user_id = symbol_only_funds
+
+    holdings = [row for row in load_holdings(db) if row[0] in (a, b)]
+    pairs = [(int(x), int(y), float(value)) for fund_a, fund_b, values in compute_overlaps(holdings)
+             for x, y, value in zip(fund_a, fund_b, values)]
+    assert pairs == [(a, b, 5.0)]
+
+    allocation = crud.get_holdings_allocation(db, user_id)["holdings"]
+    assert sorted((holding["symbol"], holding["exposure"]) for holding in allocation) == [
+        ("AAA", 300.0), ("BBB", 400.0), ("CCC", 150.0)]
+
+    assert crud.get_fund_overlap(db, user_id)["overlaps"][0]["common_stocks"] == ["CCC"]
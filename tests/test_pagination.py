@@ -0,0 +1,46 @@
+import base64
+import json
+import pytest
+
+
+def cursor(values) -> str:
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+
+@pytest.mark.parametrize("bad_cursor", ["not-base64!", cursor({"id": 1}), cursor([]), cursor([None]),
+                                        cursor([[1]]), cursor(["x"])])
+def test_malformed_fund_cursor_is_rejected(client, bad_cursor):
+    response = client.get("/api/mutual-funds", params={"limit": 2, "cursor": bad_cursor})
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize("bad_cursor", ["not-base64!", cursor([None, 1]), cursor(["2024-01-01"]),
+                                        cursor(["2024-13-01", 1]), cursor(["2024-01-01", None])])
+def test_malformed_investment_cursor_is_rejected(client, auth_headers, bad_cursor):
+    response = client.get("/api/investments", headers=auth_headers, params={"limit": 2, "cursor": bad_cursor})
+    assert response.status_code == 400
+
+
+def test_fund_pages_follow_the_next_cursor(client):
+    everything = client.get("/api/mutual-funds").json()
+    seen, params = [], {"limit": 5}
+    while True:
+        response = client.get("/api/mutual-funds", params=params)
+        seen.extend(fund["id"] for fund in response.json())
+        if "X-Next-Cursor" not in response.headers:
+            break
+        params["cursor"] = response.headers["X-Next-Cursor"]
+    assert seen == [fund["id"] for fund in everything]
+
+
+def test_investment_pages_follow_the_next_cursor(client, auth_headers):
+    everything = client.get("/api/investments", headers=auth_headers).json()
+    seen, params = [], {"limit": 4}
+    while True:
+        response = client.get("/api/investments", headers=auth_headers, params=params)
+        seen.extend(investment["id"] for investment in response.json())
+        if "X-Next-Cursor" not in response.headers:
+            break
+        params["cursor"] = response.headers["X-Next-Cursor"]
+    assert sorted(seen) == sorted(investment["id"] for investment in everything)
+    assert len(seen) == len(set(seen))
@@ -0,0 +1,51 @@
+import pytest
+from app import crud
+from app.database import SessionLocal
+from app.utils.auth import create_access_token
+from benchmarks.crud_budgets import (CRUD_BUDGETS, POST_ROUTE_BUDGETS, ROUTE_BUDGETS, crud_calls, measure,
+                                     measure_request, post_requests, scratch_funds)
+
+REPEATS = 2
+
+
+@pytest.fixture(scope="module")
+def budget_user(seeded):
+    #  The last seeded user absorbs the writes
+    user_id, username = seeded[-1]
+    db = SessionLocal()
+    try:
+        fund_id = crud.get_user_investments(db, user_id, limit=1)[0].fund_id
+        security = crud.get_holdings_allocation(db, user_id, limit=1)["holdings"][0]["security_isin"]
+        hashed_password = crud.get_user_by_username(db, username).hashed_password
+        calls = crud_calls(username, user_id, fund_id, security, hashed_password,
+                           scratch_funds(db, REPEATS + 2))
+    finally:
+        db.close()
+    return {"user_id": user_id, "username": username, "fund_id": fund_id, "calls": calls}
+
+
+@pytest.mark.parametrize("name", list(CRUD_BUDGETS))
+def test_crud_statement_budget(db, budget_user, name):
+    call = budget_user["calls"][name]
+    call(db)
+    result = measure(lambda: call(db), REPEATS)
+    assert result["statements"] <= CRUD_BUDGETS[name], result
+
+
+@pytest.fixture(scope="module")
+def budget_headers(budget_user):
+    token = create_access_token({"sub": budget_user["username"], "uid": budget_user["user_id"]})
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.mark.parametrize("path", list(ROUTE_BUDGETS))
+def test_get_route_statement_budget(client, budget_headers, path):
+    result = measure_request(client, "GET", path, REPEATS, headers=budget_headers)
+    assert result["statements"] <= ROUTE_BUDGETS[path], result
+
+
+@pytest.mark.parametrize("path", list(POST_ROUTE_BUDGETS))
+def test_post_route_statement_budget(client, budget_user, budget_headers, path):
+    request_args = post_requests(budget_user["username"], budget_user["fund_id"])[path]
+    result = measure_request(client, "POST", path, REPEATS, request_args, budget_headers)
+    assert result["statements"] <= POST_ROUTE_BUDGETS[path], result
@@ -0,0 +1,38 @@
+from datetime import date
+import pytest
+from app import analytics_job, crud, models
+from app.reports import compute_user_reports
+
+
+def test_reports_match_the_api(db, seeded):
+    fund_names, fund_allocations = analytics_job.load_fund_maps(db)
+    for user_id, _ in seeded:
+        investments = db.query(models.Investment.fund_id, models.Investment.date,
+                               models.Investment.amount_invested, models.Investment.returns_since_investment
+                               ).filter(models.Investment.user_id == user_id).all()
+        overview, sectors = compute_user_reports(user_id, investments, date.today(), fund_names, fund_allocations)
+
+        portfolio = crud.get_portfolio(db, user_id)
+        assert overview["initial_investment"] == pytest.approx(portfolio["initial_investment"])
+        assert overview["current_value"] == pytest.approx(portfolio["current_value"])
+        assert overview["growth_percentage"] == pytest.approx(portfolio["growth_percentage"])
+
+        allocation = {item["sector"]: item for item in crud.get_sector_allocation(db, user_id)["allocations"]}
+        assert {sector["sector"] for sector in sectors} == allocation.keys()
+        for sector in sectors:
+            assert sector["invested_amount"] == pytest.approx(allocation[sector["sector"]]["invested_amount"], abs=0.01)
+            assert sector["percentage"] == pytest.approx(allocation[sector["sector"]]["percentage"], abs=0.01)
+
+
+def test_process_user_range_writes_reports(db, seeded, monkeypatch):
+    fund_names, fund_allocations = analytics_job.load_fund_maps(db)
+    monkeypatch.setattr(analytics_job, "_fund_names", fund_names)
+    monkeypatch.setattr(analytics_job, "_fund_allocations", fund_allocations)
+    first, last = seeded[0][0], seeded[-1][0]
+    report_date = date(2026, 1, 31)
+
+    assert analytics_job.process_user_range(first, last, report_date) == len(seeded)
+    #  Re-running a range replaces its rows
+    assert analytics_job.process_user_range(first, last, report_date) == len(seeded)
+    assert db.query(models.ReportPortfolioOverview).filter(
+        models.ReportPortfolioOverview.report_date == report_date).count() == len(seeded)
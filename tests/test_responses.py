@@ -0,0 +1,81 @@
+import asyncio
+from itertools import count
+import pytest
+from fastapi.responses import JSONResponse
+from app import async_crud, crud, models, schemas
+from app.main import app
+from app.utils.cache import RedisCache
+from app.utils.responses import ORJSON_OPTIONS, orjson
+from test_cache import FakeRedis
+
+pytestmark = pytest.mark.skipif(orjson is None, reason="orjson not installed")
+
+_empty_users = count()
+
+
+def validated_body(path: str, content) -> bytes:
+    """
+    What FastAPI sends for `content` through the route's response_model.
+    """
+    route = next(route for route in app.routes if getattr(route, "path", None) == path)
+    field = route.secure_cloned_response_field
+    serialized = field.serialize(field.validate(content, {}, loc=("response",))[0], mode="json",
+                                 exclude_unset=route.response_model_exclude_unset)
+    return JSONResponse(serialized).body
+
+
+def fast_body(content) -> bytes:
+    return orjson.dumps(content, option=ORJSON_OPTIONS)
+
+
+def views(db, user_id: int, security: str):
+    yield "/api/portfolio", crud.get_portfolio(db, user_id)
+    yield "/api/portfolio/sector-allocation", crud.get_sector_allocation(db, user_id)
+    yield "/api/portfolio/sector-allocation", crud.get_sector_allocation(db, user_id, aggregate_in_db=False)
+    for period in ("1M", "MAX"):
+        yield "/api/portfolio/stock-allocation", crud.get_stock_allocation(db, user_id, period)
+    yield "/api/portfolio/overlap", crud.get_fund_overlap(db, user_id)
+    yield "/api/portfolio/stock-exposure", crud.get_stock_exposure(db, user_id, security)
+    yield "/api/portfolio/stock-exposure", crud.get_stock_exposure(db, user_id, "NOT-A-SECURITY")
+    yield "/api/portfolio/holdings-allocation", crud.get_holdings_allocation(db, user_id)
+    for sections in (crud.DASHBOARD_SECTIONS, ["overlap", "portfolio"]):
+        yield "/api/portfolio/dashboard", asyncio.run(async_crud.get_dashboard(db, user_id, sections))
+
+
+@pytest.fixture
+def empty_user_id(db):
+    user = crud.create_user(db, schemas.UserCreate(
+        username=f"empty_user_{next(_empty_users)}", password="password123"), hashed_password="x")
+    return user.id
+
+
+def test_fast_path_matches_validated_bytes(db, seeded, empty_user_id):
+    security = db.query(models.FundHolding.symbol).filter(models.FundHolding.symbol.isnot(None)).first()[0]
+    for user_id in [user_id for user_id, _ in seeded] + [empty_user_id]:
+        for path, content in views(db, user_id, security):
+            assert fast_body(content) == validated_body(path, content), (path, user_id)
+
+
+def test_cached_views_match_validated_bytes(db, seeded, empty_user_id, monkeypatch):
+    monkeypatch.setattr(async_crud, "cache", RedisCache(client=FakeRedis()))
+    for user_id in (seeded[0][0], empty_user_id):
+        for path, view in (("/api/portfolio", async_crud.get_portfolio),
+                           ("/api/portfolio/sector-allocation", async_crud.get_sector_allocation),
+                           ("/api/portfolio/overlap", async_crud.get_fund_overlap),
+                           ("/api/portfolio/stock-allocation", async_crud.get_stock_allocation)):
+            computed = asyncio.run(view(db, user_id))
+            cached = asyncio.run(view(db, user_id))
+            assert fast_body(cached) == fast_body(computed) == validated_body(path, computed), (path, user_id)
+
+
+def test_cached_views_are_stored_validated(monkeypatch):
+    client = FakeRedis()
+    monkeypatch.setattr(async_crud, "cache", RedisCache(client=client))
+    view = async_crud._cached_view("sector-allocation", lambda db, user_id: {
+        "allocations": [{"sector": "IT", "invested_amount": 100, "percentage": 100, "extra": 1}],
+        "total_investment": 100})
+    expected = {"allocations": [{"sector": "IT", "invested_amount": 100.0, "percentage": 100.0}],
+                "total_investment": 100.0}
+    assert asyncio.run(view(None, 1)) == expected
+    assert fast_body(asyncio.run(view(None, 1))) == fast_body(expected)
+    assert list(client.values) == ["portfolio-cache:1:sector-allocation"]
@@ -0,0 +1,42 @@
+from datetime import date
+import pytest
+from app import crud, models
+
+
+def _assert_same_allocation(sql, python):
+    assert [item["sector"] for item in sql["allocations"]] == [item["sector"] for item in python["allocations"]]
+    for sql_item, python_item in zip(sql["allocations"], python["allocations"]):
+        assert sql_item["invested_amount"] == pytest.approx(python_item["invested_amount"], abs=0.01)
+        assert sql_item["percentage"] == pytest.approx(python_item["percentage"], abs=0.01)
+    assert sql["total_investment"] == pytest.approx(python["total_investment"], abs=0.01)
+
+
+def test_sql_aggregation_matches_python_path(db, seeded):
+    for user_id, _ in seeded:
+        _assert_same_allocation(crud.get_sector_allocation(db, user_id, aggregate_in_db=True),
+                                crud.get_sector_allocation(db, user_id, aggregate_in_db=False))
+
+
+def test_ties_are_ordered_by_sector_name(db, seeded):
+    fund = models.MutualFund(name="Tie Fund", isin="INFTIE000001")
+    user = models.User(username="sector_tie_user", hashed_password="x")
+    db.add_all([fund, user])
+    db.flush()
+    db.add_all([
+        models.FundAllocation(fund_id=fund.id, sector="Utilities", percentage=50.0),
+        models.FundAllocation(fund_id=fund.id, sector="Energy", percentage=50.0),
+        models.Investment(user_id=user.id, fund_id=fund.id, date=date.today(),
+                          amount_invested=1000.0, nav_at_investment=10.0, returns_since_investment=0.0),
+    ])
+    db.commit()
+
+    sql = crud.get_sector_allocation(db, user.id, aggregate_in_db=True)
+    python = crud.get_sector_allocation(db, user.id, aggregate_in_db=False)
+    assert [item["sector"] for item in sql["allocations"]] == ["Energy", "Utilities"]
+    _assert_same_allocation(sql, python)
+
+
+def test_user_without_investments(db, seeded):
+    empty = {"allocations": [], "total_investment": 0}
+    assert crud.get_sector_allocation(db, -1, aggregate_in_db=True) == empty
+    assert crud.get_sector_allocation(db, -1, aggregate_in_db=False) == empty
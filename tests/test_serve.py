@@ -0,0 +1,45 @@
+import pytest
+from app.serve import check_cache_backend, pool_settings, worker_environment
+
+POOL_KEYS = ("DB_POOL_SIZE", "DB_MAX_OVERFLOW", "DB_SYNC_POOL_SIZE", "DB_SYNC_MAX_OVERFLOW")
+
+
+@pytest.fixture(autouse=True)
+def unset_pool_settings(monkeypatch):
+    for key in POOL_KEYS + ("HASH_WORKERS",):
+        monkeypatch.delenv(key, raising=False)
+
+
+def connections(settings: dict) -> int:
+    return sum(int(settings.get(key, 0)) for key in POOL_KEYS)
+
+
+@pytest.mark.parametrize("budget,workers", [(60, 4), (8, 4), (7, 3), (100, 1)])
+def test_pool_settings_stay_within_budget(budget, workers):
+    assert workers * connections(pool_settings(budget, workers, async_db=False)) <= budget
+    settings = pool_settings(budget, workers, async_db=True)
+    assert workers * connections(settings) <= budget
+    assert int(settings["DB_SYNC_POOL_SIZE"]) >= 1
+    assert int(settings["DB_POOL_SIZE"]) >= int(settings["DB_SYNC_POOL_SIZE"])
+
+
+def test_sync_pool_is_only_sized_separately_in_async_mode():
+    assert set(pool_settings(60, 4, async_db=False)) == {"DB_POOL_SIZE", "DB_MAX_OVERFLOW"}
+    assert pool_settings(60, 4, async_db=True) == {
+        "DB_POOL_SIZE": "8", "DB_MAX_OVERFLOW": "4", "DB_SYNC_POOL_SIZE": "2", "DB_SYNC_MAX_OVERFLOW": "1"}
+
+
+def test_worker_environment_needs_a_connection_per_pool(monkeypatch):
+    assert worker_environment(4, 8, budget=4, async_db=False)["DB_POOL_SIZE"] == "1"
+    with pytest.raises(ValueError):
+        worker_environment(4, 8, budget=7, async_db=True)
+    monkeypatch.setenv("DB_POOL_SIZE", "3")
+    assert "DB_POOL_SIZE" not in worker_environment(4, 8, budget=60, async_db=True)
+
+
+def test_memory_cache_is_refused_with_several_workers():
+    with pytest.raises(ValueError):
+        check_cache_backend(2, "memory")
+    check_cache_backend(1, "memory")
+    check_cache_backend(4, "redis")
+    check_cache_backend(4, "none")
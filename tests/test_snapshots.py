@@ -0,0 +1,61 @@
+from datetime import date, timedelta
+from itertools import count
+import pytest
+from app import crud, models, schemas, snapshots
+
+_users = count()
+
+
+@pytest.fixture
+def user_with_history(db, seeded):
+    """
+    A user with investments but no snapshot row (e.g. created before snapshots existed).
+    """
+    fund = db.query(models.MutualFund).first()
+    user = models.User(username=f"snapshot_user_{next(_users)}", hashed_password="x")
+    db.add(user)
+    db.flush()
+    db.add(models.Investment(user_id=user.id, fund_id=fund.id, date=date.today() - timedelta(days=30),
+                             amount_invested=10000.0, nav_at_investment=10.0, returns_since_investment=10.0))
+    db.commit()
+    return user.id, fund.id
+
+
+def test_first_investment_without_snapshot_includes_history(db, user_with_history):
+    user_id, fund_id = user_with_history
+    crud.create_investment(db, user_id, schemas.InvestmentBase(
+        fund_id=fund_id, date=date.today(), amount_invested=100.0, nav_at_investment=10.0,
+        returns_since_investment=0.0))
+
+    portfolio = crud.get_portfolio(db, user_id)
+    assert portfolio["initial_investment"] == pytest.approx(10100.0)
+    assert portfolio["current_value"] == pytest.approx(11100.0)
+
+
+def test_incremental_snapshot_matches_refresh(db, user_with_history):
+    user_id, fund_id = user_with_history
+    for days, amount, returns in [(20, 500.0, -5.0), (0, 250.0, 3.0), (0, 750.0, 1.0)]:
+        crud.create_investment(db, user_id, schemas.InvestmentBase(
+            fund_id=fund_id, date=date.today() - timedelta(days=days), amount_invested=amount,
+            nav_at_investment=10.0, returns_since_investment=returns))
+    incremental = crud.get_portfolio(db, user_id)
+
+    snapshots.refresh_snapshots(db, [user_id])
+    db.commit()
+    db.expire_all()
+    assert crud.get_portfolio(db, user_id) == pytest.approx(incremental)
+
+
+def test_fund_rename_updates_snapshot_names(client, auth_headers, seeded, db):
+    user_id = seeded[0][0]
+    best = client.get("/api/portfolio", headers=auth_headers).json()["best_performing_scheme"]
+    fund = db.query(models.MutualFund).filter(models.MutualFund.name == best).one()
+    renamed = {"name": f"{best} (renamed)", "isin": fund.isin}
+
+    try:
+        assert client.put(f"/api/mutual-funds/{fund.id}", json=renamed).status_code == 200
+        assert client.get("/api/portfolio", headers=auth_headers).json()["best_performing_scheme"] == renamed["name"]
+        db.expire_all()
+        assert db.get(models.PortfolioSnapshot, user_id).best_scheme == renamed["name"]
+    finally:
+        client.put(f"/api/mutual-funds/{fund.id}", json={"name": best, "isin": fund.isin})
@@ -0,0 +1,59 @@
+from datetime import date, timedelta
+import pytest
+from app import crud, models, valuation
+
+TODAY = date.today()
+
+
+def series(start: date, values) -> dict:
+    return {"start": start.isoformat(), "values": list(values)}
+
+
+def test_period_slice_near_the_series_start():
+    #  Series starts 40 days ago: 1M takes its last 31 days
+    history = crud.stock_allocation_from_series(
+        series(TODAY - timedelta(days=40), range(41)), "1M", points=1000)["history"]
+    assert [point["date"] for point in history] == [TODAY - timedelta(days=30 - i) for i in range(31)]
+    assert [point["value"] for point in history] == list(range(10, 41))
+
+    #  Series starts inside the period: all of it, from its first day
+    history = crud.stock_allocation_from_series(
+        series(TODAY - timedelta(days=10), range(11)), "1M", points=1000)["history"]
+    assert history[0] == {"date": TODAY - timedelta(days=10), "value": 0}
+    assert len(history) == 11
+
+
+@pytest.mark.parametrize("empty", [series(TODAY, []), series(TODAY - timedelta(days=100), range(10))])
+def test_empty_or_out_of_period_series_gives_no_history(empty):
+    result = crud.stock_allocation_from_series(empty, "1M")
+    assert result["history"] == []
+    assert (result["total_value"], result["change_amount"], result["change_percentage"]) == (0.0, 0.0, 0.0)
+
+
+def test_downsampled_series_keeps_both_ends():
+    values = [float(i) for i in range(3651)]
+    result = crud.stock_allocation_from_series(series(TODAY - timedelta(days=3650), values), "MAX", points=250)
+    assert len(result["history"]) == 250
+    assert result["history"][0] == {"date": TODAY - timedelta(days=3650), "value": 0.0}
+    assert result["history"][-1] == {"date": TODAY, "value": 3650.0}
+    assert result["change_amount"] == 3650.0
+
+
+@pytest.mark.parametrize("period", list(crud.PERIOD_MAP))
+def test_full_resolution_matches_a_per_period_valuation(db, seeded, period):
+    """
+    With `points` above the period length, a slice of the MAX series equals the
+    series valued over the period alone (how each period was computed before).
+    """
+    start_date = TODAY - crud.PERIOD_MAP[period]
+    for user_id, _ in seeded:
+        investments = db.query(
+            models.Investment.fund_id, models.Investment.date, models.Investment.amount_invested,
+            models.Investment.nav_at_investment, models.Investment.returns_since_investment
+        ).filter(models.Investment.user_id == user_id, models.Investment.date <= TODAY).all()
+        nav_points = crud._load_nav_points(db, {inv[0] for inv in investments}, start_date, TODAY)
+        dates, values = valuation.daily_portfolio_values(investments, nav_points, start_date, TODAY)
+
+        history = crud.get_stock_allocation(db, user_id, period, points=5000)["history"]
+        assert [point["date"] for point in history] == dates
+        assert [point["value"] for point in history] == pytest.approx(values.tolist())
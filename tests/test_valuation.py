@@ -0,0 +1,105 @@
+import math
+import random
+from datetime import date, timedelta
+import numpy as np
+import pytest
+from app.valuation import daily_portfolio_values, lttb
+
+START, END = date(2024, 3, 1), date(2024, 4, 30)
+
+
+def naive_values(investments, nav_points, start_date, end_date):
+    """
+    Day by day reference for `daily_portfolio_values`.
+    """
+    fund_ids = {row[0] for row in investments}
+    #  Implied NAV of each fund's latest purchase (the last listed on ties)
+    implied = {}
+    for fund_id, day, amount, nav, returns in sorted(investments, key=lambda row: row[1]):
+        implied[fund_id] = (nav or 0) * (1 + (returns or 0) / 100)
+
+    dates, values = [], []
+    day = start_date
+    while day <= end_date:
+        value = held = 0.0
+        for fund_id in fund_ids:
+            units = sum(amount / nav for f, d, amount, nav, _ in investments
+                        if f == fund_id and d <= day and nav)
+            prices = [(d, nav) for f, d, nav in nav_points if f == fund_id and d <= day]
+            price = max(prices)[1] if prices else implied[fund_id]
+            value += units * price
+            held += units
+        if held > 0 or dates:
+            dates.append(day)
+            values.append(value)
+        day += timedelta(days=1)
+    return dates, values
+
+
+def random_portfolio(seed: int):
+    rng = random.Random(seed)
+    investments = []
+    for fund_id in range(1, 5):
+        for _ in range(rng.randint(1, 6)):
+            #  Purchases before the range are clipped to its first day
+            day = START + timedelta(days=rng.randint(-40, 60))
+            nav = rng.choice([None, 0, round(rng.uniform(10, 100), 2)])
+            investments.append((fund_id, day, round(rng.uniform(100, 5000), 2), nav, rng.uniform(-20, 40)))
+
+    nav_points = []
+    #  Fund 4 never has a price: valued at its implied NAV
+    for fund_id in range(1, 4):
+        #  Several prices before the range; only the latest seeds day 0
+        for back in sorted(rng.sample(range(1, 30), 3), reverse=True):
+            nav_points.append((fund_id, START - timedelta(days=back), rng.uniform(10, 100)))
+        #  Gaps in the range are carried forward
+        for offset in sorted(rng.sample(range(0, 61), 20)):
+            nav_points.append((fund_id, START + timedelta(days=offset), rng.uniform(10, 100)))
+    rng.shuffle(nav_points)
+    return investments, nav_points
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_matches_a_day_by_day_valuation(seed):
+    investments, nav_points = random_portfolio(seed)
+    dates, values = daily_portfolio_values(investments, nav_points, START, END)
+    expected_dates, expected_values = naive_values(investments, nav_points, START, END)
+
+    assert dates == expected_dates
+    assert values.tolist() == pytest.approx(expected_values)
+
+
+def test_skips_days_before_the_first_holding():
+    investments = [(1, START + timedelta(days=10), 1000.0, 10.0, 0.0)]
+    dates, values = daily_portfolio_values(investments, [(1, START, 20.0)], START, END)
+    assert dates[0] == START + timedelta(days=10)
+    assert values[0] == pytest.approx(2000.0)
+
+
+def test_no_investments_or_no_units_give_an_empty_series():
+    for investments in ([], [(1, START, 1000.0, None, 5.0), (2, START, 500.0, 0.0, 5.0)]):
+        dates, values = daily_portfolio_values(investments, [(1, START, 20.0)], START, END)
+        assert dates == [] and len(values) == 0
+
+
+@pytest.mark.parametrize("n", [4, 10, 251, 1000, 3651])
+def test_lttb_keeps_exactly_threshold_points(n):
+    rng = random.Random(n)
+    values = [rng.uniform(0, 100) for _ in range(n)]
+    for threshold in sorted(t for t in {3, 4, n // 2, n - 1} if 3 <= t < n):
+        keep = lttb(values, threshold)
+        assert len(keep) == threshold
+        assert keep[0] == 0 and keep[-1] == n - 1
+        assert np.all(np.diff(keep) > 0)
+
+
+def test_lttb_keeps_every_point_below_the_threshold():
+    assert lttb([1.0, 2.0, 3.0], 3).tolist() == [0, 1, 2]
+    assert lttb([1.0, 2.0], 250).tolist() == [0, 1]
+    assert lttb([], 250).tolist() == []
+
+
+def test_lttb_keeps_a_spike():
+    values = [math.sin(i / 50) for i in range(1000)]
+    values[500] = 50.0
+    assert 500 in lttb(values, 20)